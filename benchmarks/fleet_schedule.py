@@ -0,0 +1,71 @@
+"""
+Fleet Scheduling Benchmark
+
+Builds a fleet of grid packages from the test grid whose profiles differ up to 100x in length (the profile is
+repeated with new timestamps), runs the powerflow study of every grid with run_fleet and compares the makespan
+and the mean worker utilisation of the largest-first schedule with the given (smallest-first) order.
+
+Usage:
+    python benchmarks/fleet_schedule.py [--grids 12] [--workers 4] [--max-repeat 40]
+"""
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from power_system_simulation.fleet import run_fleet
+
+TEST_GRID = Path(__file__).parents[1] / "tests" / "data" / "Exception_test_data"
+
+
+def grid_package(root: Path, name: str, n_timestamps: int) -> Path:
+    """Copy of the test grid with its profiles repeated up to n_timestamps, 15 minutes apart."""
+    grid_dir = root / name
+    shutil.copytree(TEST_GRID, grid_dir)
+    for profile in ("active_power_profile.parquet", "reactive_power_profile.parquet"):
+        data = pd.read_parquet(TEST_GRID / profile)
+        values = np.resize(data.to_numpy(), (n_timestamps, data.shape[1]))
+        index = pd.date_range(data.index[0], periods=n_timestamps, freq="15min", name=data.index.name)
+        pd.DataFrame(values, index=index, columns=data.columns).to_parquet(grid_dir / profile)
+    return grid_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grids", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-repeat", type=int, default=40, help="length of the largest profile in test profiles")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # profile lengths from 96 timestamps up to max-repeat test profiles, smallest first
+        lengths = np.geomspace(96, 960 * args.max_repeat, args.grids).astype(int)
+        fleet = [grid_package(Path(tmp) / "grids", f"grid_{i:03d}", n) for i, n in enumerate(lengths)]
+
+        rows = []
+        for name, largest_first in (("given order", False), ("largest first", True)):
+            report = {}
+            timings = run_fleet(
+                fleet, Path(tmp) / name, workers=args.workers, largest_first=largest_first, report=report
+            )
+            assert (timings["Status"] == "ok").all()
+            rows.append(
+                {
+                    "schedule": name,
+                    "makespan_s": report["makespan"],
+                    "busy_s": report["busy_seconds"],
+                    "mean_utilisation": report["mean_utilisation"],
+                    "min_utilisation": min(report["utilisation"].values()),
+                }
+            )
+
+    print(f"{args.grids} grids of {lengths.min()} to {lengths.max()} timestamps on {args.workers} workers")
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.2f"))
+
+
+if __name__ == "__main__":
+    main()
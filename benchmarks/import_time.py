@@ -0,0 +1,73 @@
+"""
+Import Time Benchmark
+
+Imports the package, the command line tool and every study module in a fresh interpreter with
+`python -X importtime` and reports the cumulative import time of each, with the heavy third-party modules
+(power_grid_model, pandas, networkx, scipy, prettytable) that the import pulled in.
+
+tests/test_import_time.py keeps the heavy modules out of the package and command line imports.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+SRC_PATH = Path(__file__).parents[1] / "src"
+MODULES = [
+    "power_system_simulation",
+    "power_system_simulation.cli",
+    "power_system_simulation.graph_processing",
+    "power_system_simulation.calculation_module",
+    "power_system_simulation.nm_calculation",
+    "power_system_simulation.ev_penetration",
+    "power_system_simulation.contingency",
+    "power_system_simulation.reconfiguration",
+]
+HEAVY_MODULES = ["power_grid_model", "pandas", "networkx", "scipy", "prettytable"]
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in microseconds of every module imported by importing module."""
+    env = os.environ | {"PYTHONPATH": os.pathsep.join([str(SRC_PATH), os.environ.get("PYTHONPATH", "")])}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="the best of this many imports is reported")
+    args = parser.parse_args()
+
+    rows = []
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        rows.append(
+            {
+                "module": module,
+                "import_ms": min(times[module] for times in runs) / 1000,
+                "heavy_modules": ", ".join(name for name in HEAVY_MODULES if name in runs[0]) or "-",
+            }
+        )
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.1f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Profile Loading Memory Benchmark
+
+Writes a synthetic load profile (by default a year of 15 minute timestamps for 10k loads) and measures the
+peak resident memory of building the sym_load batch update dataset from it, once through DataFrames
+(read_load_profiles + load_profile_update) and once streamed from parquet (read_profile_update). Every method
+runs in a fresh process, so the peak RSS of one does not hide the other.
+
+A year for 10k loads is 2.8 GB per profile in float64; use --loads and --timestamps to scale it down.
+
+Usage:
+    python benchmarks/profile_memory.py [--loads 10000] [--timestamps 35040]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from power_system_simulation.batch_data import is_broadcast
+from power_system_simulation.calculation_module import load_profile_update, read_load_profiles, read_profile_update
+
+ROWS_PER_GROUP = 2048
+
+
+def write_profile(path: Path, n_timestamps: int, n_loads: int, seed: int) -> Path:
+    """Write a random profile in row groups, so the benchmark never holds the whole profile in memory."""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2025-01-01", periods=n_timestamps, freq="15min", name="Timestamp")
+    columns = pd.Index(np.arange(n_loads, dtype=np.int64) + 1000, name="Load ID")
+    writer = None
+    for start in range(0, n_timestamps, ROWS_PER_GROUP):
+        index = timestamps[start : start + ROWS_PER_GROUP]
+        chunk = pd.DataFrame(rng.uniform(0.0, 5e3, (len(index), n_loads)), index=index, columns=columns)
+        table = pa.Table.from_pandas(chunk)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return path
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB (ru_maxrss is in kB on Linux and in bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def build(method: str, active: Path, reactive: Path, queue) -> None:
+    """Build the update dataset with one method and report its peak RSS and wall time."""
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if method == "dataframe":
+        update_data = load_profile_update(*read_load_profiles(active, reactive))
+    else:
+        update_data, _ = read_profile_update(active, reactive)
+    elapsed = time.perf_counter() - start
+    queue.put(
+        {
+            "method": method,
+            "seconds": elapsed,
+            "peak_rss_mb": peak_rss_mb(),
+            "increase_mb": peak_rss_mb() - baseline,
+            "update_mb": sum(values.nbytes for values in update_data["sym_load"].values() if not is_broadcast(values))
+            / 1024**2,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=10000)
+    parser.add_argument("--timestamps", type=int, default=35040)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        active = write_profile(Path(tmp) / "active.parquet", args.timestamps, args.loads, 1)
+        reactive = write_profile(Path(tmp) / "reactive.parquet", args.timestamps, args.loads, 2)
+
+        rows = []
+        for method in ("dataframe", "streamed"):
+            queue = context.Queue()
+            process = context.Process(target=build, args=(method, active, reactive, queue))
+            process.start()
+            rows.append(queue.get())
+            process.join()
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.1f"))
+
+
+if __name__ == "__main__":
+    main()
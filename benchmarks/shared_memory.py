@@ -0,0 +1,98 @@
+"""
+Shared Memory Benchmark
+
+Starts process pools of a growing number of workers that each read a whole profile matrix (by default a year
+of 15 minute timestamps for 1000 loads, 280 MB) and reports the total proportional set size (PSS, shared pages
+counted once over all processes that map them) of the workers, once with the matrix pickled to every worker
+and once with every worker attached to a SharedArrays publication of it. A run without the matrix gives the
+memory of the worker processes themselves, profile_mb is what the matrix adds on top of it.
+
+PSS is read from /proc/self/smaps_rollup, so the benchmark runs on Linux only.
+
+Usage:
+    python benchmarks/shared_memory.py [--loads 1000] [--timestamps 35040] [--workers 1 2 4 8]
+"""
+
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from power_system_simulation.shared_buffers import SharedArrays, attach_worker, worker_arrays
+
+_PICKLED = None
+_BARRIER = None
+
+
+def pss_mb() -> float:
+    """Proportional set size of this process in MB."""
+    with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as fp:
+        for line in fp:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("No Pss in /proc/self/smaps_rollup")
+
+
+def init_pickled(values: np.ndarray, barrier) -> None:
+    global _PICKLED, _BARRIER  # pylint: disable=global-statement
+    _PICKLED, _BARRIER = values, barrier
+
+
+def init_shared(handle: dict, barrier) -> None:
+    global _BARRIER  # pylint: disable=global-statement
+    attach_worker(handle)
+    _BARRIER = barrier
+
+
+def read_profile() -> tuple:
+    """Read the whole matrix, then wait until every worker did, so every worker runs exactly one task."""
+    values = _PICKLED if _PICKLED is not None else worker_arrays()["values"]
+    total = float(values.sum())
+    _BARRIER.wait()
+    return os.getpid(), pss_mb(), total
+
+
+def measure(method: str, values: np.ndarray, n_workers: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(n_workers)
+    shared = SharedArrays({"values": values}) if method == "shared" else None
+    if shared is not None:
+        initializer, initargs = init_shared, (shared.handle, barrier)
+    else:
+        initializer, initargs = init_pickled, (values if method == "pickled" else np.zeros(0), barrier)
+    try:
+        with ProcessPoolExecutor(n_workers, mp_context=context, initializer=initializer, initargs=initargs) as pool:
+            results = [future.result() for future in [pool.submit(read_profile) for _ in range(n_workers)]]
+    finally:
+        if shared is not None:
+            shared.close()
+    assert len({pid for pid, _, _ in results}) == n_workers
+    return {
+        "method": method,
+        "workers": n_workers,
+        "worker_pss_mb": sum(pss for _, pss, _ in results),
+        "per_worker_mb": sum(pss for _, pss, _ in results) / n_workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=1000)
+    parser.add_argument("--timestamps", type=int, default=35040)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    values = np.random.default_rng(1).uniform(0.0, 5e3, (args.timestamps, args.loads))
+    print(f"profile matrix: {values.nbytes / 1024**2:.0f} MB")
+    baseline = {n: measure("no matrix", values, n)["worker_pss_mb"] for n in args.workers}
+    rows = [measure(method, values, n) for method in ("pickled", "shared") for n in args.workers]
+    for row in rows:
+        row["profile_mb"] = row["worker_pss_mb"] - baseline[row["workers"]]
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.0f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Sparse Topology Benchmark
+
+Solves the load profile for many N-1 topologies (every connected line switched off with each of its
+alternative lines switched on) in three ways and reports the wall time and update memory of each:
+
+- rebuild: a new PowerGridModel per topology with the switched lines in its input data;
+- dense: one batch with a dense line status update (every line in every scenario);
+- sparse: one batch with a sparse line update (only the two switched lines per scenario), combined with
+  the dense load time series by combine_topologies.
+
+Two normally open lines are added to the test grid so that most lines have an alternative.
+
+Usage:
+    python benchmarks/sparse_topology.py [grid_package_dir] [--repeat 4]
+"""
+
+import argparse
+import copy
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.batch_data import combine_topologies, repeat_scenarios
+from power_system_simulation.calculation_module import read_profile_update
+from power_system_simulation.graph_processing import grid_graph_processor
+
+DEFAULT_GRID = Path(__file__).parents[1] / "tests" / "data" / "Exception_test_data"
+
+
+def meshed_input(grid_dir: Path) -> dict:
+    """The grid with two extra normally open lines (3-5 and 7-9)."""
+    with open(grid_dir / "input_network_data.json", "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    extra = initialize_array("input", "line", 2)
+    extra[:] = input_data["line"][-1]
+    extra["id"] = [25, 26]
+    extra["from_node"] = [3, 7]
+    extra["to_node"] = [5, 9]
+    extra["to_status"] = 0
+    input_data["line"] = np.concatenate([input_data["line"], extra])
+    return input_data
+
+
+def n1_topologies(input_data: dict, lv_busbar: int) -> list:
+    """(switched off line, switched on line) of every N-1 scenario with a restoring alternative."""
+    grid = grid_graph_processor(input_data, lv_busbar)
+    lines = input_data["line"]
+    connected = lines["id"][(lines["from_status"] == 1) & (lines["to_status"] == 1)].tolist()
+    return [(line_id, alternative) for line_id in connected for alternative in grid.find_alternative_edges(line_id)]
+
+
+def switched_status(lines: np.ndarray, line_id: int, alternative: int) -> tuple:
+    from_status = lines["from_status"].copy()
+    to_status = lines["to_status"].copy()
+    from_status[lines["id"] == line_id] = to_status[lines["id"] == line_id] = 0
+    from_status[lines["id"] == alternative] = to_status[lines["id"] == alternative] = 1
+    return from_status, to_status
+
+
+def rebuild(input_data, update_data, topologies):
+    loading = []
+    for line_id, alternative in topologies:
+        data = copy.copy(input_data)
+        data["line"] = input_data["line"].copy()
+        data["line"]["from_status"], data["line"]["to_status"] = switched_status(data["line"], line_id, alternative)
+        loading.append(PowerGridModel(data).calculate_power_flow(update_data=update_data)["line"]["loading"])
+    return np.concatenate(loading), 0
+
+
+def dense(input_data, update_data, topologies):
+    n_timestamps = len(update_data["sym_load"]["p_specified"])
+    statuses = [switched_status(input_data["line"], line_id, alternative) for line_id, alternative in topologies]
+    batch = repeat_scenarios(update_data, len(topologies))
+    batch["line"] = {
+        "id": np.broadcast_to(input_data["line"]["id"], (len(topologies) * n_timestamps, len(input_data["line"]))),
+        "from_status": np.repeat(np.array([status[0] for status in statuses]), n_timestamps, axis=0),
+        "to_status": np.repeat(np.array([status[1] for status in statuses]), n_timestamps, axis=0),
+    }
+    line_bytes = batch["line"]["from_status"].nbytes + batch["line"]["to_status"].nbytes
+    return PowerGridModel(input_data).calculate_power_flow(update_data=batch)["line"]["loading"], line_bytes
+
+
+def sparse(input_data, update_data, topologies):
+    switches = [
+        {"id": [line_id, alternative], "from_status": [0, 1], "to_status": [0, 1]}
+        for line_id, alternative in topologies
+    ]
+    batch = combine_topologies(update_data, "line", switches)
+    line_bytes = batch["line"]["indptr"].nbytes + sum(values.nbytes for values in batch["line"]["data"].values())
+    return PowerGridModel(input_data).calculate_power_flow(update_data=batch)["line"]["loading"], line_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("grid", nargs="?", type=Path, default=DEFAULT_GRID)
+    parser.add_argument("--repeat", type=int, default=4, help="number of times the profile is repeated")
+    args = parser.parse_args()
+
+    input_data = meshed_input(args.grid)
+    with open(args.grid / "meta_data.json", "r", encoding="utf-8") as fp:
+        lv_busbar = json.load(fp)["lv_busbar"]
+    update_data, _ = read_profile_update(
+        args.grid / "active_power_profile.parquet", args.grid / "reactive_power_profile.parquet"
+    )
+    update_data = repeat_scenarios(update_data, args.repeat)
+    topologies = n1_topologies(input_data, lv_busbar)
+
+    rows = []
+    reference = None
+    for name, method in (("rebuild", rebuild), ("dense", dense), ("sparse", sparse)):
+        start = time.perf_counter()
+        loading, line_bytes = method(input_data, update_data, topologies)
+        elapsed = time.perf_counter() - start
+        reference = loading if reference is None else reference
+        rows.append(
+            {
+                "method": name,
+                "topologies": len(topologies),
+                "seconds": elapsed,
+                "line_update_kb": line_bytes / 1024,
+                "max_difference": np.abs(loading - reference).max(),
+            }
+        )
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.4g"))
+
+
+if __name__ == "__main__":
+    main()
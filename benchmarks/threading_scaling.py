@@ -0,0 +1,90 @@
+"""
+Threading Scaling Benchmark
+
+Runs every entry point of the package with an increasing number of power_grid_model threads and reports
+the speedup with respect to the sequential run. The profiles of the grid package are repeated to make
+the batch long enough to be worth parallelising.
+
+Usage:
+    python benchmarks/threading_scaling.py [grid_package_dir] [--repeat 20] [--threads 1 2 4 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.ev_penetration import ev_penetration
+from power_system_simulation.execution import ExecutionConfig
+from power_system_simulation.nm_calculation import nm_function
+from power_system_simulation.optimal_tap_position import optimal_tap_position
+
+DEFAULT_GRID = Path(__file__).parents[1] / "tests" / "data" / "Exception_test_data"
+
+
+def repeat_profile(path: Path, repeat: int, target: Path) -> Path:
+    """Write a copy of the profile with the timeline repeated `repeat` times."""
+    profile = pd.read_parquet(path)
+    step = profile.index[1] - profile.index[0]
+    long_profile = pd.concat([profile] * repeat)
+    long_profile.index = pd.date_range(profile.index[0], periods=len(long_profile), freq=step, name=profile.index.name)
+    long_profile.to_parquet(target)
+    return target
+
+
+def timed(function, *args, **kwargs) -> float:
+    """Run function with its printed output suppressed and return the wall time."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("grid", nargs="?", type=Path, default=DEFAULT_GRID)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument("--line-id", type=int, default=18)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        network = tmp / "input_network_data.json"
+        network.write_bytes((args.grid / "input_network_data.json").read_bytes())
+        meta = args.grid / "meta_data.json"
+        active = repeat_profile(args.grid / "active_power_profile.parquet", args.repeat, tmp / "active.parquet")
+        reactive = repeat_profile(args.grid / "reactive_power_profile.parquet", args.repeat, tmp / "reactive.parquet")
+        ev_profile = repeat_profile(args.grid / "ev_active_power_profile.parquet", args.repeat, tmp / "ev.parquet")
+
+        entry_points = {
+            "calculate_power_grid": lambda cfg: calculate_power_grid(network, active, reactive, execution_config=cfg),
+            "nm_function": lambda cfg: nm_function(args.line_id, network, meta, active, reactive, execution_config=cfg),
+            "ev_penetration": lambda cfg: ev_penetration(
+                network, meta, active, ev_profile, 50, 1, execution_config=cfg
+            ),
+            "optimal_tap_position": lambda cfg: optimal_tap_position(
+                network, active, reactive, 0, execution_config=cfg
+            ),
+        }
+
+        rows = []
+        for name, entry_point in entry_points.items():
+            baseline = timed(entry_point, ExecutionConfig(threading=-1))
+            for threads in args.threads:
+                elapsed = timed(entry_point, ExecutionConfig(threading=threads))
+                rows.append(
+                    {"entry_point": name, "threads": threads, "seconds": elapsed, "speedup": baseline / elapsed}
+                )
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format="%.3f"))
+
+
+if __name__ == "__main__":
+    main()
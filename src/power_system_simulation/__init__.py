@@ -0,0 +1,97 @@
+"""
+Power System Simulation
+
+The submodules and the main entry points of the package are imported on first use, so importing the package
+(e.g. by the command line tool or a worker process) does not pull in power_grid_model, pandas or networkx
+before they are needed:
+
+    import power_system_simulation as pss
+
+    pss.calculate_power_grid(...)  # imports calculation_module here
+    pss.ev_penetration.ev_penetration(...)  # submodules are attributes as well
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "aggregation",
+    "batch_data",
+    "calculation_module",
+    "checkpoint",
+    "cli",
+    "contingency",
+    "deduplication",
+    "ev_penetration",
+    "ev_sensitivity",
+    "execution",
+    "executors",
+    "fleet",
+    "graph_processing",
+    "incremental",
+    "nm_calculation",
+    "optimal_tap_position",
+    "radial_sweep",
+    "reconfiguration",
+    "run_options",
+    "scenario_cache",
+    "screening",
+    "shared_buffers",
+    "studies",
+    "time_series",
+    "top_k",
+    "validate_power_system_simulation",
+    "violations",
+}
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "rollup_power_flow_results": "aggregation",
+    "calculate_power_grid": "calculation_module",
+    "read_profile_update": "calculation_module",
+    "run_batch_power_flow": "calculation_module",
+    "run_grid_power_flow": "calculation_module",
+    "Checkpoint": "checkpoint",
+    "nk_contingency_analysis": "contingency",
+    "ev_monte_carlo": "ev_penetration",
+    "screen_ev_placements": "ev_sensitivity",
+    "ExecutionConfig": "execution",
+    "execution_config": "execution",
+    "get_execution_config": "execution",
+    "set_execution_config": "execution",
+    "SocketExecutor": "executors",
+    "make_executor": "executors",
+    "run_fleet": "fleet",
+    "GraphProcessor": "graph_processing",
+    "IncrementalSession": "incremental",
+    "nm_function": "nm_calculation",
+    "RadialSweepSolver": "radial_sweep",
+    "optimize_reconfiguration": "reconfiguration",
+    "RunOptions": "run_options",
+    "ScenarioCache": "scenario_cache",
+    "ScreeningConfig": "screening",
+    "SharedArrays": "shared_buffers",
+    "TopK": "top_k",
+    "ViolationTracker": "violations",
+    "violation_events": "violations",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    """Import a submodule or the submodule of a public name on first access."""
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
@@ -0,0 +1,185 @@
+"""
+Aggregation Module
+
+This script defines the time-aware rollups of a time series batch output. Line losses are integrated with the
+trapezoidal rule over the real time between the timestamps (Total_Loss of aggregate_power_flow_results assumes
+one hour between all timestamps), and the losses, extrema and means of the node voltages and line loadings
+are rolled up per hour, day and month.
+
+The batch output is read once: every interval between two timestamps is integrated and the hourly partial
+sums, extrema and counts are reduced with ufunc.reduceat over the sorted timestamps. The daily partials are
+reduced from the hourly ones and the monthly from the daily ones, so no intermediate pandas frames are built.
+An interval is counted in the period of the timestamp it starts at.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+# resolution -> numpy datetime unit of its periods, from fine to coarse
+RESOLUTIONS = {"hourly": "h", "daily": "D", "monthly": "M"}
+
+# partial -> ufunc that merges partials of finer periods
+PARTIALS = {
+    "voltage_max": np.maximum,
+    "voltage_min": np.minimum,
+    "voltage_sum": np.add,
+    "loading_max": np.maximum,
+    "loading_min": np.minimum,
+    "loading_sum": np.add,
+    "loss": np.add,
+    "count": np.add,
+}
+
+
+class InvalidTimestampsError(Exception):
+    """Exception raised when the timestamps are not strictly increasing or do not match the output."""
+
+
+class InvalidResolutionError(Exception):
+    """Exception raised when a rollup resolution is not hourly, daily or monthly."""
+
+
+def _wall_time(timestamps: pd.Index) -> np.ndarray:
+    timestamps = pd.DatetimeIndex(timestamps)
+    if timestamps.tz is not None:
+        # periods follow the local calendar
+        timestamps = timestamps.tz_localize(None)
+    return timestamps.to_numpy()
+
+
+def interval_hours(timestamps: pd.Index) -> np.ndarray:
+    """
+    Length of every interval between consecutive timestamps.
+
+    Args:
+        timestamps (pd.Index): Strictly increasing timestamps.
+
+    Returns:
+        np.ndarray: One length in hours less than there are timestamps.
+    """
+    hours = np.diff(_wall_time(timestamps)) / np.timedelta64(1, "h")
+    if np.any(hours <= 0):
+        raise InvalidTimestampsError("The timestamps must be strictly increasing.")
+    return hours
+
+
+def interval_energy(power: np.ndarray, hours: np.ndarray) -> np.ndarray:
+    """
+    Trapezoidal energy of every interval between consecutive timestamps.
+
+    Args:
+        power (np.ndarray): Power in W per timestamp (rows) and component (columns).
+        hours (np.ndarray): Interval lengths from interval_hours.
+
+    Returns:
+        np.ndarray: Energy in kWh per interval and component; the rows sum to the integral over the profile.
+    """
+    return (power[:-1] + power[1:]) * (hours[:, np.newaxis] / 2000)
+
+
+def line_energy_losses(output_data: Dict, timestamps: pd.Index) -> np.ndarray:
+    """
+    Energy losses of every line in kWh, integrated over the real time between the timestamps.
+
+    Args:
+        output_data (Dict): Batch output dataset, one scenario per timestamp.
+        timestamps (pd.Index): Strictly increasing timestamps of the scenarios.
+
+    Returns:
+        np.ndarray: Losses per line, in the order of the line output.
+    """
+    losses = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])
+    return interval_energy(losses, interval_hours(timestamps)).sum(axis=0)
+
+
+def _period_starts(periods: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.concatenate([[True], periods[1:] != periods[:-1]]))
+
+
+def _reduce(partials: Dict[str, np.ndarray], starts: np.ndarray) -> Dict[str, np.ndarray]:
+    return {name: PARTIALS[name].reduceat(values, starts, axis=0) for name, values in partials.items()}
+
+
+def _tables(partials: Dict[str, np.ndarray], periods: np.ndarray, n_nodes: int, line_ids: np.ndarray) -> tuple:
+    index = pd.DatetimeIndex(periods.astype("datetime64[ns]"), name="Period")
+    voltage_df = pd.DataFrame(
+        {
+            "Max_Voltage": partials["voltage_max"],
+            "Mean_Voltage": partials["voltage_sum"] / (partials["count"] * n_nodes),
+            "Min_Voltage": partials["voltage_min"],
+        },
+        index=index,
+    )
+    line_df = pd.DataFrame(
+        {
+            "Loss_kWh": partials["loss"].ravel(),
+            "Max_Loading": partials["loading_max"].ravel(),
+            "Mean_Loading": (partials["loading_sum"] / partials["count"][:, np.newaxis]).ravel(),
+            "Min_Loading": partials["loading_min"].ravel(),
+        },
+        index=pd.MultiIndex.from_arrays(
+            [np.repeat(index, len(line_ids)), np.tile(line_ids, len(index))], names=["Period", "Line_ID"]
+        ),
+    )
+    return voltage_df, line_df
+
+
+def rollup_power_flow_results(
+    output_data: Dict,
+    timestamps: pd.Index,
+    resolutions: Sequence[str] = tuple(RESOLUTIONS),
+) -> Dict[str, tuple]:
+    """
+    Roll up a time series batch output per hour, day and/or month in one pass.
+
+    Args:
+        output_data (Dict): Batch output dataset, one scenario per timestamp.
+        timestamps (pd.Index): Strictly increasing timestamps of the scenarios.
+        resolutions (Sequence[str]): Rollups to return: hourly, daily and/or monthly.
+
+    Returns:
+        Dict[str, tuple]: Per resolution a voltage_df indexed by Period (the start of the hour, day or month)
+            with the maximum, mean and minimum node voltage, and a line_df indexed by Period and Line_ID with
+            the energy losses in kWh and the maximum, mean and minimum loading.
+    """
+    if any(resolution not in RESOLUTIONS for resolution in resolutions):
+        raise InvalidResolutionError(f"The resolutions must be one or more of {tuple(RESOLUTIONS)}.")
+    node_voltages = output_data["node"]["u_pu"]
+    line_loadings = output_data["line"]["loading"]
+    if len(timestamps) != len(node_voltages) or len(timestamps) == 0:
+        raise InvalidTimestampsError("There must be one timestamp per scenario of the output.")
+    wall_time = _wall_time(timestamps)
+    hours = interval_hours(timestamps)
+
+    # the only pass over the batch output: per timestamp, with the interval that starts at it
+    losses = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])
+    partials = {
+        "voltage_max": node_voltages.max(axis=1),
+        "voltage_min": node_voltages.min(axis=1),
+        "voltage_sum": node_voltages.sum(axis=1),
+        "loading_max": line_loadings,
+        "loading_min": line_loadings,
+        "loading_sum": line_loadings,
+        "loss": np.concatenate([interval_energy(losses, hours), np.zeros((1, losses.shape[1]))]),
+        "count": np.ones(len(wall_time), dtype=np.int64),
+    }
+    periods = wall_time
+
+    rollups = {}
+    for resolution, unit in RESOLUTIONS.items():
+        if len(rollups) == len(set(resolutions)):
+            break
+        # every period is reduced from the partials of the finer periods it contains
+        coarse = periods.astype(f"datetime64[{unit}]")
+        starts = _period_starts(coarse)
+        partials = _reduce(partials, starts)
+        periods = coarse[starts]
+        if resolution in resolutions:
+            rollups[resolution] = _tables(partials, periods, node_voltages.shape[1], output_data["line"]["id"][0])
+    return {resolution: rollups[resolution] for resolution in resolutions}
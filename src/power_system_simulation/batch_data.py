@@ -0,0 +1,204 @@
+"""
+Batch Data Module
+
+Helper functions for power_grid_model batch datasets: building columnar update datasets, counting the
+scenarios of an update dataset, selecting a subset of scenarios and writing the results of a subset back
+into a full batch output.
+
+A component of a dataset is either a structured array (row based) or a dictionary of plain arrays per
+attribute (columnar). Columnar updates only hold the attributes that change; their IDs are broadcast over
+the scenarios as a view, so they take the memory of one scenario. A sparse component (a dictionary with
+indptr and data) only lists the components that change in every scenario, e.g. the two lines that are
+switched in an N-1 scenario, so a topology change can be combined with a dense time series in one batch.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+from power_grid_model import initialize_array
+
+ComponentData = Union[np.ndarray, Dict[str, np.ndarray]]
+
+
+class BatchSizeMismatchError(Exception):
+    """Exception raised when the components of a batch dataset have a different number of scenarios."""
+
+
+def attribute_names(component_data: ComponentData) -> Tuple[str, ...]:
+    """Names of the attributes of a component in row or columnar format."""
+    if isinstance(component_data, dict):
+        return tuple(component_data)
+    return component_data.dtype.names
+
+
+def is_sparse(component_data: ComponentData) -> bool:
+    """Whether a component is a sparse batch (indptr and data) instead of a dense one."""
+    return isinstance(component_data, dict) and "indptr" in component_data
+
+
+def component_shape(component_data: ComponentData) -> Tuple[int, ...]:
+    """Shape (scenarios, components) of a component in row or columnar format."""
+    if isinstance(component_data, dict):
+        return np.shape(next(iter(component_data.values())))
+    return np.shape(component_data)
+
+
+def is_broadcast(values: np.ndarray) -> bool:
+    """Whether the attribute values are one scenario broadcast over all scenarios (a view with stride 0)."""
+    return values.ndim > 1 and values.strides[0] == 0
+
+
+def columnar_update(ids: np.ndarray, **attributes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Build the columnar batch update of one component.
+
+    Args:
+        ids (np.ndarray): IDs of the updated components, one per column of the attributes.
+        **attributes (np.ndarray): Updated attributes, e.g. p_specified, each of shape (scenarios, components).
+
+    Returns:
+        Dict[str, np.ndarray]: The attributes with the IDs broadcast over the scenarios.
+    """
+    shape = np.shape(next(iter(attributes.values())))
+    return {"id": np.broadcast_to(np.asarray(ids, dtype=np.int32), shape), **attributes}
+
+
+def sparse_update(component: str, changes: Sequence[Dict[str, Sequence]]) -> Dict:
+    """
+    Build the sparse (indptr-based) columnar batch update of one component.
+
+    Args:
+        component (str): Component type, e.g. line, which sets the data types of the attributes.
+        changes (Sequence[Dict[str, Sequence]]): Per scenario, the id and the updated attributes of the changed
+            components, with the same attributes in every scenario. An empty dictionary changes nothing.
+
+    Returns:
+        Dict: indptr with the start of every scenario in data, and data with the changes of all scenarios.
+    """
+    indptr = np.zeros(len(changes) + 1, dtype=np.int64)
+    np.cumsum([len(change.get("id", ())) for change in changes], out=indptr[1:])
+    names = next((tuple(change) for change in changes if change), ("id",))
+    dtype = initialize_array("update", component, 0).dtype
+    data = {
+        name: np.concatenate([np.asarray(change[name]) for change in changes if change] or [np.empty(0)]).astype(
+            dtype[name]
+        )
+        for name in names
+    }
+    return {"indptr": indptr, "data": data}
+
+
+def combine_topologies(update_data: Dict, component: str, changes: Sequence[Dict[str, Sequence]]) -> Dict:
+    """
+    Combine a dense time series with sparse topology changes in one batch.
+
+    Args:
+        update_data (Dict): Dense batch update dataset of the time series, without the component.
+        component (str): Component that the topology changes apply to, e.g. line.
+        changes (Sequence[Dict[str, Sequence]]): The changes of every topology, as in sparse_update.
+
+    Returns:
+        Dict: Batch update dataset with the whole time series for the first topology, then for the second, etc.
+    """
+    n_scenarios = batch_size(update_data)
+    combined = repeat_scenarios(update_data, len(changes))
+    topologies = {component: sparse_update(component, changes)}
+    combined[component] = select_scenarios(topologies, np.repeat(np.arange(len(changes)), n_scenarios))[component]
+    return combined
+
+
+def _take(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    if is_broadcast(values):
+        return np.broadcast_to(values[0], (len(indices),) + values.shape[1:])
+    return values[indices]
+
+
+def _select_sparse(component_data: Dict, indices: np.ndarray) -> Dict:
+    """Select scenarios of a sparse component by gathering the rows of data of every selected scenario."""
+    indptr = component_data["indptr"]
+    counts = np.diff(indptr)[indices]
+    selected_indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(counts, out=selected_indptr[1:])
+    rows = np.arange(selected_indptr[-1]) + np.repeat(indptr[indices] - selected_indptr[:-1], counts)
+    data = component_data["data"]
+    if isinstance(data, dict):
+        return {"indptr": selected_indptr, "data": {name: values[rows] for name, values in data.items()}}
+    return {"indptr": selected_indptr, "data": data[rows]}
+
+
+def _select_component(component_data: ComponentData, indices: np.ndarray) -> ComponentData:
+    if is_sparse(component_data):
+        return _select_sparse(component_data, indices)
+    if isinstance(component_data, dict):
+        return {name: _take(values, indices) for name, values in component_data.items()}
+    return component_data[indices]
+
+
+def batch_size(update_data: Dict) -> int:
+    """
+    Number of scenarios in a batch update dataset.
+
+    Args:
+        update_data (Dict): Batch update dataset with dense components of shape (scenarios, components) or
+            sparse components.
+
+    Returns:
+        int: Number of scenarios.
+    """
+    sizes = {
+        len(component_data["indptr"]) - 1 if is_sparse(component_data) else component_shape(component_data)[0]
+        for component_data in update_data.values()
+    }
+    if len(sizes) != 1:
+        raise BatchSizeMismatchError("All components of the batch dataset must have the same number of scenarios.")
+    return sizes.pop()
+
+
+def select_scenarios(batch_data: Dict, indices: np.ndarray) -> Dict:
+    """
+    Select a subset of the scenarios of a batch dataset.
+
+    Args:
+        batch_data (Dict): Batch dataset (update or output) with dense or sparse components.
+        indices (np.ndarray): Scenario indices to keep, in the order they should appear.
+
+    Returns:
+        Dict: Batch dataset with only the selected scenarios.
+    """
+    indices = np.asarray(indices)
+    return {component: _select_component(component_data, indices) for component, component_data in batch_data.items()}
+
+
+def repeat_scenarios(update_data: Dict, repeats: int) -> Dict:
+    """
+    Repeat all scenarios of a batch update dataset, e.g. to solve the same profile for several topologies.
+
+    Args:
+        update_data (Dict): Batch update dataset.
+        repeats (int): Number of copies of the batch.
+
+    Returns:
+        Dict: Batch update dataset with the scenarios of update_data repeated one batch after the other.
+    """
+    return select_scenarios(update_data, np.tile(np.arange(batch_size(update_data)), repeats))
+
+
+def scatter_scenarios(target: Dict, indices: np.ndarray, source: Dict) -> Dict:
+    """
+    Write the scenarios of source into the given positions of target, in place.
+
+    Args:
+        target (Dict): Full batch output dataset.
+        indices (np.ndarray): Scenario positions in target, one per scenario in source.
+        source (Dict): Batch output dataset of the selected scenarios.
+
+    Returns:
+        Dict: The updated target.
+    """
+    for component, array in source.items():
+        target[component][indices] = array
+    return target
@@ -10,13 +10,29 @@ Date: 25/05/2024
 
 """
 
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict, Hashable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from power_grid_model import CalculationMethod, CalculationType, PowerGridModel, initialize_array
+import pyarrow as pa
+import pyarrow.parquet as pq
+from power_grid_model import CalculationMethod, CalculationType, PowerGridModel
 from power_grid_model.utils import json_deserialize
-from power_grid_model.validation import assert_valid_batch_data, assert_valid_input_data
+
+from power_system_simulation.aggregation import rollup_power_flow_results
+from power_system_simulation.batch_data import batch_size, columnar_update
+from power_system_simulation.deduplication import deduplicated_power_flow
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+from power_system_simulation.radial_sweep import RadialSweepSolver
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.scenario_cache import ScenarioCache, dataset_digest
+from power_system_simulation.screening import screened_power_flow
+from power_system_simulation.time_series import chain_hooks, count_newton_raphson_iterations, sequential_power_flow
+from power_system_simulation.top_k import TopK, top_k_hook
+from power_system_simulation.violations import ViolationTracker, violation_hook
+
+PROFILE_BATCH_ROWS = 4096
 
 
 class TimestampsDoNotMatchError(Exception):
@@ -27,29 +43,21 @@ class LoadIdsDoNotMatchError(Exception):
     """Exception raised when Load IDs of active and reactive power profiles do not match."""
 
 
-def calculate_power_grid(
-    input_network_data: Dict, active_power_profile_path: str, reactive_power_profile_path: str
-) -> Dict:
+class MissingNetworkFingerprintError(Exception):
+    """Exception raised when a scenario cache is used without the fingerprint of the network."""
+
+
+def read_load_profiles(active_power_profile_path: str, reactive_power_profile_path: str) -> tuple:
     """
-    Analyze power flow on the given power grid network using provided active and reactive power profile data.
+    Read the active and reactive power profiles and check that their timestamps and load IDs match.
 
     Args:
-        input_network_data (Dict): Input network data in JSON format.
         active_power_profile_path (str): Path to the parquet file containing active power profile data.
         reactive_power_profile_path (str): Path to the parquet file containing reactive power profile data.
 
     Returns:
-        Dict: Aggregated power flow results containing voltage statistics and line loading information.
+        tuple: active_power_profile and reactive_power_profile DataFrames (timestamps x load IDs).
     """
-    # Load input network data
-    with open(input_network_data, "r", encoding="utf-8") as fp_open:
-        input_data = json_deserialize(fp_open.read())
-
-    # Validate input data
-    assert_valid_input_data(input_data=input_data, calculation_type=CalculationType.power_flow)
-    model = PowerGridModel(input_data=input_data)
-
-    # Load active and reactive power profiles
     active_power_profile = pd.read_parquet(active_power_profile_path)
     reactive_power_profile = pd.read_parquet(reactive_power_profile_path)
 
@@ -59,79 +67,463 @@ def calculate_power_grid(
     if not (active_power_profile.columns == reactive_power_profile.columns).all():
         raise LoadIdsDoNotMatchError("Load IDs of active and reactive power profiles do not match.")
 
-    # Create PGM batch update dataset
-    load_profile = initialize_array("update", "sym_load", active_power_profile.shape)
-    load_profile["id"] = active_power_profile.columns.to_numpy()
-    load_profile["p_specified"] = active_power_profile.to_numpy()
-    load_profile["q_specified"] = reactive_power_profile.to_numpy()
-    update_data = {"sym_load": load_profile}
+    return active_power_profile, reactive_power_profile
 
-    # Validate batch data
-    assert_valid_batch_data(input_data=input_data, update_data=update_data, calculation_type=CalculationType.power_flow)
 
-    # Run power flow calculations
-    output_data = model.calculate_power_flow(
-        update_data=update_data, calculation_method=CalculationMethod.newton_raphson
+def load_profile_update(active_power_profile: pd.DataFrame, reactive_power_profile: pd.DataFrame) -> Dict:
+    """
+    Create the PGM batch update dataset of sym_load from the power profiles, one scenario per timestamp.
+
+    Args:
+        active_power_profile (pd.DataFrame): Active power per timestamp (rows) and load ID (columns).
+        reactive_power_profile (pd.DataFrame): Reactive power with the same timestamps and load IDs.
+
+    Returns:
+        Dict: Columnar batch update dataset.
+    """
+    load_profile = columnar_update(
+        active_power_profile.columns.to_numpy(),
+        p_specified=active_power_profile.to_numpy(dtype=np.float64),
+        q_specified=reactive_power_profile.to_numpy(dtype=np.float64),
     )
+    return {"sym_load": load_profile}
 
-    # Extract necessary data from output_data
-    node_voltages = output_data["node"]["u_pu"]
-    node_ids = output_data["node"]["id"]
-    line_loadings = output_data["line"]["loading"]
-    line_ids = output_data["line"]["id"]
-    p_from = output_data["line"]["p_from"]
-    p_to = output_data["line"]["p_to"]
-    timestamps = active_power_profile.index
-
-    # Aggregating voltage results
-    voltage_results = []
-    for i, timestamp in enumerate(timestamps):
-        max_voltage = node_voltages[i].max()
-        min_voltage = node_voltages[i].min()
-        max_voltage_node = node_ids[i, np.argmax(node_voltages[i])]
-        min_voltage_node = node_ids[i, np.argmin(node_voltages[i])]
-
-        voltage_results.append(
-            {
-                "Timestamp": timestamp,
-                "Max_Voltage": max_voltage,
-                "Max_Voltage_Node": max_voltage_node,
-                "Min_Voltage": min_voltage,
-                "Min_Voltage_Node": min_voltage_node,
-            }
+
+def _profile_columns(parquet_file: pq.ParquetFile) -> tuple:
+    """Names of the index column and of the load ID columns of a profile written by pandas."""
+    # a RangeIndex is stored as a description (a dict) instead of a column
+    pandas_metadata = parquet_file.schema_arrow.pandas_metadata or {}
+    index_columns = [column for column in pandas_metadata.get("index_columns", []) if isinstance(column, str)]
+    load_columns = [name for name in parquet_file.schema_arrow.names if name not in index_columns]
+    return (index_columns[0] if index_columns else None), load_columns
+
+
+def _profile_timestamps(parquet_file: pq.ParquetFile, index_column: Optional[str]) -> pd.Index:
+    if index_column is None:
+        return pd.RangeIndex(parquet_file.metadata.num_rows)
+    return pd.Index(parquet_file.read(columns=[index_column]).column(0).to_pandas(), name=index_column)
+
+
+def profile_ids(profile_path: str) -> List[int]:
+    """
+    Read the load (or EV profile) IDs of a profile from the parquet schema, without reading the data.
+
+    Args:
+        profile_path (str): Path to a parquet file with one column per ID.
+
+    Returns:
+        List[int]: The IDs in column order.
+    """
+    _, load_columns = _profile_columns(pq.ParquetFile(profile_path))
+    return [int(name) for name in load_columns]
+
+
+def fill_from_profile(target: np.ndarray, profile_path: str, ids: List[int], add: bool = False) -> None:
+    """
+    Write (or add) columns of a parquet profile into a timestamps x IDs array, one record batch at a time.
+
+    The columns are copied from the Arrow buffers straight into target, e.g. update["p_specified"], so no
+    DataFrame or full-size intermediate is made.
+
+    Args:
+        target (np.ndarray): Array with one row per timestamp and one column per ID.
+        profile_path (str): Path to the parquet profile.
+        ids (List[int]): IDs of the columns to read, in the column order of target.
+        add (bool): Add the profile to target instead of overwriting it.
+    """
+    parquet_file = pq.ParquetFile(profile_path)
+    names = [str(profile_id) for profile_id in ids]
+    row = 0
+    for batch in parquet_file.iter_batches(batch_size=PROFILE_BATCH_ROWS, columns=names):
+        rows = slice(row, row + batch.num_rows)
+        for column, values in enumerate(batch.columns):
+            if add:
+                target[rows, column] += values.to_numpy(zero_copy_only=False)
+            else:
+                target[rows, column] = values.to_numpy(zero_copy_only=False)
+        row += batch.num_rows
+
+
+def read_input_data(input_network_data: str) -> Dict:
+    """
+    Read the input network data of a grid and validate it for a power flow.
+
+    Args:
+        input_network_data (str): Path to the input network data in the power_grid_model JSON format.
+
+    Returns:
+        Dict: The input dataset.
+    """
+    from power_grid_model.validation import assert_valid_input_data  # pylint: disable=import-outside-toplevel
+
+    with open(input_network_data, "r", encoding="utf-8") as fp_open:
+        input_data = json_deserialize(fp_open.read())
+    assert_valid_input_data(input_data=input_data, calculation_type=CalculationType.power_flow)
+    return input_data
+
+
+def read_profile_update(
+    active_power_profile_path: str,
+    reactive_power_profile_path: Optional[str] = None,
+    load_ids: Optional[List[int]] = None,
+) -> tuple:
+    """
+    Build the PGM batch update dataset of sym_load directly from the parquet profiles.
+
+    This gives the same dataset as read_load_profiles followed by load_profile_update, but the profiles are
+    streamed into the p_specified and q_specified arrays instead of going through DataFrames, so the peak
+    memory is the update arrays plus one record batch.
+
+    Args:
+        active_power_profile_path (str): Path to the parquet file containing active power profile data.
+        reactive_power_profile_path (str, optional): Path to the parquet file containing reactive power
+            profile data. If not given, q_specified is not updated and the input reactive power is kept.
+        load_ids (List[int], optional): Only update these loads. Defaults to every load of the profile.
+
+    Returns:
+        tuple: The batch update dataset and the timestamps of its scenarios.
+    """
+    active_file = pq.ParquetFile(active_power_profile_path)
+    index_column, load_columns = _profile_columns(active_file)
+    timestamps = _profile_timestamps(active_file, index_column)
+    if load_ids is None:
+        load_ids = [int(name) for name in load_columns]
+
+    if reactive_power_profile_path is not None:
+        reactive_file = pq.ParquetFile(reactive_power_profile_path)
+        reactive_index_column, reactive_load_columns = _profile_columns(reactive_file)
+
+        # Check if timestamps and load IDs match
+        if not timestamps.equals(_profile_timestamps(reactive_file, reactive_index_column)):
+            raise TimestampsDoNotMatchError("Timestamps of active and reactive power profiles do not match.")
+        if reactive_load_columns != load_columns:
+            raise LoadIdsDoNotMatchError("Load IDs of active and reactive power profiles do not match.")
+
+    attributes = {"p_specified": active_power_profile_path, "q_specified": reactive_power_profile_path}
+    load_profile = columnar_update(
+        load_ids,
+        **{name: np.empty((len(timestamps), len(load_ids))) for name, path in attributes.items() if path is not None},
+    )
+    for name, path in attributes.items():
+        if path is not None:
+            fill_from_profile(load_profile[name], path, load_ids)
+    return {"sym_load": load_profile}, timestamps
+
+
+def _run_settings(
+    model: Union[PowerGridModel, RadialSweepSolver], execution_config: Optional[ExecutionConfig], options: RunOptions
+) -> str:
+    """Description of every setting of run_batch_power_flow that changes the result."""
+    config = resolve_execution_config(execution_config)
+    return repr(
+        (
+            config.power_flow_kwargs(CalculationMethod.newton_raphson) | {"threading": None},
+            vars(options.screening) if options.screening is not None else None,
+            options.quantum if options.deduplicate else None,
+            type(model).__name__,
+        )
+    )
+
+
+def run_batch_power_flow(
+    model: Union[PowerGridModel, RadialSweepSolver],
+    update_data: Dict,
+    *,
+    execution_config: Optional[ExecutionConfig] = None,
+    options: Optional[RunOptions] = None,
+    report: Optional[Dict] = None,
+    network_fingerprint: Optional[str] = None,
+    on_chunk: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Run a time series batch power flow, by default with Newton-Raphson.
+
+    Args:
+        model (PowerGridModel or RadialSweepSolver): Model of the grid. A RadialSweepSolver is started from
+            the state of the previous chunk in sequential runs.
+        update_data (Dict): Batch update dataset, one scenario per timestamp.
+        execution_config (ExecutionConfig, optional): Threading and solver settings. Defaults to the
+            package-level configuration.
+        options (RunOptions, optional): Screening, chunking, deduplication, cache and checkpoint of the run.
+            Defaults to one batch without any of them.
+        report (Dict, optional): If given, filled with statistics of the run.
+        network_fingerprint (str, optional): dataset_digest of the input data of model, required with a cache
+            or checkpoint.
+        on_chunk (Callable, optional): Called with the batch output in timestamp order: per chunk as soon as it
+            is solved in sequential runs, else once with the whole output.
+
+    Returns:
+        Dict: Batch output dataset.
+    """
+    options = options if options is not None else RunOptions()
+    options.check(model, report)
+    if options.needs_fingerprint and network_fingerprint is None:
+        raise MissingNetworkFingerprintError(
+            "A network fingerprint is required to use a scenario cache or a checkpoint."
         )
 
-    # Aggregating line loading results
-    line_results = []
-    count = 0
-    for line_id in np.unique(line_ids):
-        loadings = line_loadings[line_ids == line_id]
-        max_loading = loadings.max()
-        min_loading = loadings.min()
-        max_loading_time = timestamps[loadings.argmax()]
-        min_loading_time = timestamps[loadings.argmin()]
-        energy_losses = abs(p_from[:, count] + p_to[:, count])
-        energy_loss_kwh = np.trapz(energy_losses) / 1000
-        count = count + 1
-
-        line_results.append(
-            {
-                "Line_ID": line_id,
-                "Total_Loss": energy_loss_kwh,
-                "Max_Loading": max_loading,
-                "Max_Loading_Timestamp": max_loading_time,
-                "Min_Loading": min_loading,
-                "Min_Loading_Timestamp": min_loading_time,
-            }
+    if options.cache is not None:
+        key = options.cache.key(network_fingerprint, update_data, _run_settings(model, execution_config, options))
+        output_data = options.cache.get(key)
+        if report is not None:
+            report["cache"] = "miss" if output_data is None else "hit"
+        if output_data is not None:
+            if on_chunk is not None:
+                on_chunk(output_data)
+            return output_data
+        output_data = run_batch_power_flow(
+            model,
+            update_data,
+            execution_config=execution_config,
+            options=options.replace(cache=None),
+            report=report,
+            network_fingerprint=network_fingerprint,
+            on_chunk=on_chunk,
         )
+        options.cache.put(key, output_data)
+        return output_data
 
-    # Create DataFrame for voltage results
-    voltage_df = pd.DataFrame(voltage_results)
-    voltage_df.set_index("Timestamp", inplace=True)
+    if options.deduplicate:
+        # the unique snapshots are not in timestamp order, the expanded output is passed on as a whole
+        output_data = deduplicated_power_flow(
+            update_data,
+            lambda unique_update_data: run_batch_power_flow(
+                model,
+                unique_update_data,
+                execution_config=execution_config,
+                options=options.replace(deduplicate=False, quantum=None),
+                report=report,
+                network_fingerprint=network_fingerprint,
+            ),
+            options.quantum,
+            report,
+        )
+        if on_chunk is not None:
+            on_chunk(output_data)
+        return output_data
 
-    # Create DataFrame for line results
-    line_df = pd.DataFrame(line_results)
-    line_df.set_index("Line_ID", inplace=True)
+    # a solver that can be warm-started (RadialSweepSolver) counts its own iterations
+    warm_start = options.screening is None and getattr(model, "supports_initial_state", False)
+    config = resolve_execution_config(execution_config)
 
-    # Return aggregated results
+    def solve_chunk(chunk: Dict, initial_state: Optional[Dict]) -> Dict:
+        if warm_start:
+            return model.calculate_power_flow(
+                update_data=chunk,
+                initial_state=initial_state,
+                **config.power_flow_kwargs(CalculationMethod.newton_raphson),
+            )
+        return run_batch_power_flow(
+            model, chunk, execution_config=execution_config, options=RunOptions(screening=options.screening)
+        )
+
+    def solver_iterations(_chunk: Dict) -> np.ndarray:
+        return model.iterations.copy()
+
+    iteration_counter = None
+    if options.count_iterations:
+        if warm_start:
+            iteration_counter = solver_iterations
+        else:
+            iteration_counter = partial(count_newton_raphson_iterations, model, execution_config=execution_config)
+
+    chunk_size = options.chunk_size
+    checkpoint_run = None
+    if options.checkpoint is not None:
+        chunk_size = chunk_size or options.checkpoint.chunk_size
+        # counted iterations are stored with the chunks, so they are part of the run key
+        settings = repr((_run_settings(model, execution_config, options), chunk_size, iteration_counter is not None))
+        n_chunks = -(-batch_size(update_data) // chunk_size)
+        checkpoint_run = options.checkpoint.run(ScenarioCache.key(network_fingerprint, update_data, settings), n_chunks)
+
+    if chunk_size is not None:
+        return sequential_power_flow(
+            update_data, chunk_size, solve_chunk, report, iteration_counter, on_chunk, checkpoint_run
+        )
+
+    if iteration_counter is not None and not warm_start:
+        report["newton_raphson_iterations"] = iteration_counter(update_data)
+
+    if options.screening is not None:
+        output_data = screened_power_flow(model, update_data, options.screening, execution_config, report)
+    else:
+        output_data = model.calculate_power_flow(
+            update_data=update_data, **config.power_flow_kwargs(CalculationMethod.newton_raphson)
+        )
+        if iteration_counter is not None and warm_start:
+            report["newton_raphson_iterations"] = iteration_counter(update_data)
+    if on_chunk is not None:
+        on_chunk(output_data)
+    return output_data
+
+
+def run_grid_power_flow(
+    model: Union[PowerGridModel, RadialSweepSolver],
+    input_data: Dict,
+    update_data: Dict,
+    execution_config: Optional[ExecutionConfig] = None,
+    options: Optional[RunOptions] = None,
+    report: Optional[Dict] = None,
+    on_chunk: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Run run_batch_power_flow on a model of input_data, with the network fingerprint if the options need it.
+
+    Args:
+        model (PowerGridModel or RadialSweepSolver): Model of the grid.
+        input_data (Dict): Input data of model, only digested for a cache or checkpoint.
+        update_data (Dict): Batch update dataset, one scenario per timestamp.
+        execution_config (ExecutionConfig, optional): Threading and solver settings.
+        options (RunOptions, optional): Screening, chunking, deduplication, cache and checkpoint of the run.
+        report (Dict, optional): If given, filled with statistics of the run.
+        on_chunk (Callable, optional): Called with the batch output in timestamp order.
+
+    Returns:
+        Dict: Batch output dataset.
+    """
+    return run_batch_power_flow(
+        model,
+        update_data,
+        execution_config=execution_config,
+        options=options,
+        report=report,
+        network_fingerprint=dataset_digest(input_data) if options is not None and options.needs_fingerprint else None,
+        on_chunk=on_chunk,
+    )
+
+
+def _timestamp_column(timestamps: pd.Index, rows: np.ndarray, compact: bool) -> Union[np.ndarray, pd.Categorical]:
+    """The timestamps of rows, repeated or, when compact, as references (categorical codes) into timestamps."""
+    if compact:
+        return pd.Categorical.from_codes(rows, categories=timestamps)
+    return np.asarray(timestamps)[rows]
+
+
+def _arrow_table(index_name: str, index: np.ndarray, columns: Dict) -> pa.Table:
+    """A pyarrow Table with the index as first column. Numeric columns are not copied."""
+    arrays = {index_name: pa.array(index)}
+    for name, column in columns.items():
+        if isinstance(column, pd.Categorical):
+            arrays[name] = pa.DictionaryArray.from_arrays(column.codes, pa.array(np.asarray(column.categories)))
+        else:
+            arrays[name] = pa.array(column)
+    return pa.table(arrays)
+
+
+def aggregate_power_flow_results(
+    output_data: Dict, timestamps: pd.Index, compact: bool = False, arrow: bool = False
+) -> tuple:
+    """
+    Aggregate a time series batch output into a voltage table per timestamp and a loading table per line.
+
+    The tables are built column by column from the output arrays. Node and line IDs keep the int32 of
+    power_grid_model.
+
+    Args:
+        output_data (Dict): Batch output dataset, one scenario per timestamp.
+        timestamps (pd.Index): Timestamps of the scenarios.
+        compact (bool): Store the voltages and loadings as float32 and the loading timestamps as references
+            into timestamps (categorical columns, dictionary encoded in parquet) instead of repeated datetimes.
+        arrow (bool): Return pyarrow Tables, with the index as first column, that go to parquet or Arrow IPC
+            without conversion.
+
+    Returns:
+        tuple: voltage_df indexed by Timestamp and line_df indexed by Line_ID.
+    """
+    value_dtype = np.float32 if compact else np.float64
+
+    # Aggregating voltage results per timestamp
+    node_voltages = output_data["node"]["u_pu"]
+    node_ids = output_data["node"]["id"][0]
+    voltage_columns = {
+        "Max_Voltage": node_voltages.max(axis=1).astype(value_dtype),
+        "Max_Voltage_Node": node_ids[node_voltages.argmax(axis=1)],
+        "Min_Voltage": node_voltages.min(axis=1).astype(value_dtype),
+        "Min_Voltage_Node": node_ids[node_voltages.argmin(axis=1)],
+    }
+
+    # Aggregating line loading results per line, in the order of the line IDs
+    order = np.argsort(output_data["line"]["id"][0], kind="stable")
+    line_ids = output_data["line"]["id"][0][order]
+    line_loadings = output_data["line"]["loading"][:, order]
+    energy_losses = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])[:, order]
+    line_columns = {
+        "Total_Loss": np.trapz(energy_losses, axis=0) / 1000,
+        "Max_Loading": line_loadings.max(axis=0).astype(value_dtype),
+        "Max_Loading_Timestamp": _timestamp_column(timestamps, line_loadings.argmax(axis=0), compact),
+        "Min_Loading": line_loadings.min(axis=0).astype(value_dtype),
+        "Min_Loading_Timestamp": _timestamp_column(timestamps, line_loadings.argmin(axis=0), compact),
+    }
+
+    if arrow:
+        return (
+            _arrow_table("Timestamp", np.asarray(timestamps), voltage_columns),
+            _arrow_table("Line_ID", line_ids, line_columns),
+        )
+    voltage_df = pd.DataFrame(voltage_columns, index=pd.Index(np.asarray(timestamps), name="Timestamp"))
+    line_df = pd.DataFrame(line_columns, index=pd.Index(line_ids, name="Line_ID"))
     return voltage_df, line_df
+
+
+def calculate_power_grid(
+    input_network_data: Dict,
+    active_power_profile_path: str,
+    reactive_power_profile_path: str,
+    execution_config: Optional[ExecutionConfig] = None,
+    options: Optional[RunOptions] = None,
+    report: Optional[Dict] = None,
+    radial_sweep: bool = False,
+    violations: Optional[ViolationTracker] = None,
+    rollups: Optional[Dict] = None,
+    top_k: Optional[TopK] = None,
+    top_k_scenario: Optional[Hashable] = None,
+    compact: bool = False,
+    arrow: bool = False,
+) -> Dict:
+    """
+    Analyze power flow on the given power grid network using provided active and reactive power profile data.
+
+    Args:
+        input_network_data (Dict): Input network data in JSON format.
+        active_power_profile_path (str): Path to the parquet file containing active power profile data.
+        reactive_power_profile_path (str): Path to the parquet file containing reactive power profile data.
+        execution_config (ExecutionConfig, optional): Threading and solver settings. Defaults to the
+            package-level configuration.
+        options (RunOptions, optional): Screening, chunking, deduplication, cache and checkpoint of the run,
+            see run_batch_power_flow. With chunk_size, the timestamps are solved sequentially in timestamp order.
+        report (Dict, optional): If given, filled with statistics of the run (e.g. of the screening pass).
+        radial_sweep (bool): Solve with the backward/forward sweep of a RadialSweepSolver instead of
+            power_grid_model. Sequential chunks then start from the solution of the previous chunk.
+        violations (ViolationTracker, optional): If given, fed with the output (chunk by chunk in sequential
+            runs) to index the limit-violation events. Its timestamps default to those of the profiles.
+        rollups (Dict, optional): If given, filled with the hourly, daily and monthly voltage and line tables of
+            rollup_power_flow_results, with the losses integrated over the real time between the timestamps.
+        top_k (TopK, optional): If given, fed with the line loadings of every timestamp.
+        top_k_scenario (Hashable, optional): Scenario label of the loadings fed to top_k, e.g. the tap position.
+        compact (bool): Return float32 voltages and loadings and the loading timestamps as references into the
+            timestamps, see aggregate_power_flow_results.
+        arrow (bool): Return pyarrow Tables instead of DataFrames, see aggregate_power_flow_results.
+
+    Returns:
+        Dict: Aggregated power flow results containing voltage statistics and line loading information.
+    """
+    from power_grid_model.validation import assert_valid_batch_data  # pylint: disable=import-outside-toplevel
+
+    # Load and validate input network data
+    input_data = read_input_data(input_network_data)
+    model = RadialSweepSolver(input_data) if radial_sweep else PowerGridModel(input_data=input_data)
+
+    # Load active and reactive power profiles straight into the PGM batch update dataset
+    update_data, timestamps = read_profile_update(active_power_profile_path, reactive_power_profile_path)
+
+    # Validate batch data
+    assert_valid_batch_data(input_data=input_data, update_data=update_data, calculation_type=CalculationType.power_flow)
+
+    # Run power flow calculations
+    on_chunk = chain_hooks(violation_hook(violations, timestamps), top_k_hook(top_k, timestamps, top_k_scenario))
+    output_data = run_grid_power_flow(model, input_data, update_data, execution_config, options, report, on_chunk)
+    if rollups is not None:
+        rollups.update(rollup_power_flow_results(output_data, timestamps))
+
+    # Return aggregated results
+    return aggregate_power_flow_results(output_data, timestamps, compact, arrow)
@@ -0,0 +1,143 @@
+"""
+Checkpoint Module
+
+This script defines chunk-level checkpoints of long batch studies. A run is solved in chunks of scenarios (see
+time_series.sequential_power_flow) and every chunk that is done is written to the checkpoint directory with
+a manifest of the completed chunks of every run. A run that is started again after a crash loads the
+completed chunks instead of solving them, so only the remaining chunks are solved and the result is the same
+as that of an uninterrupted run.
+
+Runs are identified by a key made from the network fingerprint, the update data, the solver settings and the
+chunk size (see run_batch_power_flow), so one directory can hold the chunks of several runs, e.g. every
+alternative of an N-1 study, and chunks of another network or profile are never reused. Chunks and the
+manifest are written to a temporary file first, so a crash never leaves a truncated file behind.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+ITERATIONS = "newton_raphson_iterations"
+
+
+class InvalidCheckpointError(Exception):
+    """Exception raised when the chunk size of a checkpoint is not a positive integer."""
+
+
+def _write_atomic(path: Path, write) -> None:
+    handle, temporary = tempfile.mkstemp(dir=path.parent, suffix=path.suffix)
+    with os.fdopen(handle, "wb") as fp:
+        write(fp)
+    os.replace(temporary, path)
+
+
+class Checkpoint:
+    """
+    A directory with the completed chunks of batch runs.
+
+    Attributes:
+        directory: Checkpoint directory, with the manifest and one subdirectory of chunks per run.
+        chunk_size: Number of scenarios per chunk of runs that are not chunked otherwise.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 1024) -> None:
+        if not isinstance(chunk_size, (int, np.integer)) or chunk_size < 1:
+            raise InvalidCheckpointError("chunk_size must be a positive integer.")
+        self.directory = Path(directory)
+        self.chunk_size = chunk_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._manifest = {"runs": {}}
+        if (self.directory / MANIFEST).exists():
+            with open(self.directory / MANIFEST, "r", encoding="utf-8") as fp:
+                self._manifest = json.load(fp)
+
+    def run(self, key: str, n_chunks: int) -> "CheckpointRun":
+        """
+        The checkpoint of one run, with the chunks that were completed before.
+
+        Args:
+            key (str): Key of the run.
+            n_chunks (int): Number of chunks of the run.
+
+        Returns:
+            CheckpointRun: Checkpoint of the run.
+        """
+        entry = self._manifest["runs"].setdefault(key, {"n_chunks": n_chunks, "completed": []})
+        return CheckpointRun(self, key, entry)
+
+    def progress(self) -> Dict[str, tuple]:
+        """Number of completed chunks and of all chunks of every run."""
+        return {key: (len(entry["completed"]), entry["n_chunks"]) for key, entry in self._manifest["runs"].items()}
+
+    def clear(self) -> None:
+        """Remove all chunks and the manifest."""
+        for key in self._manifest["runs"]:
+            shutil.rmtree(self.directory / key, ignore_errors=True)
+        (self.directory / MANIFEST).unlink(missing_ok=True)
+        self._manifest = {"runs": {}}
+
+    def _save_manifest(self) -> None:
+        _write_atomic(self.directory / MANIFEST, lambda fp: fp.write(json.dumps(self._manifest, indent=1).encode()))
+
+
+class CheckpointRun:
+    """
+    The completed chunks of one run of a Checkpoint.
+
+    Attributes:
+        completed: Indices of the completed chunks.
+    """
+
+    def __init__(self, checkpoint: Checkpoint, key: str, entry: Dict) -> None:
+        self._checkpoint = checkpoint
+        self._entry = entry
+        self._directory = checkpoint.directory / key
+        self.completed: Set[int] = set(entry["completed"])
+
+    def _path(self, index: int) -> Path:
+        return self._directory / f"chunk_{index:06d}.npz"
+
+    def load(self, index: int) -> tuple:
+        """
+        Load a completed chunk.
+
+        Args:
+            index (int): Index of the chunk.
+
+        Returns:
+            tuple: The batch output of the chunk and its Newton-Raphson iterations per scenario (None if they
+                were not counted).
+        """
+        with np.load(self._path(index)) as stored:
+            output_data = {component: stored[component] for component in stored.files if component != ITERATIONS}
+            iterations = stored[ITERATIONS] if ITERATIONS in stored.files else None
+        return output_data, iterations
+
+    def save(self, index: int, output_data: Dict, iterations: Optional[np.ndarray] = None) -> None:
+        """
+        Write a completed chunk and add it to the manifest.
+
+        Args:
+            index (int): Index of the chunk.
+            output_data (Dict): Batch output of the chunk.
+            iterations (np.ndarray, optional): Newton-Raphson iterations per scenario of the chunk.
+        """
+        arrays = {str(getattr(component, "value", component)): array for component, array in output_data.items()}
+        if iterations is not None:
+            arrays[ITERATIONS] = iterations
+        self._directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self._path(index), lambda fp: np.savez(fp, **arrays))
+        # the manifest only lists chunks that are on disk
+        self.completed.add(index)
+        self._entry["completed"] = sorted(self.completed)
+        self._checkpoint._save_manifest()  # pylint: disable=protected-access
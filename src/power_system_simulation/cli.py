@@ -0,0 +1,208 @@
+"""
+Command Line Module
+
+This script defines the power-system-simulation console entry point, so studies can be scheduled on batch
+nodes without a notebook kernel. Every subcommand takes one or more grid package directories, each with the
+standard files (input_network_data.json, meta_data.json and the parquet profiles):
+
+    power-system-simulation powerflow GRID [GRID ...] [--chunk-size N]
+    power-system-simulation n1 GRID [GRID ...] [--k K] [--top-k N]
+    power-system-simulation ev GRID [GRID ...] --percentage P [P ...] --seed S [S ...] [--chunk-size N]
+    power-system-simulation tap GRID [GRID ...] [--optimize-by losses|voltage]
+    power-system-simulation validate GRID [GRID ...]
+    power-system-simulation fleet GRID [GRID ...] --output DIR [--studies powerflow ev]
+    power-system-simulation worker HOST:PORT
+
+Every grid (and for ev every percentage and seed) is one study. With --workers the studies run in that many
+processes, --threads sets the power_grid_model threads of every study and --output writes the result tables
+as parquet files to <output>/<grid>/<study>_<table>.parquet. A timing summary is printed at the end and the
+exit code is 1 when a study failed. The fleet command runs the nightly studies of many grids largest first
+and writes them to one shared parquet dataset (see the fleet module).
+
+--executor chooses where the studies run (see the executors module). With --executor socket the studies are
+handed out by a coordinator that listens on --listen HOST:PORT, next to --workers local worker processes, and
+the worker command started on other batch nodes joins it. The coordinator and the workers authenticate with
+the key in the PSS_CLUSTER_KEY environment variable.
+
+The study modules (and with them power_grid_model, pandas and networkx) are only imported when a study runs,
+so --help and argument errors return immediately.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import nullcontext
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import power_system_simulation as pss
+from power_system_simulation.studies import error_summary, run_study, study_name
+
+TIMING_COLUMNS = ["Grid", "Study", "Seconds", "Status"]
+
+
+def _run_and_write(command: str, grid_dir: Path, options: Dict, output: Optional[Path]) -> Dict:
+    """Run one study, write its tables and return its timing row. Errors are reported, not raised."""
+    study = study_name(command, options)
+    start = time.perf_counter()
+    try:
+        tables = run_study(command, grid_dir, options)
+        if output is not None:
+            (output / grid_dir.name).mkdir(parents=True, exist_ok=True)
+            for name, table in tables.items():
+                table.to_parquet(output / grid_dir.name / f"{study}_{name}.parquet")
+        status = "ok"
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        status = error_summary(error)
+    return {"Grid": str(grid_dir), "Study": study, "Seconds": time.perf_counter() - start, "Status": status}
+
+
+def _studies(args: argparse.Namespace) -> List[tuple]:
+    """(grid directory, options) of every study of the parsed command line."""
+    options = {"threads": args.threads}
+    for name in ("chunk_size", "compact", "k", "top_k", "optimize_by"):
+        if hasattr(args, name):
+            options[name] = getattr(args, name)
+    if args.command != "ev":
+        return [(grid_dir, options) for grid_dir in args.grids]
+    return [
+        (grid_dir, options | {"percentage": percentage, "seed": seed})
+        for grid_dir in args.grids
+        for percentage in args.percentage
+        for seed in args.seed
+    ]
+
+
+def _executor(args: argparse.Namespace, n_studies: int):
+    """Executor of the studies of the parsed command line. Without --executor, one worker or study runs serially."""
+    kind = args.executor or ("serial" if args.workers == 1 or n_studies == 1 else "process")
+    if kind == "socket":
+        return pss.executors.SocketExecutor(args.workers or 0, address=args.listen)
+    return pss.executors.make_executor(kind, None if args.workers is None else min(args.workers, n_studies))
+
+
+def _run_worker(args: argparse.Namespace) -> int:
+    if not os.environ.get(pss.executors.CLUSTER_KEY):
+        print(f"Set {pss.executors.CLUSTER_KEY} to the key of the coordinator.", file=sys.stderr)
+        return 1
+    pss.executors.run_worker(args.address, pss.executors.cluster_key())
+    return 0
+
+
+def _address(value: str) -> tuple:
+    try:
+        return pss.executors.parse_address(value)
+    except pss.executors.InvalidExecutorError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser of the power-system-simulation command."""
+    parser = argparse.ArgumentParser(prog="power-system-simulation", description="Run power system studies.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("grids", nargs="+", type=Path, metavar="GRID", help="grid package directories")
+    common.add_argument("--workers", type=_positive_int, default=1, help="number of studies run in parallel")
+    common.add_argument("--threads", type=int, help="power_grid_model threads per study (0: all cores)")
+    common.add_argument("--output", type=Path, help="directory for the parquet result tables")
+    executors = argparse.ArgumentParser(add_help=False)
+    executors.add_argument("--executor", choices=["serial", "thread", "process", "socket"], help="where studies run")
+    executors.add_argument(
+        "--listen", type=_address, default=("127.0.0.1", 0), help="HOST:PORT workers connect to (socket)"
+    )
+    chunked = argparse.ArgumentParser(add_help=False)
+    chunked.add_argument("--chunk-size", type=_positive_int, help="solve the timestamps in chunks of this size")
+    chunked.add_argument(
+        "--compact", action="store_true", help="float32 values and dictionary-encoded timestamps in the tables"
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("powerflow", parents=[common, executors, chunked], help="time series power flow")
+    n1 = commands.add_parser("n1", parents=[common, executors], help="N-1 (or N-k) contingency analysis")
+    n1.add_argument("--k", type=_positive_int, default=1, help="number of simultaneous line outages")
+    n1.add_argument("--top-k", type=_positive_int, default=10, help="number of worst scenarios reported")
+    ev = commands.add_parser("ev", parents=[common, executors, chunked], help="EV penetration")
+    ev.add_argument("--percentage", type=float, nargs="+", required=True, help="EV penetration percentages")
+    ev.add_argument("--seed", type=int, nargs="+", default=[0], help="random seeds of the EV placement")
+    tap = commands.add_parser("tap", parents=[common, executors], help="optimal transformer tap position")
+    tap.add_argument("--optimize-by", choices=["losses", "voltage"], default="losses")
+    commands.add_parser("validate", parents=[common, executors], help="validate the grid packages")
+    fleet = commands.add_parser("fleet", parents=[executors], help="nightly studies of many grids, largest first")
+    fleet.add_argument("grids", nargs="+", type=Path, metavar="GRID", help="grid package directories")
+    fleet.add_argument("--output", type=Path, required=True, help="directory of the shared parquet dataset")
+    fleet.add_argument("--studies", nargs="+", choices=["powerflow", "ev"], default=["powerflow"])
+    fleet.add_argument("--percentage", type=float, default=50.0, help="EV penetration percentage")
+    fleet.add_argument("--seed", type=int, default=0, help="random seed of the EV placement")
+    fleet.add_argument("--workers", type=_positive_int, help="number of worker processes (default: all CPUs)")
+    fleet.add_argument("--threads", type=int, help="power_grid_model threads per study (0: all cores)")
+    worker = commands.add_parser("worker", help="run the studies of a socket coordinator on this node")
+    worker.add_argument("address", type=_address, metavar="HOST:PORT", help="address the coordinator listens on")
+    return parser
+
+
+def _run_fleet(args: argparse.Namespace) -> int:
+    report = {}
+    # without --executor, run_fleet uses a process pool of --workers processes
+    executor = None if args.executor is None else _executor(args, len(args.grids) * len(args.studies))
+    with executor or nullcontext():
+        timings = pss.fleet.run_fleet(
+            args.grids,
+            args.output,
+            studies=args.studies,
+            percentage=args.percentage,
+            seed=args.seed,
+            workers=args.workers,
+            threads=args.threads,
+            report=report,
+            executor=executor,
+        )
+    print(timings.to_string(index=False, float_format="%.2f"))
+    utilisation = ", ".join(f"{worker}: {value:.0%}" for worker, value in report["utilisation"].items())
+    print(f"{len(timings)} studies in {report['makespan']:.2f} s, worker utilisation {utilisation}")
+    return 0 if (timings["Status"] == "ok").all() else 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the power-system-simulation command.
+
+    Args:
+        argv (Sequence[str], optional): Command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit code, 0 when every study succeeded and 1 otherwise.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "worker":
+        return _run_worker(args)
+    if args.command == "fleet":
+        return _run_fleet(args)
+    studies = _studies(args)
+
+    start = time.perf_counter()
+    with _executor(args, len(studies)) as executor:
+        rows = list(executor.map(_run_and_write, repeat(args.command), *zip(*studies), repeat(args.output)))
+    elapsed = time.perf_counter() - start
+
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    timings = pd.DataFrame(rows, columns=TIMING_COLUMNS)
+    print(timings.to_string(index=False, float_format="%.2f"))
+    print(f"{len(studies)} studies in {elapsed:.2f} s with {args.workers} worker(s)")
+    return 0 if (timings["Status"] == "ok").all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
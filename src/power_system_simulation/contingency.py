@@ -0,0 +1,281 @@
+"""
+Contingency Module
+
+This script defines the N-k contingency analysis. Every combination of k line outages is enumerated with
+the GraphProcessor. Combinations that island part of the grid without a radial restoration are pruned, and
+every outage and restoration pair that survives is solved over the whole load profile. The scenarios are
+grouped into batches that fit a memory cap and solved on one model with line status updates, and the worst
+cases are reported. The enumeration stops as soon as the scenario cap is exceeded, and only the top_k worst
+scenarios are kept while the batches are solved.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import heapq
+import json
+from contextlib import ExitStack
+from functools import partial
+from itertools import combinations, repeat
+from math import comb
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from power_grid_model import CalculationMethod, PowerGridModel, initialize_array
+
+from power_system_simulation.batch_data import columnar_update, repeat_scenarios
+from power_system_simulation.calculation_module import load_profile_update, read_input_data, read_profile_update
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+from power_system_simulation.executors import Executor
+from power_system_simulation.graph_processing import grid_graph_processor
+from power_system_simulation.shared_buffers import (
+    SharedArrays,
+    grid_arrays,
+    shared_input_data,
+    shared_profile,
+    worker_arrays,
+)
+
+WORST_CASE_COLUMNS = [
+    "Outage_IDs",
+    "Restoration_IDs",
+    "Max_Loading",
+    "Max_Loading_Line",
+    "Max_Loading_Timestamp",
+    "Min_Voltage",
+    "Min_Voltage_Node",
+    "Min_Voltage_Timestamp",
+]
+
+
+class InvalidOutageOrderError(Exception):
+    """Exception raised when k is not between 1 and the number of candidate lines."""
+
+
+class LineIDNotValidError(Exception):
+    """Exception raised when a candidate outage is not a line that is connected at both sides."""
+
+
+class TooManyScenariosError(Exception):
+    """Exception raised when the number of contingency scenarios or their memory exceeds the cap."""
+
+
+def enumerate_contingencies(grid, line_ids: List[int], k: int, max_scenarios: Optional[int] = None) -> tuple:
+    """
+    Enumerate the N-k outages of the given lines and their radial restorations.
+
+    Args:
+        grid (GraphProcessor): Graph of the grid.
+        line_ids (List[int]): Candidate outage lines.
+        k (int): Number of simultaneous outages.
+        max_scenarios (int, optional): Cap on the number of (outage, restoration) scenarios. TooManyScenariosError
+            is raised as soon as it is exceeded, before the remaining outages are enumerated.
+
+    Returns:
+        tuple: A dict from the set of lines that is open after restoration (the topology) to the list of
+            (outage, restoration) pairs that lead to it, and the number of pruned (islanding) outages.
+    """
+    topologies = {}
+    islanded = 0
+    n_scenarios = 0
+    normally_open = {edge_id for edge_id, enabled in zip(grid.edge_ids, grid.edge_enabled) if not enabled}
+
+    for outage in combinations(line_ids, k):
+        restorations = grid.find_alternative_edge_sets(list(outage))
+        if not restorations:
+            islanded += 1
+            continue
+        for restoration in restorations:
+            open_lines = frozenset((normally_open - set(restoration)) | set(outage))
+            topologies.setdefault(open_lines, []).append((outage, restoration))
+        n_scenarios += len(restorations)
+        if max_scenarios is not None and n_scenarios > max_scenarios:
+            raise TooManyScenariosError(f"More than {max_scenarios} scenarios exceed the cap.")
+
+    return topologies, islanded
+
+
+def _scenario_bytes(input_data: Dict, n_timestamps: int) -> int:
+    """Memory of the update and output arrays of one topology solved over the whole profile."""
+    # the columnar updates hold the two line statuses and the p and q of every load
+    per_timestamp = (
+        len(input_data["line"]) * 2 * np.dtype(np.int8).itemsize
+        + len(input_data["sym_load"]) * 2 * np.dtype(np.float64).itemsize
+        + len(input_data["line"]) * initialize_array("sym_output", "line", 0).dtype.itemsize
+        + len(input_data["node"]) * initialize_array("sym_output", "node", 0).dtype.itemsize
+    )
+    return per_timestamp * n_timestamps
+
+
+def _solve_topologies(
+    input_data: Dict,
+    load_update: Dict,
+    timestamps: pd.Index,
+    group: List[tuple],
+    config: ExecutionConfig,
+    model: Optional[PowerGridModel] = None,
+) -> List[Dict]:
+    """
+    Solve one batch of topologies over the whole load profile, inline or in an executor worker.
+
+    Args:
+        input_data (Dict): Input data of the grid.
+        load_update (Dict): Batch update dataset of the load profile.
+        timestamps (pd.Index): Timestamps of the load profile.
+        group (List[tuple]): (open lines, outage and restoration pairs) of every topology of the batch.
+        config (ExecutionConfig): Threading and solver settings.
+        model (PowerGridModel, optional): Model of the grid. Built here if not given.
+
+    Returns:
+        List[Dict]: Worst case row of every outage and restoration pair, in the order of the group.
+    """
+    lines = input_data["line"]
+    model = model if model is not None else PowerGridModel(input_data)
+
+    # line statuses per topology, repeated for every timestamp
+    status = np.array(
+        [[line_id not in open_lines for line_id in lines["id"]] for open_lines, _ in group], dtype=np.int8
+    )
+    status = np.repeat(status, len(timestamps), axis=0)
+    update_data = repeat_scenarios(load_update, len(group))
+    update_data["line"] = columnar_update(lines["id"], from_status=status, to_status=status)
+
+    output_data = model.calculate_power_flow(
+        update_data=update_data,
+        output_component_types=["node", "line"],
+        **config.power_flow_kwargs(CalculationMethod.linear),
+    )
+    loading = output_data["line"]["loading"].reshape(len(group), -1)
+    u_pu = output_data["node"]["u_pu"].reshape(len(group), -1)
+    max_index = loading.argmax(axis=1)
+    min_index = u_pu.argmin(axis=1)
+
+    rows = []
+    for i, (_, pairs) in enumerate(group):
+        for outage, restoration in pairs:
+            rows.append(
+                {
+                    "Outage_IDs": outage,
+                    "Restoration_IDs": restoration,
+                    "Max_Loading": loading[i, max_index[i]],
+                    "Max_Loading_Line": lines["id"][max_index[i] % len(lines)],
+                    "Max_Loading_Timestamp": timestamps[max_index[i] // len(lines)],
+                    "Min_Voltage": u_pu[i, min_index[i]],
+                    "Min_Voltage_Node": input_data["node"]["id"][min_index[i] % len(input_data["node"])],
+                    "Min_Voltage_Timestamp": timestamps[min_index[i] // len(input_data["node"])],
+                }
+            )
+    return rows
+
+
+def _shared_solve_topologies(handle: Dict[str, tuple], group: List[tuple], config: ExecutionConfig) -> List[Dict]:
+    """Solve one batch of topologies on an executor worker, on the input data and profiles in shared memory."""
+    arrays = worker_arrays(handle)
+    active_power_profile = shared_profile(arrays, "active")
+    load_update = load_profile_update(active_power_profile, shared_profile(arrays, "reactive"))
+    return _solve_topologies(shared_input_data(arrays), load_update, active_power_profile.index, group, config)
+
+
+def nk_contingency_analysis(
+    input_data_path: str,
+    metadata_path: str,
+    active_power_profile_path: str,
+    reactive_power_profile_path: str,
+    k: int = 2,
+    line_ids: Optional[List[int]] = None,
+    top_k: int = 10,
+    max_scenarios: int = 1000,
+    max_memory_bytes: int = 512 * 1024**2,
+    execution_config: Optional[ExecutionConfig] = None,
+    report: Optional[Dict] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """
+    Run an N-k contingency analysis and report the worst outage and restoration scenarios.
+
+    Args:
+        input_data_path (str): Path to the input network data.
+        metadata_path (str): Path to the metadata (for the LV busbar).
+        active_power_profile_path (str): Path to the active power profile.
+        reactive_power_profile_path (str): Path to the reactive power profile.
+        k (int): Number of simultaneous line outages.
+        line_ids (List[int], optional): Candidate outage lines. Defaults to every line connected at both sides.
+        top_k (int): Number of worst scenarios to report.
+        max_scenarios (int): Cap on the number of (outage, restoration) scenarios, TooManyScenariosError above
+            it. Every scenario is solved over the whole profile, the scenarios with the same topology at once.
+        max_memory_bytes (int): Cap on the update and output memory of one batch.
+        execution_config (ExecutionConfig, optional): Threading and solver settings. The linear method is used
+            unless another calculation method is configured, as in the N-1 analysis.
+        report (Dict, optional): If given, filled with the number of enumerated, pruned and solved scenarios.
+        executor (Executor, optional): If given, the batches are solved on its workers. max_memory_bytes then
+            caps the batch of every worker. The input data and the profile are published once in shared memory
+            and every task only gets their handle and its batch, so the workers must run on this node.
+
+    Returns:
+        pd.DataFrame: The top_k scenarios by maximum line loading, with the outage and restoration line IDs,
+            the maximum loading with its line and timestamp and the minimum voltage with its node and timestamp.
+    """
+    with open(metadata_path, "r", encoding="utf-8") as fp:
+        meta_data = json.load(fp)
+    input_data = read_input_data(input_data_path)
+
+    load_update, timestamps = read_profile_update(active_power_profile_path, reactive_power_profile_path)
+
+    lines = input_data["line"]
+    connected = lines["id"][(lines["from_status"] == 1) & (lines["to_status"] == 1)].tolist()
+    line_ids = connected if line_ids is None else list(line_ids)
+    if any(line_id not in connected for line_id in line_ids):
+        raise LineIDNotValidError("Every candidate outage must be a line that is connected at both sides.")
+    if not 1 <= k <= len(line_ids):
+        raise InvalidOutageOrderError("k must be between 1 and the number of candidate lines.")
+
+    grid = grid_graph_processor(input_data, meta_data["lv_busbar"])
+    topologies, islanded = enumerate_contingencies(grid, line_ids, k, max_scenarios)
+
+    scenario_bytes = _scenario_bytes(input_data, len(timestamps))
+    if scenario_bytes > max_memory_bytes:
+        raise TooManyScenariosError(f"One scenario needs {scenario_bytes} bytes, above the cap of {max_memory_bytes}.")
+    scenarios_per_batch = max_memory_bytes // scenario_bytes
+
+    config = resolve_execution_config(execution_config)
+    config = config.replace(calculation_method=config.calculation_method or CalculationMethod.linear)
+
+    topology_list = list(topologies.items())
+    groups = [
+        topology_list[start : start + scenarios_per_batch]
+        for start in range(0, len(topology_list), scenarios_per_batch)
+    ]
+    with ExitStack() as stack:
+        if executor is None:
+            batches = map(
+                partial(_solve_topologies, model=PowerGridModel(input_data)),
+                repeat(input_data),
+                repeat(load_update),
+                repeat(timestamps),
+                groups,
+                repeat(config),
+            )
+        else:
+            sym_load = load_update["sym_load"]
+            profiles = {
+                name: pd.DataFrame(sym_load[attribute], index=timestamps, columns=sym_load["id"][0], copy=False)
+                for name, attribute in (("active", "p_specified"), ("reactive", "q_specified"))
+            }
+            shared = stack.enter_context(SharedArrays(grid_arrays(input_data, profiles)))
+            batches = executor.map(_shared_solve_topologies, repeat(shared.handle), groups, repeat(config))
+        # only the top_k worst scenarios are kept, ranked by maximum loading with ties in enumeration order
+        worst = heapq.nlargest(top_k, (row for rows in batches for row in rows), key=lambda row: row["Max_Loading"])
+
+    if report is not None:
+        report["outage_combinations"] = comb(len(line_ids), k)
+        report["islanded_combinations"] = islanded
+        report["scenarios"] = sum(len(pairs) for pairs in topologies.values())
+        report["solved_topologies"] = len(topologies)
+        report["batches"] = len(groups)
+        report["scenarios_per_batch"] = scenarios_per_batch
+
+    worst_cases = pd.DataFrame(worst, columns=WORST_CASE_COLUMNS)
+    worst_cases.index = pd.RangeIndex(1, len(worst_cases) + 1, name="Rank")
+    return worst_cases
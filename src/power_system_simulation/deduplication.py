@@ -0,0 +1,130 @@
+"""
+Deduplication Module
+
+This script finds the identical load snapshots of a time series batch, so only the unique scenarios have to be
+solved. The results of the unique scenarios are scattered back to the full timeline before aggregation.
+Snapshots can optionally be quantized first, so snapshots that differ by less than the quantum are treated as
+identical.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from power_system_simulation.batch_data import (
+    ComponentData,
+    attribute_names,
+    batch_size,
+    component_shape,
+    is_broadcast,
+    is_sparse,
+    select_scenarios,
+)
+
+
+class InvalidQuantumError(Exception):
+    """Exception raised when the quantization step is not a positive number."""
+
+
+def _scenario_keys(component_data: ComponentData, quantum: Optional[float]) -> np.ndarray:
+    """Bytes of every scenario (row) of a dense batch component, after quantizing its float attributes."""
+    n_scenarios = component_shape(component_data)[0]
+    parts = []
+    # attribute by attribute, so padding bytes of the structured array are never compared; broadcast
+    # attributes are the same in every scenario and are skipped
+    for name in attribute_names(component_data):
+        values = component_data[name]
+        if is_broadcast(values):
+            continue
+        if quantum is not None and np.issubdtype(values.dtype, np.floating):
+            values = np.round(values / quantum)
+        parts.append(np.ascontiguousarray(values).reshape(n_scenarios, -1).view(np.uint8))
+    keys = np.ascontiguousarray(np.concatenate(parts, axis=1))
+    return keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+
+
+def _sparse_scenario_keys(component_data: Dict, quantum: Optional[float]) -> np.ndarray:
+    """Label of every scenario of a sparse component, equal for scenarios with the same changes."""
+    record_keys = _scenario_keys(component_data["data"], quantum)
+    labels = {}
+    indptr = component_data["indptr"]
+    return np.array(
+        [
+            labels.setdefault(tuple(record_keys[start:stop].tolist()), len(labels))
+            for start, stop in zip(indptr[:-1], indptr[1:])
+        ],
+        dtype=np.int64,
+    )
+
+
+def unique_scenarios(update_data: Dict, quantum: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the unique scenarios of a dense batch update dataset.
+
+    Args:
+        update_data (Dict): Dense batch update dataset.
+        quantum (float, optional): If given, float attributes are rounded to a multiple of quantum before
+            comparing, so near-identical snapshots share one solution.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of the first occurrence of every unique scenario, in timeline
+            order, and for every scenario the position of its unique scenario in the first array.
+    """
+    if quantum is not None and quantum <= 0:
+        raise InvalidQuantumError("The quantization step must be positive.")
+
+    n_scenarios = batch_size(update_data)
+    inverse = np.zeros(n_scenarios, dtype=np.int64)
+    n_unique = 1
+    for component_data in update_data.values():
+        # combine the labels of every component into one label per scenario
+        keys = (
+            _sparse_scenario_keys(component_data, quantum)
+            if is_sparse(component_data)
+            else _scenario_keys(component_data, quantum)
+        )
+        _, component_inverse = np.unique(keys, return_inverse=True)
+        _, inverse = np.unique(inverse * (component_inverse.max() + 1) + component_inverse, return_inverse=True)
+        n_unique = inverse.max() + 1
+
+    first_index = np.full(n_unique, n_scenarios, dtype=np.int64)
+    np.minimum.at(first_index, inverse, np.arange(n_scenarios))
+
+    # renumber the unique scenarios in order of first occurrence
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(n_unique)
+    return first_index[order], rank[inverse]
+
+
+def deduplicated_power_flow(
+    update_data: Dict,
+    solve: Callable[[Dict], Dict],
+    quantum: Optional[float] = None,
+    report: Optional[Dict] = None,
+) -> Dict:
+    """
+    Solve only the unique scenarios of a batch and scatter the results back to every scenario.
+
+    Args:
+        update_data (Dict): Dense batch update dataset.
+        solve (Callable): Called with the update dataset of the unique scenarios, returns their batch output.
+        quantum (float, optional): Quantization step for comparing snapshots, see unique_scenarios.
+        report (Dict, optional): If given, filled with the number of unique scenarios and the compression ratio.
+
+    Returns:
+        Dict: Batch output dataset of all scenarios.
+    """
+    unique_index, inverse = unique_scenarios(update_data, quantum)
+    unique_output = solve(select_scenarios(update_data, unique_index))
+
+    if report is not None:
+        report["scenarios"] = len(inverse)
+        report["unique_scenarios"] = len(unique_index)
+        report["compression_ratio"] = len(inverse) / len(unique_index)
+
+    return select_scenarios(unique_output, inverse)
@@ -11,14 +11,92 @@ Date: 10/06/2024
 import json
 import math
 import random
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional
 
-import numpy as np
 import pandas as pd
-from power_grid_model import CalculationMethod, CalculationType, PowerGridModel, initialize_array
+from power_grid_model import CalculationType, PowerGridModel
 from power_grid_model.utils import json_deserialize
-from power_grid_model.validation import assert_valid_batch_data
 
-from power_system_simulation.graph_processing import GraphProcessor as gp
+from power_system_simulation.batch_data import columnar_update
+from power_system_simulation.calculation_module import (
+    aggregate_power_flow_results,
+    fill_from_profile,
+    profile_ids,
+    read_profile_update,
+    run_batch_power_flow,
+    run_grid_power_flow,
+)
+from power_system_simulation.execution import ExecutionConfig
+from power_system_simulation.executors import Executor, ProcessExecutor
+from power_system_simulation.graph_processing import GraphProcessor as gp, grid_graph_processor
+from power_system_simulation.radial_sweep import RadialSweepSolver
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.shared_buffers import (
+    SharedArrays,
+    attach_worker,
+    grid_arrays,
+    shared_input_data,
+    shared_profile,
+    worker_arrays,
+)
+from power_system_simulation.time_series import chain_hooks
+from power_system_simulation.top_k import TopK, top_k_hook
+from power_system_simulation.violations import ViolationTracker, violation_hook
+
+
+def feeder_loads(input_data: Dict, lv_feeders: List[int], grid: gp) -> Dict[int, List[int]]:
+    """
+    Find the sym_load IDs downstream of every LV feeder.
+
+    Args:
+        input_data (Dict): Input network data.
+        lv_feeders (List[int]): IDs of the feeder lines (from the metadata).
+        grid (GraphProcessor): Graph of the grid with the transformer as an edge.
+
+    Returns:
+        Dict[int, List[int]]: The load IDs per feeder, in input order.
+    """
+    feeder_to_loads = {}
+    for feeder in lv_feeders:
+        downstream_vertices = grid.find_downstream_vertices(feeder)
+        feeder_to_loads[feeder] = [load["id"] for load in input_data["sym_load"] if load["node"] in downstream_vertices]
+    return feeder_to_loads
+
+
+def ev_placement(
+    feeder_to_loads: Dict[int, List[int]],
+    no_house: int,
+    ev_profile_ids: List,
+    percentage: float,
+    seed: int,
+) -> tuple:
+    """
+    Randomly select the houses that get an EV, the same number per feeder, and the EV profile of each house.
+
+    Args:
+        feeder_to_loads (Dict[int, List[int]]): Load IDs per feeder, see feeder_loads.
+        no_house (int): Number of sym_loads of the grid.
+        ev_profile_ids (List): Column names of the EV active power profile.
+        percentage (float): Percentage of EV penetration.
+        seed (int): Random seed for reproducibility.
+
+    Returns:
+        tuple: The selected load IDs and, for each of them, the selected EV profile column.
+    """
+    rng = random.Random(seed)
+
+    # Calculate EV_feeder using math.floor to round down
+    ev_feeder = math.floor((percentage / 100) * no_house / len(feeder_to_loads))
+
+    selected_ids = []
+    for matched_loads in feeder_to_loads.values():
+        # Randomly select EV_feeder number of IDs from the matched loads
+        if len(matched_loads) > 0:
+            selected_ids.extend(rng.sample(matched_loads, min(ev_feeder, len(matched_loads))))
+
+    # Randomly select an equal number of columns from ev_power_profile
+    return selected_ids, rng.sample(ev_profile_ids, len(selected_ids))
 
 
 def ev_penetration(
@@ -28,6 +106,14 @@ def ev_penetration(
     ev_active_power_profile: str,
     percentage: float,
     seed: int,
+    execution_config: ExecutionConfig = None,
+    options: RunOptions = None,
+    report: dict = None,
+    radial_sweep: bool = False,
+    violations: ViolationTracker = None,
+    top_k: TopK = None,
+    compact: bool = False,
+    arrow: bool = False,
 ) -> tuple:
     """
     Simulates the penetration of electric vehicles (EVs) in a power grid network and calculates
@@ -40,6 +126,19 @@ def ev_penetration(
         ev_active_power_profile (str): Path to the EV active power profile file.
         percentage (float): Percentage of EV penetration.
         seed (int): Random seed for reproducibility.
+        execution_config (ExecutionConfig, optional): Threading and solver settings. Defaults to the
+            package-level configuration.
+        options (RunOptions, optional): Screening, chunking, deduplication, cache and checkpoint of the run,
+            see run_batch_power_flow. A cache or checkpoint is keyed on the placement.
+        report (dict, optional): If given, filled with statistics of the run (e.g. of the screening pass).
+        radial_sweep (bool): Solve the placement with the backward/forward sweep on the tree index of the grid
+            instead of power_grid_model.
+        violations (ViolationTracker, optional): If given, fed with the output (chunk by chunk in sequential
+            runs) to index the limit-violation events. Its timestamps default to those of the profiles.
+        top_k (TopK, optional): If given, fed with the line loadings of every timestamp, labelled with the seed.
+        compact (bool): Return float32 voltages and loadings and the loading timestamps as references into the
+            timestamps, see aggregate_power_flow_results.
+        arrow (bool): Return pyarrow Tables instead of DataFrames, see aggregate_power_flow_results.
 
     Returns:
         tuple: A tuple containing two DataFrames:
@@ -55,148 +154,177 @@ def ev_penetration(
     with open(input_network_data, "r", encoding="utf-8") as fp_open:
         input_data = json_deserialize(fp_open.read())
 
-    active_power_profile = pd.read_parquet(active_power_profile_path)
-    ev_power_profile = pd.read_parquet(ev_active_power_profile)
-
-    model = PowerGridModel(input_data=input_data)
-
-    vertex_ids = input_data["node"]["id"]
-    edge_ids_init = pd.DataFrame(input_data["line"]["id"]).to_numpy()
-    edge_vertex_id_pairs_init = list(zip(input_data["line"]["from_node"], input_data["line"]["to_node"]))
-    edge_enabled_init = (input_data["line"]["from_status"] == 1) & (input_data["line"]["to_status"] == 1)
-    source_id = input_data["node"][0][0]  # or meta_data
-
-    ########### MODIFIED DATA FOR TRANSFORMER AS EDGE
-    edge_ids = np.append(edge_ids_init, input_data["transformer"]["id"]).tolist()
-    edge_vertex_id_pairs = (edge_vertex_id_pairs_init) + [(source_id, input_metadata["lv_busbar"])]
-    edge_enabled = np.append(edge_enabled_init, [True])
-
-    ############################
-    # call GraphProcessing.py  #
-    ############################
-    grid = gp(
-        vertex_ids=vertex_ids,
-        edge_ids=edge_ids,
-        edge_vertex_id_pairs=edge_vertex_id_pairs,
-        edge_enabled=edge_enabled,
-        source_vertex_id=source_id,
-    )
+    grid = grid_graph_processor(input_data, input_metadata["lv_busbar"])
     model = PowerGridModel(input_data)
-    # Set the random seed for reproducibility
-    random.seed(seed)
 
-    # Get the number of feeders
-    no_feeders = len(input_metadata.get("lv_feeders", []))
-
-    # Get the number of sym_load entries
-    no_house = len(input_data["sym_load"])
+    # Select the houses that get an EV and the EV profiles they get
+    selected_ids, selected_columns = ev_placement(
+        feeder_loads(input_data, input_metadata["lv_feeders"], grid),
+        len(input_data["sym_load"]),
+        profile_ids(ev_active_power_profile),
+        percentage,
+        seed,
+    )
 
-    # Calculate EV_feeder using math.floor to round down
-    ev_feeder = math.floor((percentage / 100) * no_house / no_feeders)
+    # Read the house profiles of the selected loads and add the EV profiles on top, row by row in timestamp order
+    update_data, timestamps = read_profile_update(active_power_profile_path, load_ids=selected_ids)
+    fill_from_profile(update_data["sym_load"]["p_specified"], ev_active_power_profile, selected_columns, add=True)
 
-    # Dictionary to store which sym_load belongs to which feeder
-    feeder_to_loads = {feeder: [] for feeder in input_metadata["lv_feeders"]}
-    selected_ids = []
-    # Iterate through each feeder and call the function gp.find_downstream_vertices
-    for feeder in input_metadata["lv_feeders"]:
-        downstream_vertices = grid.find_downstream_vertices(feeder)
+    from power_grid_model.validation import assert_valid_batch_data  # pylint: disable=import-outside-toplevel
 
-        # Check if sym_load node ids are found within the returned list
-        matched_loads = [load["id"] for load in input_data["sym_load"] if load["node"] in downstream_vertices]
+    assert_valid_batch_data(input_data=input_data, update_data=update_data, calculation_type=CalculationType.power_flow)
 
-        # Randomly select EV_feeder number of IDs from the matched loads
-        if len(matched_loads) > 0:
-            selected_ids_for_feeder = random.sample(matched_loads, min(ev_feeder, len(matched_loads)))
-            feeder_to_loads[feeder].extend(selected_ids_for_feeder)
-            selected_ids.extend(selected_ids_for_feeder)
+    model_2 = model.copy()
+    model_2.update(update_data=update_data)
 
-    filtered_profile = active_power_profile[selected_ids]
+    on_chunk = chain_hooks(violation_hook(violations, timestamps), top_k_hook(top_k, timestamps, seed))
+    solver = RadialSweepSolver(input_data, grid) if radial_sweep else model_2
+    output_data = run_grid_power_flow(solver, input_data, update_data, execution_config, options, report, on_chunk)
 
-    # Randomly select an equal number of columns from ev_power_profile
-    num_selected = len(selected_ids)
-    selected_columns = random.sample(ev_power_profile.columns.tolist(), num_selected)
-    selected_ev_profile = ev_power_profile[selected_columns]
+    # Return aggregated results
+    return aggregate_power_flow_results(output_data, timestamps, compact, arrow)
 
-    # Ensure the indexes and columns are aligned properly
-    selected_ev_profile.index = filtered_profile.index
-    selected_ev_profile.columns = filtered_profile.columns
 
-    # Perform element-wise addition of the filtered profiles
-    summed_profile = filtered_profile.add(selected_ev_profile, fill_value=0)
+def _shared_ev_penetration(
+    lv_busbar: int,
+    lv_feeders: List[int],
+    percentage: float,
+    seed: int,
+    execution_config: Optional[ExecutionConfig],
+    top_k: Optional[TopK] = None,
+) -> tuple:
+    """
+    EV penetration of one seed in a worker, on the input data and profiles in shared memory. An empty top_k
+    tracker is fed with the line loadings and returned with the tables, it holds at most k cases.
+    """
+    arrays = worker_arrays()
+    input_data = shared_input_data(arrays)
+    active_power_profile = shared_profile(arrays, "active")
+    ev_power_profile = shared_profile(arrays, "ev")
+
+    grid = grid_graph_processor(input_data, lv_busbar)
+    selected_ids, selected_columns = ev_placement(
+        feeder_loads(input_data, lv_feeders, grid),
+        len(input_data["sym_load"]),
+        ev_power_profile.columns.tolist(),
+        percentage,
+        seed,
+    )
+    # only the selected columns are copied out of the shared profiles
+    p_specified = active_power_profile[selected_ids].to_numpy() + ev_power_profile[selected_columns].to_numpy()
+    update_data = {"sym_load": columnar_update(selected_ids, p_specified=p_specified)}
+
+    output_data = run_batch_power_flow(
+        PowerGridModel(input_data),
+        update_data,
+        execution_config=execution_config,
+        on_chunk=top_k_hook(top_k, active_power_profile.index, seed),
+    )
+    return aggregate_power_flow_results(output_data, active_power_profile.index), top_k
 
-    update_sym_load = initialize_array("update", "sym_load", summed_profile.shape)
-    update_sym_load["id"] = summed_profile.columns.to_numpy()
-    update_sym_load["p_specified"] = summed_profile.to_numpy()
 
-    update_data = {"sym_load": update_sym_load}
+def _ev_penetration_task(
+    input_network_data: str,
+    meta_data_str: str,
+    active_power_profile_path: str,
+    ev_active_power_profile: str,
+    percentage: float,
+    seed: int,
+    execution_config: Optional[ExecutionConfig],
+    top_k: Optional[TopK] = None,
+) -> tuple:
+    """EV penetration of one seed on a worker of an executor, from the files. See _shared_ev_penetration."""
+    tables = ev_penetration(
+        input_network_data,
+        meta_data_str,
+        active_power_profile_path,
+        ev_active_power_profile,
+        percentage,
+        seed,
+        execution_config=execution_config,
+        top_k=top_k,
+    )
+    return tables, top_k
 
-    assert_valid_batch_data(input_data=input_data, update_data=update_data, calculation_type=CalculationType.power_flow)
 
-    model_2 = model.copy()
-    model_2.update(update_data=update_data)
+def ev_monte_carlo(
+    input_network_data: str,
+    meta_data_str: str,
+    active_power_profile_path: str,
+    ev_active_power_profile: str,
+    percentage: float,
+    seeds: Iterable[int],
+    workers: Optional[int] = None,
+    execution_config: Optional[ExecutionConfig] = None,
+    top_k: Optional[TopK] = None,
+    executor: Optional[Executor] = None,
+) -> Dict[int, tuple]:
+    """
+    Run ev_penetration for many seeds on a process pool.
 
-    output_data = model_2.calculate_power_flow(
-        update_data=update_data, calculation_method=CalculationMethod.newton_raphson
-    )
+    The input data and the house and EV profiles are read once and published in shared memory, every worker
+    attaches to them instead of receiving a pickled copy.
 
-    # Extract necessary data from output_data
-    node_voltages = output_data["node"]["u_pu"]
-    node_ids = output_data["node"]["id"]
-    line_loadings = output_data["line"]["loading"]
-    line_ids = output_data["line"]["id"]
-    p_from = output_data["line"]["p_from"]
-    p_to = output_data["line"]["p_to"]
-    timestamps = active_power_profile.index
-
-    # Aggregating voltage results
-    voltage_results = []
-    for i, timestamp in enumerate(timestamps):
-        max_voltage = node_voltages[i].max()
-        min_voltage = node_voltages[i].min()
-        max_voltage_node = node_ids[i, np.argmax(node_voltages[i])]
-        min_voltage_node = node_ids[i, np.argmin(node_voltages[i])]
-
-        voltage_results.append(
-            {
-                "Timestamp": timestamp,
-                "Max_Voltage": max_voltage,
-                "Max_Voltage_Node": max_voltage_node,
-                "Min_Voltage": min_voltage,
-                "Min_Voltage_Node": min_voltage_node,
-            }
-        )
+    Args:
+        input_network_data (str): Path to the input network data file.
+        meta_data_str (str): Path to the metadata file.
+        active_power_profile_path (str): Path to the active power profile file.
+        ev_active_power_profile (str): Path to the EV active power profile file.
+        percentage (float): Percentage of EV penetration.
+        seeds (Iterable[int]): Random seeds, one placement per seed.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        execution_config (ExecutionConfig, optional): Threading and solver settings of every power flow.
+        top_k (TopK, optional): If given, the worst line loadings of every seed, labelled with the seed, are
+            merged into it. Every worker only sends back its k worst cases.
+        executor (Executor, optional): If given, the seeds run on it instead of a process pool with shared
+            memory, e.g. on a SocketExecutor with workers on other nodes. Every worker reads the files, so
+            they must be at the same paths on every node.
 
-    # Aggregating line loading results
-    line_results = []
-    count = 0
-    for line_id in np.unique(line_ids):
-        loadings = line_loadings[line_ids == line_id]
-        max_loading = loadings.max()
-        min_loading = loadings.min()
-        max_loading_time = timestamps[loadings.argmax()]
-        min_loading_time = timestamps[loadings.argmin()]
-        energy_losses = abs(p_from[:, count] + p_to[:, count])
-        energy_loss_kwh = np.trapz(energy_losses) / 1000
-        count = count + 1
-
-        line_results.append(
-            {
-                "Line_ID": line_id,
-                "Total_Loss": energy_loss_kwh,
-                "Max_Loading": max_loading,
-                "Max_Loading_Timestamp": max_loading_time,
-                "Min_Loading": min_loading,
-                "Min_Loading_Timestamp": min_loading_time,
-            }
+    Returns:
+        Dict[int, tuple]: Per seed, the voltage_df and line_df of ev_penetration with that seed.
+    """
+    seeds = list(seeds)
+    # every seed feeds an empty tracker of its own, merged here
+    trackers = [TopK(top_k.k, top_k.largest, top_k.value_name) if top_k is not None else None for _ in seeds]
+
+    def collect(outcomes: Iterable[tuple]) -> Dict[int, tuple]:
+        results = {}
+        for seed, (tables, worker_top_k) in zip(seeds, outcomes):
+            results[seed] = tables
+            if top_k is not None:
+                top_k.merge(worker_top_k)
+        return results
+
+    if executor is not None:
+        paths = (input_network_data, meta_data_str, active_power_profile_path, ev_active_power_profile)
+        return collect(
+            executor.map(
+                _ev_penetration_task,
+                *(repeat(value) for value in paths + (percentage,)),
+                seeds,
+                repeat(execution_config),
+                trackers,
+            )
         )
 
-    # Create DataFrame for voltage results
-    voltage_df = pd.DataFrame(voltage_results)
-    voltage_df.set_index("Timestamp", inplace=True)
-
-    # Create DataFrame for line results
-    line_df = pd.DataFrame(line_results)
-    line_df.set_index("Line_ID", inplace=True)
-
-    # Return aggregated results
-    return voltage_df, line_df
+    with open(meta_data_str, "r", encoding="utf-8") as fp_open:
+        input_metadata = json.load(fp_open)
+    with open(input_network_data, "r", encoding="utf-8") as fp_open:
+        input_data = json_deserialize(fp_open.read())
+    profiles = {"active": pd.read_parquet(active_power_profile_path), "ev": pd.read_parquet(ev_active_power_profile)}
+
+    with SharedArrays(grid_arrays(input_data, profiles)) as shared:
+        # the shared copy is all the workers need
+        del profiles
+        with ProcessExecutor(workers, initializer=attach_worker, initargs=(shared.handle,)) as pool:
+            return collect(
+                pool.map(
+                    _shared_ev_penetration,
+                    repeat(input_metadata["lv_busbar"]),
+                    repeat(input_metadata["lv_feeders"]),
+                    repeat(percentage),
+                    seeds,
+                    repeat(execution_config),
+                    trackers,
+                )
+            )
@@ -0,0 +1,250 @@
+"""
+EV Sensitivity Module
+
+This script screens many random EV placements without a power flow per placement. The node voltage and
+branch flow sensitivities to the active power of every house are computed once per grid from the path
+impedances of the radial tree, so the effect of a placement on the whole time series is one small matrix
+product on top of a single base power flow. Only the worst placements are solved again with a full power flow.
+
+As in ev_penetration, a placement only changes the houses it selects (with the same random selection): they
+get their active power profile plus an EV profile, every other load keeps the power of the input data. The
+base power flow is therefore the input data, and the change of a placement is the profile of the selected
+houses minus their input power. The branch flow sensitivities are kept as sparse as the tree.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import heapq
+import json
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from power_grid_model import CalculationMethod, PowerGridModel
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.batch_data import columnar_update
+from power_system_simulation.calculation_module import run_batch_power_flow
+from power_system_simulation.ev_penetration import ev_placement, feeder_loads
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+from power_system_simulation.graph_processing import GraphProcessor, grid_graph_processor
+from power_system_simulation.radial_sweep import RadialSweepSolver
+
+RANKING_COLUMNS = ("Max_Loading", "Min_Voltage")
+
+
+class InvalidRankingError(Exception):
+    """Exception raised when placements are ranked by something else than Max_Loading or Min_Voltage."""
+
+
+class EVSensitivity:
+    """
+    Linearized effect of extra active power at the loads of a radial grid on its voltages and branch flows.
+
+    Attributes:
+        voltage: Change of the node u_pu (columns in input order) per W at every load (rows in input order).
+        flow: Per branch component, a sparse matrix with the change of p_from (columns in input order) per W at
+            every load. p_to changes by the opposite amount, the change of the losses is neglected.
+    """
+
+    def __init__(self, input_data: Dict, grid: Optional[GraphProcessor] = None) -> None:
+        solver = RadialSweepSolver(input_data, grid)
+        self.input_data = input_data
+        position = {node_id: i for i, node_id in enumerate(solver.node_ids.tolist())}
+        node_order = np.array([position[node_id] for node_id in input_data["node"]["id"].tolist()], dtype=np.int64)
+
+        # a load current of P / U_j at node j drops the (referred) voltage of node i by Z_shared[i, j] P / U_j,
+        # per unit of the base voltage of both nodes (the base voltage u_pu of node j is divided out in estimate)
+        base_voltage = solver.referral * solver.u_rated
+        z_shared = solver.shared_path_impedance()[:, solver.load_nodes]
+        z_shared_pu = z_shared.real / np.outer(base_voltage, base_voltage[solver.load_nodes])
+        self.voltage = -z_shared_pu[node_order].T
+
+        from scipy import sparse  # pylint: disable=import-outside-toplevel
+
+        # the flow of a tree branch carries the power of every load below its child node: the loads below every
+        # node (a sparse row per load of the ancestor matrix) times the branch above it, with its direction
+        below = solver.ancestors[solver.load_nodes].real
+        child_of_branch = {edge_id: child for child, edge_id in enumerate(solver.parent_edge.tolist()) if child > 0}
+        self.flow = {}
+        for component in ("line", "transformer"):
+            if component not in input_data:
+                continue
+            branches = input_data[component]
+            children, columns, directions = [], [], []
+            for column, branch in enumerate(branches):
+                child = child_of_branch.get(int(branch["id"]))
+                if child is not None:
+                    children.append(child)
+                    columns.append(column)
+                    directions.append(1.0 if branch["from_node"] == solver.node_ids[solver.parent[child]] else -1.0)
+            branch_above = sparse.csr_matrix(
+                (directions, (children, columns)), shape=(below.shape[1], len(branches)), dtype=np.float64
+            )
+            self.flow[component] = (below @ branch_above).tocsr()
+
+        u_rated = input_data["node"]["u_rated"]
+        node_column = {node_id: column for column, node_id in enumerate(input_data["node"]["id"].tolist())}
+        self._u_rated = u_rated
+        self._load_node_column = np.array(
+            [node_column[node] for node in input_data["sym_load"]["node"].tolist()], dtype=np.int64
+        )
+        self._ends = {
+            component: (
+                np.array([node_column[node] for node in input_data[component]["from_node"]], dtype=np.int64),
+                np.array([node_column[node] for node in input_data[component]["to_node"]], dtype=np.int64),
+            )
+            for component in self.flow
+        }
+
+    def estimate(self, base_output: Dict, load_rows: np.ndarray, delta_p: np.ndarray) -> Dict:
+        """
+        Estimate the voltages and branch loadings after adding active power to some loads.
+
+        Args:
+            base_output (Dict): Batch power flow output of the base case, one scenario per timestamp.
+            load_rows (np.ndarray): Rows (input order) of the loads that get extra power.
+            delta_p (np.ndarray): Extra active power in W, one row per timestamp and one column per load row.
+
+        Returns:
+            Dict: Estimated node u_pu and the estimated loading of every branch component, one row per timestamp.
+        """
+        # the extra load current scales with the inverse of the base voltage at the load
+        base_u_pu = base_output["node"]["u_pu"]
+        u_pu = base_u_pu + (delta_p / base_u_pu[:, self._load_node_column[load_rows]]) @ self.voltage[load_rows]
+        estimate = {"node": u_pu}
+        for component, flow in self.flow.items():
+            base = base_output[component]
+            delta_flow = (flow[load_rows].T @ delta_p.T).T
+            s_from = np.hypot(base["p_from"] + delta_flow, base["q_from"])
+            s_to = np.hypot(base["p_to"] - delta_flow, base["q_to"])
+            if component == "line":
+                from_node, to_node = self._ends[component]
+                i_from = s_from / (np.sqrt(3) * u_pu[:, from_node] * self._u_rated[from_node])
+                i_to = s_to / (np.sqrt(3) * u_pu[:, to_node] * self._u_rated[to_node])
+                estimate[component] = np.maximum(i_from, i_to) / self.input_data[component]["i_n"]
+            else:
+                estimate[component] = np.maximum(s_from, s_to) / self.input_data[component]["sn"]
+        return estimate
+
+
+def screen_ev_placements(
+    input_network_data: str,
+    meta_data_str: str,
+    active_power_profile_path: str,
+    ev_active_power_profile: str,
+    percentage: float,
+    seeds: Iterable[int],
+    top_k: int = 5,
+    rank_by: str = "Max_Loading",
+    execution_config: Optional[ExecutionConfig] = None,
+    report: Optional[Dict] = None,
+) -> pd.DataFrame:
+    """
+    Estimate the worst branch loading and lowest voltage of many EV placements and solve the worst ones exactly.
+
+    Args:
+        input_network_data (str): Path to the input network data file.
+        meta_data_str (str): Path to the metadata file.
+        active_power_profile_path (str): Path to the active power profile of the houses.
+        ev_active_power_profile (str): Path to the EV active power profile.
+        percentage (float): Percentage of EV penetration.
+        seeds (Iterable[int]): One random placement is screened per seed, as ev_penetration selects it.
+        top_k (int): Number of worst placements that are solved with a full power flow.
+        rank_by (str): Max_Loading (highest line or transformer loading first) or Min_Voltage (lowest node
+            voltage first).
+        execution_config (ExecutionConfig, optional): Threading and solver settings of the power flows.
+        report (Dict, optional): If given, filled with the number of placements, the screening speed and the
+            largest estimation error of the placements that were solved again.
+
+    Returns:
+        pd.DataFrame: The top_k worst placements indexed by Rank, with their seed, the estimated and the exact
+            maximum line or transformer loading and minimum node voltage. The exact values are those of the
+            ev_penetration output of the seed.
+    """
+    if rank_by not in RANKING_COLUMNS:
+        raise InvalidRankingError("rank_by must be Max_Loading or Min_Voltage.")
+
+    with open(meta_data_str, "r", encoding="utf-8") as fp_open:
+        input_metadata = json.load(fp_open)
+    with open(input_network_data, "r", encoding="utf-8") as fp_open:
+        input_data = json_deserialize(fp_open.read())
+
+    active_power_profile = pd.read_parquet(active_power_profile_path)
+    ev_power_profile = pd.read_parquet(ev_active_power_profile)
+
+    grid = grid_graph_processor(input_data, input_metadata["lv_busbar"])
+    feeder_to_loads = feeder_loads(input_data, input_metadata["lv_feeders"], grid)
+    ev_profile_ids = ev_power_profile.columns.tolist()
+    n_loads = len(input_data["sym_load"])
+
+    # rows of the loads in the input data
+    load_row = {load_id: row for row, load_id in enumerate(input_data["sym_load"]["id"].tolist())}
+    input_p = input_data["sym_load"]["p_specified"]
+
+    def placement(seed: int) -> tuple:
+        """Input rows of the houses of a placement and their active power with the EVs, as in ev_penetration."""
+        selected_ids, selected_columns = ev_placement(feeder_to_loads, n_loads, ev_profile_ids, percentage, seed)
+        rows = np.array([load_row[load_id] for load_id in selected_ids], dtype=np.int64)
+        p_specified = active_power_profile[selected_ids].to_numpy() + ev_power_profile[selected_columns].to_numpy()
+        return rows, p_specified
+
+    # the base case is the input data, the same at every timestamp: one scenario that broadcasts over them
+    model = PowerGridModel(input_data)
+    config = resolve_execution_config(execution_config)
+    base_output = {
+        component: values[np.newaxis]
+        for component, values in model.calculate_power_flow(
+            **config.power_flow_kwargs(CalculationMethod.newton_raphson)
+        ).items()
+    }
+    sensitivity = EVSensitivity(input_data, grid)
+
+    def scores(seed: int) -> Dict:
+        rows, p_specified = placement(seed)
+        estimate = sensitivity.estimate(base_output, rows, p_specified - input_p[rows])
+        return {
+            "Seed": seed,
+            "Estimated_Max_Loading": max(estimate[component].max() for component in sensitivity.flow),
+            "Estimated_Min_Voltage": estimate["node"].min(),
+        }
+
+    screen_start = time.perf_counter()
+    # only the scores of the top_k worst placements are kept, the placements are drawn again for the reruns
+    seeds = list(seeds)
+    select = heapq.nlargest if rank_by == "Max_Loading" else heapq.nsmallest
+    worst = pd.DataFrame(
+        select(top_k, map(scores, seeds), key=lambda row: row[f"Estimated_{rank_by}"]),
+        columns=["Seed", "Estimated_Max_Loading", "Estimated_Min_Voltage"],
+    )
+    screen_seconds = time.perf_counter() - screen_start
+
+    # solve the worst placements exactly, all in one batch: every load keeps its input power but the houses of
+    # the placement, as in ev_penetration
+    n_timestamps = len(active_power_profile.index)
+    p_specified = np.tile(input_p, (len(worst) * n_timestamps, 1))
+    for i, seed in enumerate(worst["Seed"]):
+        rows, placement_p = placement(seed)
+        p_specified[i * n_timestamps : (i + 1) * n_timestamps, rows] = placement_p
+    exact_update = {"sym_load": columnar_update(input_data["sym_load"]["id"], p_specified=p_specified)}
+    exact_output = run_batch_power_flow(model, exact_update, execution_config=execution_config)
+    worst = worst.assign(
+        Max_Loading=np.maximum.reduce(
+            [exact_output[component]["loading"].reshape(len(worst), -1).max(axis=1) for component in sensitivity.flow]
+        ),
+        Min_Voltage=exact_output["node"]["u_pu"].reshape(len(worst), -1).min(axis=1),
+    )
+
+    if report is not None:
+        report["placements"] = len(seeds)
+        report["screening_seconds"] = screen_seconds
+        report["placements_per_second"] = len(seeds) / screen_seconds if screen_seconds > 0 else float("inf")
+        report["reruns"] = len(worst)
+        report["max_loading_error"] = float((worst["Max_Loading"] - worst["Estimated_Max_Loading"]).abs().max())
+        report["max_voltage_error"] = float((worst["Min_Voltage"] - worst["Estimated_Min_Voltage"]).abs().max())
+
+    worst.index = pd.RangeIndex(1, len(worst) + 1, name="Rank")
+    return worst
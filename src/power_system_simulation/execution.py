@@ -0,0 +1,137 @@
+"""
+Execution Configuration Module
+
+This script defines the package-level execution configuration used by every entry point that runs a
+power_grid_model batch calculation (calculation_module, nm_calculation, ev_penetration and
+optimal_tap_position). It controls the number of threads, the calculation method, the error tolerance
+and the maximum number of iterations passed to PowerGridModel.calculate_power_flow.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+from power_grid_model import CalculationMethod
+
+
+class InvalidExecutionConfigError(Exception):
+    """Exception raised when an execution configuration value is not valid."""
+
+
+class ExecutionConfig:
+    """
+    Settings for running power_grid_model batch calculations.
+
+    Attributes:
+        threading: Number of threads used by power_grid_model for batch calculations.
+            -1 runs sequentially (power_grid_model default), 0 uses all hardware threads
+            and a positive number uses that many threads.
+        calculation_method: Calculation method for every entry point. None keeps the default
+            of each entry point (newton_raphson for time series, linear for N-1 scenarios).
+        error_tolerance: Convergence tolerance of iterative calculation methods.
+        max_iterations: Maximum number of iterations of iterative calculation methods.
+    """
+
+    def __init__(
+        self,
+        threading: int = -1,
+        calculation_method: Optional[Union[CalculationMethod, str]] = None,
+        error_tolerance: float = 1e-8,
+        max_iterations: int = 20,
+    ) -> None:
+        if not isinstance(threading, int) or threading < -1:
+            raise InvalidExecutionConfigError("threading must be -1 (sequential), 0 (all cores) or a positive number.")
+        if error_tolerance <= 0:
+            raise InvalidExecutionConfigError("error_tolerance must be positive.")
+        if not isinstance(max_iterations, int) or max_iterations < 1:
+            raise InvalidExecutionConfigError("max_iterations must be a positive integer.")
+        if calculation_method is not None:
+            try:
+                if isinstance(calculation_method, str):
+                    calculation_method = CalculationMethod[calculation_method]
+                else:
+                    calculation_method = CalculationMethod(calculation_method)
+            except (KeyError, ValueError) as error:
+                raise InvalidExecutionConfigError(f"Unknown calculation method: {calculation_method}") from error
+
+        self.threading = threading
+        self.calculation_method = calculation_method
+        self.error_tolerance = error_tolerance
+        self.max_iterations = max_iterations
+
+    def __repr__(self) -> str:
+        return (
+            f"ExecutionConfig(threading={self.threading}, calculation_method={self.calculation_method}, "
+            f"error_tolerance={self.error_tolerance}, max_iterations={self.max_iterations})"
+        )
+
+    def replace(self, **changes) -> "ExecutionConfig":
+        """Return a copy of this configuration with the given fields changed."""
+        values = {
+            "threading": self.threading,
+            "calculation_method": self.calculation_method,
+            "error_tolerance": self.error_tolerance,
+            "max_iterations": self.max_iterations,
+        }
+        values.update(changes)
+        return ExecutionConfig(**values)
+
+    def power_flow_kwargs(self, default_method: CalculationMethod) -> Dict:
+        """
+        Keyword arguments for PowerGridModel.calculate_power_flow.
+
+        Args:
+            default_method (CalculationMethod): Method used when no calculation method is configured.
+
+        Returns:
+            Dict: threading, calculation_method, error_tolerance and max_iterations.
+        """
+        return {
+            "threading": self.threading,
+            "calculation_method": self.calculation_method or default_method,
+            "error_tolerance": self.error_tolerance,
+            "max_iterations": self.max_iterations,
+        }
+
+
+_EXECUTION_CONFIG = ExecutionConfig()
+
+
+def get_execution_config() -> ExecutionConfig:
+    """Return the package-level execution configuration."""
+    return _EXECUTION_CONFIG
+
+
+def set_execution_config(config: Optional[ExecutionConfig] = None, **changes) -> ExecutionConfig:
+    """
+    Replace the package-level execution configuration.
+
+    Args:
+        config (ExecutionConfig, optional): New configuration. If omitted, the current one is used as a base.
+        **changes: Fields to change, e.g. threading=8.
+
+    Returns:
+        ExecutionConfig: The previous configuration, so it can be restored.
+    """
+    global _EXECUTION_CONFIG  # pylint: disable=global-statement
+    previous = _EXECUTION_CONFIG
+    _EXECUTION_CONFIG = (config or previous).replace(**changes)
+    return previous
+
+
+@contextmanager
+def execution_config(config: Optional[ExecutionConfig] = None, **changes) -> Iterator[ExecutionConfig]:
+    """Temporarily change the package-level execution configuration inside a with-block."""
+    previous = set_execution_config(config, **changes)
+    try:
+        yield get_execution_config()
+    finally:
+        set_execution_config(previous)
+
+
+def resolve_execution_config(config: Optional[ExecutionConfig] = None) -> ExecutionConfig:
+    """Return the given configuration, or the package-level one when None is given."""
+    return config if config is not None else _EXECUTION_CONFIG
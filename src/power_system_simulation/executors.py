@@ -0,0 +1,467 @@
+"""
+Executors Module
+
+This script defines the pluggable executors the parallel studies run on (the studies of the command line tool,
+the grids of a fleet and the seeds of an EV Monte Carlo run). Every executor has the same map method as
+concurrent.futures: the tasks are sent in chunks of chunk_size and the results are streamed back as the chunks
+complete, in task order or in completion order. The backends are
+
+    SerialExecutor      the tasks run one after the other in this process
+    ThreadExecutor      a thread pool, for tasks that release the GIL (power_grid_model does)
+    ProcessExecutor     a process pool on this machine
+    SocketExecutor      a coordinator that workers on any node connect to over TCP
+
+A SocketExecutor listens on an address and hands the chunks to every worker that connects, e.g. started on the
+batch nodes with `power-system-simulation worker HOST:PORT` and the same PSS_CLUSTER_KEY environment variable
+(the connections are authenticated with it, as tasks are pickled). It can start local workers itself, so a
+cluster of several processes on localhost behaves as one of several nodes. Tasks and their results must be
+picklable and the workers need the package installed.
+
+Chunks of a worker that dies (a lost connection or a broken process pool) are sent again, up to retries times
+per chunk; local workers that die are replaced, also when they die before they connect. Errors raised by a task
+are not retried but raised by map.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+EXECUTORS = ("serial", "thread", "process", "socket")
+CLUSTER_KEY = "PSS_CLUSTER_KEY"
+# seconds between the checks of a SocketExecutor for local workers that died before they connected
+POLL_INTERVAL = 1.0
+
+
+class InvalidExecutorError(Exception):
+    """Exception raised when an executor or its options are not valid, e.g. a cache its workers can not share."""
+
+
+class WorkerLostError(Exception):
+    """Exception raised when a chunk was lost with its worker more often than the executor retries."""
+
+
+def _run_chunk(fn: Callable, chunk: List[tuple]) -> list:
+    return [fn(*args) for args in chunk]
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split HOST:PORT into a host and port tuple."""
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise InvalidExecutorError(f"{address} is not a HOST:PORT address.")
+    return host, int(port)
+
+
+def cluster_key() -> bytes:
+    """The authentication key of a cluster: PSS_CLUSTER_KEY, or a random key for a cluster on this node only."""
+    key = os.environ.get(CLUSTER_KEY)
+    return key.encode() if key else os.urandom(32)
+
+
+class Executor:
+    """
+    Base class of the executors. Subclasses run the chunks in _stream; the executor is closed by close or at the
+    end of a with-block.
+
+    Attributes:
+        retries: Number of times a chunk is sent again after its worker died.
+    """
+
+    def __init__(self, retries: int = 2) -> None:
+        if not isinstance(retries, int) or retries < 0:
+            raise InvalidExecutorError("retries must be a non-negative integer.")
+        self.retries = retries
+
+    def __enter__(self) -> "Executor":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers of the executor."""
+
+    def _stream(self, fn: Callable, chunks: List[List[tuple]]) -> Iterator[Tuple[int, list]]:
+        """Run every chunk and yield its index and results as it completes."""
+        raise NotImplementedError
+
+    def _lost(self, attempts: List[int], index: int) -> None:
+        attempts[index] += 1
+        if attempts[index] > self.retries:
+            raise WorkerLostError(f"Chunk {index} was lost with its worker {attempts[index]} times.")
+
+    def map(self, fn: Callable, *iterables: Iterable, chunk_size: int = 1, ordered: bool = True) -> Iterator:
+        """
+        Run fn over the tasks and stream the results back.
+
+        Args:
+            fn (Callable): Task function, called with one item of every iterable.
+            *iterables (Iterable): Arguments of the tasks, as for the built-in map.
+            chunk_size (int): Number of tasks sent to a worker at once.
+            ordered (bool): Yield the results in task order. False yields them as the chunks complete.
+
+        Returns:
+            Iterator: The result of every task.
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise InvalidExecutorError("chunk_size must be a positive integer.")
+        tasks = list(zip(*iterables))
+        chunks = [tasks[start : start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+        return self._results(fn, chunks, ordered)
+
+    def _results(self, fn: Callable, chunks: List[List[tuple]], ordered: bool) -> Iterator:
+        done = {}
+        next_index = 0
+        for index, results in self._stream(fn, chunks):
+            if not ordered:
+                yield from results
+                continue
+            # completed chunks wait until every chunk before them is yielded
+            done[index] = results
+            while next_index in done:
+                yield from done.pop(next_index)
+                next_index += 1
+
+
+class SerialExecutor(Executor):
+    """Runs the chunks one after the other in this process, e.g. for debugging or a single study."""
+
+    def _stream(self, fn: Callable, chunks: List[List[tuple]]) -> Iterator[Tuple[int, list]]:
+        for index, chunk in enumerate(chunks):
+            yield index, _run_chunk(fn, chunk)
+
+
+class ThreadExecutor(Executor):
+    """
+    Runs the chunks on a thread pool of this process. A thread is never lost, so retries is only accepted for
+    the interface every executor has.
+
+    Attributes:
+        workers: Number of threads. None uses the default of ThreadPoolExecutor.
+    """
+
+    def __init__(self, workers: Optional[int] = None, retries: int = 2) -> None:
+        super().__init__(retries)
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise InvalidExecutorError("workers must be a positive integer.")
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def close(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+    def _stream(self, fn: Callable, chunks: List[List[tuple]]) -> Iterator[Tuple[int, list]]:
+        futures = {self._pool.submit(_run_chunk, fn, chunk): index for index, chunk in enumerate(chunks)}
+        try:
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield futures.pop(future), future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class ProcessExecutor(Executor):
+    """
+    Runs the chunks on a process pool of this machine. A pool that breaks because a worker died is replaced
+    and its unfinished chunks are sent again.
+
+    Attributes:
+        workers: Number of worker processes. None uses the number of CPUs.
+        initializer: Called in every worker process when it starts, with initargs.
+        initargs: Arguments of initializer.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        retries: int = 2,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+    ) -> None:
+        super().__init__(retries)
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise InvalidExecutorError("workers must be a positive integer.")
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer, initargs=self.initargs)
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _stream(self, fn: Callable, chunks: List[List[tuple]]) -> Iterator[Tuple[int, list]]:
+        pool = self._pool or self._new_pool()
+        attempts = [0] * len(chunks)
+        futures = {pool.submit(_run_chunk, fn, chunk): index for index, chunk in enumerate(chunks)}
+        try:
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                if not any(isinstance(future.exception(), BrokenProcessPool) for future in finished):
+                    for future in finished:
+                        yield futures.pop(future), future.result()
+                    continue
+                # a dead worker breaks the whole pool: the chunks that did not complete are sent to a new one
+                pool.shutdown()
+                lost = []
+                for future, index in futures.items():
+                    if isinstance(future.exception(), BrokenProcessPool):
+                        self._lost(attempts, index)
+                        lost.append(index)
+                    else:
+                        yield index, future.result()
+                pool = self._new_pool()
+                futures = {pool.submit(_run_chunk, fn, chunks[index]): index for index in lost}
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes) -> None:
+    """
+    Worker loop of a SocketExecutor: run the chunks it is sent until the coordinator stops or disconnects.
+
+    Args:
+        address (Tuple[str, int]): Host and port the coordinator listens on.
+        authkey (bytes): Authentication key of the cluster.
+    """
+    with Client(tuple(address), authkey=authkey) as connection:
+        connection.send((socket.gethostname(), os.getpid()))
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            fn, chunk = message
+            try:
+                reply = ("ok", _run_chunk(fn, chunk))
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                reply = ("error", error)
+            try:
+                connection.send(reply)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # the error itself could not be pickled
+                connection.send(("error", RuntimeError(repr(reply[1]))))
+
+
+class SocketExecutor(Executor):
+    """
+    Coordinator of a cluster of workers that connect over TCP, on this node or on others.
+
+    Attributes:
+        address: Host and port the coordinator listens on (the port is chosen when 0 is given).
+        authkey: Authentication key the workers connect with.
+        timeout: Seconds map waits for a worker to connect or reply before it gives up. None waits forever, but
+            local workers that die before they connect are replaced (up to retries times) or raise WorkerLostError.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        authkey: Optional[bytes] = None,
+        retries: int = 2,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(retries)
+        if not isinstance(workers, int) or workers < 0:
+            raise InvalidExecutorError("workers must be a non-negative integer.")
+        self.authkey = authkey if authkey is not None else cluster_key()
+        self.timeout = timeout
+        self._listener = Listener(tuple(address), authkey=self.authkey)
+        self.address = self._listener.address
+        # (map id or "joined", chunk index or worker host and pid, connection, reply) of joined workers and replies
+        self._events = queue.Queue()
+        self._idle = deque()
+        self._workers = {}
+        self._closed = False
+        self._map_id = 0
+        self._failed_starts = 0
+        self._accepter = threading.Thread(target=self._accept, daemon=True)
+        self._accepter.start()
+        # spawned, so the local workers share nothing with this process, like workers on other nodes
+        self._context = multiprocessing.get_context("spawn")
+        self._processes = [self._start_worker() for _ in range(workers)]
+
+    def _start_worker(self) -> multiprocessing.Process:
+        process = self._context.Process(target=run_worker, args=(self.address, self.authkey), daemon=True)
+        process.start()
+        return process
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection = self._listener.accept()
+                worker = connection.recv()
+            except (multiprocessing.AuthenticationError, EOFError):
+                continue
+            except OSError:
+                return
+            if worker is None:
+                # the connection of close
+                connection.close()
+                return
+            if self._closed:
+                connection.close()
+                continue
+            self._events.put(("joined", worker, connection, None))
+
+    def _call(self, map_id: int, index: int, connection, message: tuple) -> None:
+        """Send one chunk and wait for its reply, in a thread per chunk in flight."""
+        try:
+            connection.send(message)
+            self._events.put((map_id, index, connection, connection.recv()))
+        except Exception:  # pylint: disable=broad-exception-caught
+            # a dead worker, or a connection that close closed while the reply was read
+            self._events.put((map_id, index, connection, None))
+
+    def _drop(self, connection) -> None:
+        """Close the connection of a worker that died and replace the worker if it is a local one."""
+        connection.close()
+        worker = self._workers.pop(connection, None)
+        for position, process in enumerate(self._processes):
+            if (socket.gethostname(), process.pid) == worker:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                self._processes[position] = self._start_worker()
+
+    def _restart_unjoined(self) -> None:
+        """Replace the local workers that died before they connected, e.g. because they failed to start."""
+        joined = set(self._workers.values())
+        for position, process in enumerate(self._processes):
+            if process.is_alive() or (socket.gethostname(), process.pid) in joined:
+                continue
+            self._failed_starts += 1
+            if self._failed_starts > self.retries:
+                raise WorkerLostError(f"Local workers died before they connected {self._failed_starts} times.")
+            self._processes[position] = self._start_worker()
+
+    def _next_event(self) -> tuple:
+        """Wait for the next joined worker or reply, checking the local workers while waiting."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            wait_time = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - time.monotonic())
+            try:
+                return self._events.get(timeout=max(wait_time, 0))
+            except queue.Empty:
+                pass
+            if deadline is not None and time.monotonic() >= deadline:
+                raise WorkerLostError(f"No worker replied within {self.timeout} s.")
+            self._restart_unjoined()
+
+    def _stream(self, fn: Callable, chunks: List[List[tuple]]) -> Iterator[Tuple[int, list]]:
+        self._map_id += 1
+        map_id = self._map_id
+        attempts = [0] * len(chunks)
+        pending = deque(range(len(chunks)))
+        in_flight = 0
+        while pending or in_flight:
+            while pending and self._idle:
+                index = pending.popleft()
+                thread = threading.Thread(
+                    target=self._call, args=(map_id, index, self._idle.popleft(), (fn, chunks[index])), daemon=True
+                )
+                thread.start()
+                in_flight += 1
+            event_id, index, connection, reply = self._next_event()
+            if event_id == "joined":
+                self._workers[connection] = index
+                self._idle.append(connection)
+                continue
+            if event_id != map_id:
+                # the reply of a map that was stopped early
+                if reply is None:
+                    self._drop(connection)
+                else:
+                    self._idle.append(connection)
+                continue
+            in_flight -= 1
+            if reply is None:
+                self._drop(connection)
+                self._lost(attempts, index)
+                pending.appendleft(index)
+                continue
+            self._idle.append(connection)
+            status, results = reply
+            if status == "error":
+                raise results
+            yield index, results
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        while not self._events.empty():
+            event_id, worker, connection, _ = self._events.get()
+            if event_id == "joined":
+                self._workers[connection] = worker
+                self._idle.append(connection)
+        for connection in self._idle:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        # workers that are still busy with a chunk of a map that was stopped early see the connection close
+        for connection in set(self._idle) | set(self._workers):
+            connection.close()
+        self._idle.clear()
+        joined = set(self._workers.values())
+        for process in self._processes:
+            # local workers that did not connect yet would find no coordinator
+            if (socket.gethostname(), process.pid) not in joined:
+                process.terminate()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        # a last connection stops the accepting thread
+        with Client(self.address, authkey=self.authkey) as connection:
+            connection.send(None)
+        self._accepter.join()
+        self._listener.close()
+
+
+def make_executor(kind: str = "process", workers: Optional[int] = None, **options) -> Executor:
+    """
+    Create an executor by name.
+
+    Args:
+        kind (str): serial, thread, process or socket.
+        workers (int, optional): Number of workers; for socket the number of local workers it starts.
+        **options: Further arguments of the executor, e.g. retries, or address and timeout for socket.
+
+    Returns:
+        Executor: The executor.
+    """
+    if kind == "serial":
+        return SerialExecutor(**options)
+    if kind == "thread":
+        return ThreadExecutor(workers, **options)
+    if kind == "process":
+        return ProcessExecutor(workers, **options)
+    if kind == "socket":
+        return SocketExecutor(workers or 0, **options)
+    raise InvalidExecutorError(f"The executor must be one of {EXECUTORS}.")
@@ -0,0 +1,184 @@
+"""
+Fleet Module
+
+This script defines the fleet runner for the nightly studies of every LV grid in a region. The cost of every
+study is estimated from the number of nodes times the number of timestamps of its grid package, and the
+studies are scheduled largest first on a process pool: every worker that becomes idle takes the largest study
+that is left, so the small grids fill the gaps at the end and no worker waits for one large grid that started
+last.
+
+Every worker writes the aggregated tables of its study straight to a shared parquet dataset, one directory per
+table (<output>/voltage, <output>/line) with one file per grid and study and Grid and Study columns, which
+pd.read_parquet(<output>/line) reads as one table. Only the timings go back to the parent, which reports the
+makespan and the utilisation of every worker.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from power_system_simulation.executors import Executor, ProcessExecutor
+from power_system_simulation.studies import (
+    ACTIVE_POWER_PROFILE,
+    INPUT_NETWORK_DATA,
+    error_summary,
+    run_study,
+    study_name,
+)
+
+FLEET_STUDIES = ("powerflow", "ev")
+FLEET_COLUMNS = ["Grid", "Study", "Cost", "Worker", "Start", "Seconds", "Status"]
+
+
+class InvalidFleetError(Exception):
+    """Exception raised when a fleet has no grids, an unknown study or grids with the same name."""
+
+
+def estimate_cost(grid_dir: Path) -> int:
+    """
+    Estimate the cost of a study on a grid package without building the model.
+
+    Args:
+        grid_dir (Path): Grid package directory.
+
+    Returns:
+        int: Number of nodes times the number of timestamps of the active power profile.
+    """
+    with open(Path(grid_dir) / INPUT_NETWORK_DATA, "r", encoding="utf-8") as fp:
+        n_nodes = len(json.load(fp)["data"]["node"])
+    n_timestamps = pq.ParquetFile(Path(grid_dir) / ACTIVE_POWER_PROFILE).metadata.num_rows
+    return n_nodes * n_timestamps
+
+
+def _run_task(command: str, grid_dir: Path, options: Dict, output: Path) -> Dict:
+    """Run one study in a worker and write its tables to the shared dataset. Errors are reported, not raised."""
+    start = time.time()
+    study = study_name(command, options)
+    try:
+        for name, table in run_study(command, grid_dir, options).items():
+            table = table.reset_index()
+            table.insert(0, "Study", study)
+            table.insert(0, "Grid", grid_dir.name)
+            (output / name).mkdir(parents=True, exist_ok=True)
+            table.to_parquet(output / name / f"{grid_dir.name}-{study}.parquet", index=False)
+        status = "ok"
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        status = error_summary(error)
+    worker = (socket.gethostname(), os.getpid(), threading.get_ident())
+    return {"Worker": worker, "Start": start, "End": time.time(), "Status": status}
+
+
+def run_fleet(
+    grid_dirs: Sequence[Path],
+    output: Path,
+    studies: Sequence[str] = ("powerflow",),
+    percentage: float = 50.0,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    threads: Optional[int] = None,
+    largest_first: bool = True,
+    report: Optional[Dict] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """
+    Run studies for a fleet of grid packages on a process pool (or another executor), largest first.
+
+    Args:
+        grid_dirs (Sequence[Path]): Grid package directories, with different directory names.
+        output (Path): Directory of the shared parquet dataset.
+        studies (Sequence[str]): Studies to run on every grid: powerflow and/or ev.
+        percentage (float): EV penetration percentage of the ev study.
+        seed (int): Random seed of the EV placement of the ev study.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        threads (int, optional): power_grid_model threads per study.
+        largest_first (bool): Schedule by decreasing cost. False keeps the given order, e.g. for comparisons.
+        report (Dict, optional): If given, filled with the makespan, the busy time of all workers and the
+            utilisation of every worker (busy time divided by the makespan).
+        executor (Executor, optional): If given, the studies run on it instead of a pool of worker processes,
+            e.g. on a SocketExecutor with workers on other nodes that share the grid and output directories. Its
+            workers take the studies in schedule order as well.
+
+    Returns:
+        pd.DataFrame: One row per study in schedule order, with its cost, worker, start (from the start of the
+            run) and duration in seconds and its status.
+    """
+    grid_dirs = [Path(grid_dir) for grid_dir in grid_dirs]
+    if not grid_dirs:
+        raise InvalidFleetError("A fleet needs at least one grid package.")
+    if len({grid_dir.name for grid_dir in grid_dirs}) != len(grid_dirs):
+        raise InvalidFleetError("The grid package directories must have different names.")
+    if not studies or any(study not in FLEET_STUDIES for study in studies):
+        raise InvalidFleetError(f"The studies must be one or more of {FLEET_STUDIES}.")
+
+    costs = {grid_dir: estimate_cost(grid_dir) for grid_dir in grid_dirs}
+    tasks = [
+        (
+            command,
+            grid_dir,
+            {"threads": threads} | ({"percentage": percentage, "seed": seed} if command == "ev" else {}),
+        )
+        for grid_dir in grid_dirs
+        for command in studies
+    ]
+    if largest_first:
+        tasks.sort(key=lambda task: costs[task[1]], reverse=True)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+    output = Path(output)
+    start = time.time()
+    # the executor hands every task to the first idle worker, in submission order
+    with ProcessExecutor(workers) if executor is None else nullcontext(executor) as pool:
+        results = list(pool.map(_run_task, *zip(*tasks), [output] * len(tasks)))
+    makespan = time.time() - start
+    if executor is not None:
+        workers = len({result["Worker"] for result in results})
+
+    worker_index = {}
+    rows = []
+    for (command, grid_dir, options), result in zip(tasks, results):
+        rows.append(
+            {
+                "Grid": str(grid_dir),
+                "Study": study_name(command, options),
+                "Cost": costs[grid_dir],
+                "Worker": worker_index.setdefault(result["Worker"], len(worker_index)),
+                "Start": result["Start"] - start,
+                "Seconds": result["End"] - result["Start"],
+                "Status": result["Status"],
+            }
+        )
+    timings = pd.DataFrame(rows, columns=FLEET_COLUMNS)
+
+    if report is not None:
+        busy = timings.groupby("Worker")["Seconds"].sum()
+        report["makespan"] = makespan
+        report["busy_seconds"] = busy.sum()
+        report["utilisation"] = (busy / makespan).to_dict()
+        report["mean_utilisation"] = busy.sum() / (workers * makespan)
+    return timings
+
+
+def fleet_tables(output: Path, name: str) -> pd.DataFrame:
+    """
+    Read one table of every grid and study from the shared dataset.
+
+    Args:
+        output (Path): Directory of the shared parquet dataset.
+        name (str): Table name, voltage or line.
+
+    Returns:
+        pd.DataFrame: The table of every grid and study, with Grid and Study columns.
+    """
+    return pd.read_parquet(Path(output) / name)
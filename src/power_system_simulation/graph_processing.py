@@ -10,10 +10,8 @@ Date: 30/04/2024
 
 """
 
-import copy
-from typing import List, Tuple
-
-import networkx as nx
+from itertools import combinations
+from typing import Dict, List, Tuple
 
 
 class IDNotFoundError(Exception):
@@ -40,6 +38,28 @@ class EdgeAlreadyDisabledError(Exception):
     """Exception raised when an edge is already disabled"""
 
 
+class EdgeAlreadyEnabledError(Exception):
+    """Exception raised when an edge is already enabled"""
+
+
+def _joins_all_components(component_pairs: List[List[int]], n_components: int) -> bool:
+    """Check with a union-find that n_components - 1 edges between components join them into one tree."""
+    parent = list(range(n_components))
+
+    def find(label: int) -> int:
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    for label_u, label_v in component_pairs:
+        root_u, root_v = find(label_u), find(label_v)
+        if root_u == root_v:
+            return False
+        parent[root_u] = root_v
+    return True
+
+
 class GraphProcessor:
     """
     A class for processing undirected graphs.
@@ -62,7 +82,7 @@ class GraphProcessor:
         self.vertex_ids = vertex_ids
         self.edge_ids = edge_ids
         self.edge_vertex_id_pairs = edge_vertex_id_pairs
-        self.edge_enabled = edge_enabled
+        self.edge_enabled = list(edge_enabled)
         self.source_vertex_id = source_vertex_id
 
         # 1. check for redundant vertex or edge ids
@@ -96,6 +116,9 @@ class GraphProcessor:
         if source_vertex_id not in vertex_ids:
             raise IDNotFoundError("Source vertex ID not found.")
 
+        # networkx is only imported when a graph is built, importing this module stays cheap
+        import networkx as nx  # pylint: disable=import-outside-toplevel
+
         # Initialize a NetworkX graph
         self.graph = nx.Graph()
 
@@ -119,104 +142,329 @@ class GraphProcessor:
         except nx.NetworkXNoCycle:
             pass
 
+        # Tree index: parent, parent edge and children of every vertex, and the component of every vertex.
+        # It is kept up to date by enable_edge, disable_edge and swap_edges.
+        self._edge_index = {edge_id: i for i, edge_id in enumerate(self.edge_ids)}
+        self._parent = dict.fromkeys(vertex_ids)
+        self._parent_edge = dict.fromkeys(vertex_ids)
+        self._children = {vertex: {} for vertex in vertex_ids}
+        edge_of_pair = {}
+        for edge_id, (u, v), enabled in zip(self.edge_ids, self.edge_vertex_id_pairs, self.edge_enabled):
+            if enabled:
+                edge_of_pair[(u, v)] = edge_of_pair[(v, u)] = edge_id
+        for u, v in nx.bfs_edges(self.graph, source_vertex_id):
+            self._attach(v, u, edge_of_pair[(u, v)])
+        self._component = dict.fromkeys(vertex_ids, 0)
+        self._component_size = {0: len(vertex_ids)}
+        self._next_label = 1
+
     def find_downstream_vertices(self, starting_edge_id: int) -> List[int]:
+        """
+        Find the vertices that are disconnected from the source when an edge is disabled.
+
+        The query only reads the tree index, so one processor can answer queries from several threads
+        as long as no edge is switched at the same time.
+
+        Args:
+            starting_edge_id: The edge to disable.
+
+        Returns:
+            The sorted ids of the vertices below the edge, empty if the edge is already disabled.
+        """
         # Verify that the edge ID exists
-        if starting_edge_id not in self.edge_ids:
-            raise IDNotFoundError("The edge ID provided does not exist.")
+        index = self._checked_edge_index(starting_edge_id)
 
-        # Check if the edge is already disabled, which would be incorrect for this operation
-        index = self.edge_ids.index(starting_edge_id)
+        # A disabled edge has no downstream vertices
         if not self.edge_enabled[index]:
             return []
-        # Get the vertices of the edge
+
+        # The downstream side of an enabled edge is the subtree of its vertex that hangs from it
         u, v = self.edge_vertex_id_pairs[index]
+        child = v if self._parent_edge[v] == starting_edge_id else u
+        return sorted(self._subtree(child))
 
-        # Simulate the edge being disabled by temporarily removing it
-        self.graph.remove_edge(u, v)
+    def find_alternative_edges(self, disabled_edge_id: int) -> List[int]:
+        """
+        Find the disabled edges that each restore a connected, radial graph after disabling an edge.
 
-        # Find all connected components after the removal
-        components = list(nx.connected_components(self.graph))
+        Disabling an edge of the tree cuts off the subtree below it, so an alternative is a disabled edge
+        with exactly one vertex in that subtree. Like find_downstream_vertices, the query is read-only.
 
-        # Restore the edge to maintain original graph state
-        self.graph.add_edge(u, v)
+        Args:
+            disabled_edge_id: The enabled edge to disable.
 
-        # Determine which component contains the source vertex
-        source_component = next(comp for comp in components if self.source_vertex_id in comp)
+        Returns:
+            The alternative edge ids, in edge_ids order.
+        """
+        index = self._checked_edge_index(disabled_edge_id)
+        if not self.edge_enabled[index]:
+            raise EdgeAlreadyDisabledError("The edge ID provided is already disabled.")
 
-        # Return the nodes in the component that does not contain the source vertex
-        for comp in components:
-            if comp != source_component:
-                return list(comp)
+        # a graph that is already split cannot be reconnected by enabling a single edge
+        if not self.is_connected:
+            return []
 
-    def find_alternative_edges(self, disabled_edge_id: int) -> List[int]:
-        ############################################################
-        "Done by Carmelo Vella, 02/05/2024"
-
-        # Explanaition:
-        # 1. a list of ORIGINALLY disabled edges is created
-        # 2. errors are checked and empty output list is initialised
-        # 3. a list of UPDATED disabled edges is made with disabled_edge_id considered
-
-        # 4. a list of edges is created: the list(zip()) functions pair each edge_id with
-        # the corresponding vertex pair and status-enables/disabled
-        # 5. a new list is made where disabled_edge_id considered (it becomes disabled)
-        # 6. the ORIGINALLY disabled edges are taken one by one (while loop). For each
-        # iteration, the edge is now ENABLED "temporarily" and a new graph is made. This graph
-        # is then checked for cyclicity and completeness. If satisfactory, the ORIGINALLY disabled
-        # index is added to the output list alt_list[]
-        # 7. after iterations end, the output list is printed
-
-        # 1. create list of disabled edges
-        disabled_edges = [self.edge_ids[i] for i in range(len(self.edge_ids)) if not self.edge_enabled[i]]
-        # 2. check if edge is not already disabled
-        if disabled_edge_id not in self.edge_ids:
-            raise IDNotFoundError
-        if disabled_edge_id in disabled_edges:
-            raise EdgeAlreadyDisabledError
-
-        alt_list = []
-
-        # 3. create copy of list and update list
-        disabled_edges_new = copy.copy(disabled_edges)
-        disabled_edges_new.append(disabled_edge_id)
-
-        # 4. create list of all edges with vertex pairs, enabling and ID (vertex_pair,(dis)/(en)abled,id)
-        full_edge_list = list(zip(self.edge_vertex_id_pairs, self.edge_enabled, self.edge_ids))
-        # 5. the edge with id = disabled_edge_id is disabled and list is updated
-        new_full_edge_list = [
-            (vertex_pair, False if edge_id == disabled_edge_id else enabled, edge_id)
-            for vertex_pair, enabled, edge_id in full_edge_list
+        downstream = set(self.find_downstream_vertices(disabled_edge_id))
+        return [
+            edge_id
+            for edge_id, (u, v), enabled in zip(self.edge_ids, self.edge_vertex_id_pairs, self.edge_enabled)
+            if not enabled and (u in downstream) != (v in downstream)
         ]
 
-        # 6. the originally disabled edges are iterated through and enabled in sequence
-        # iterate disabled_edges:
-        i = 0
-        while i < len(disabled_edges):
-            # for each originally disabled edge, a new graph is created in which a new list of edges is
-            # created (i.e. said edge is now enabled)
-            temp_full_edge_list = [
-                (vertex_pair, True if edge_id == disabled_edges[i] else enabled, edge_id)
-                for vertex_pair, enabled, edge_id in new_full_edge_list
-            ]
-
-            # new graph is made // all vertices are added // edges are added from previously updated edge list
-            new_graph = nx.Graph()
-            new_graph.add_nodes_from(self.vertex_ids)
-
-            for vertex_pair, enabled, edge_id in temp_full_edge_list:
-                if enabled:
-                    new_graph.add_edge(*vertex_pair, id=self.edge_ids)
-
-            try:
-                nr_cycles = nx.find_cycle(new_graph)
-            except nx.NetworkXNoCycle:
-                nr_cycles = 0
-            connected = nx.is_connected(new_graph)
-
-            if nr_cycles == 0 and connected is True:
-                alt_list.append(disabled_edges[i])
-
-            i += 1
-
-        # 7. print output
-        return alt_list
+    def find_alternative_edge_sets(self, disabled_edge_ids: List[int]) -> List[Tuple[int, ...]]:
+        """
+        Find every set of currently disabled edges that restores a connected, radial graph
+        after disabling all the given edges at once.
+
+        Disabling k edges of a tree leaves k + 1 components, so a restoration set has k edges and
+        every edge in it has to join two components that are not joined yet.
+
+        Args:
+            disabled_edge_ids: Enabled edges to disable together (an N-k outage).
+
+        Returns:
+            List of restoration sets (tuples of edge ids, in edge_ids order). Empty if the outage
+            islands part of the graph that no disabled edge can reconnect.
+        """
+        originally_disabled = [edge_id for edge_id, enabled in zip(self.edge_ids, self.edge_enabled) if not enabled]
+        for edge_id in disabled_edge_ids:
+            if edge_id not in self.edge_ids:
+                raise IDNotFoundError("The edge ID provided does not exist.")
+            if edge_id in originally_disabled:
+                raise EdgeAlreadyDisabledError("The edge ID provided is already disabled.")
+
+        import networkx as nx  # pylint: disable=import-outside-toplevel
+
+        pairs = dict(zip(self.edge_ids, self.edge_vertex_id_pairs))
+        outage_graph = nx.Graph()
+        outage_graph.add_nodes_from(self.vertex_ids)
+        outage_graph.add_edges_from(
+            pair
+            for edge_id, pair, enabled in zip(self.edge_ids, self.edge_vertex_id_pairs, self.edge_enabled)
+            if enabled and edge_id not in disabled_edge_ids
+        )
+        component_of = {}
+        for label, component in enumerate(nx.connected_components(outage_graph)):
+            component_of.update(dict.fromkeys(component, label))
+        n_components = max(component_of.values()) + 1
+
+        # candidate edges join two different components; a component without one can never be reconnected
+        candidates = [edge_id for edge_id in originally_disabled if len({component_of[v] for v in pairs[edge_id]}) == 2]
+        touched = {component_of[v] for edge_id in candidates for v in pairs[edge_id]}
+        if len(touched) < n_components:
+            return []
+
+        return [
+            restoration
+            for restoration in combinations(candidates, n_components - 1)
+            if _joins_all_components(
+                [[component_of[v] for v in pairs[edge_id]] for edge_id in restoration], n_components
+            )
+        ]
+
+    def tree_index(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Index the radial graph as a tree rooted at the source vertex.
+
+        Returns:
+            Three lists of equal length: the vertex ids in topological (breadth-first) order starting
+            with the source vertex, for every vertex the position of its parent vertex in the first list
+            and the id of the edge to its parent. Both are -1 for the source vertex.
+        """
+        if not self.is_connected:
+            raise GraphNotFullyConnectedError("Graph not fully connected")
+
+        order = [self.source_vertex_id]
+        parent = [-1]
+        parent_edge = [-1]
+        for position, vertex in enumerate(order):
+            for child, edge_id in self._children[vertex].items():
+                order.append(child)
+                parent.append(position)
+                parent_edge.append(edge_id)
+        return order, parent, parent_edge
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the enabled edges connect every vertex (False after a disable_edge until it is undone)."""
+        return len(self._component_size) == 1
+
+    def disable_edge(self, edge_id: int) -> List[int]:
+        """
+        Disable an enabled edge and update the tree index.
+
+        The graph stays radial, but the vertices below the edge are disconnected from the source until an
+        edge that reconnects them is enabled. The cost is proportional to the number of those vertices.
+
+        Args:
+            edge_id: Enabled edge to disable.
+
+        Returns:
+            The vertices that are disconnected by disabling the edge.
+        """
+        index = self._checked_edge_index(edge_id)
+        if not self.edge_enabled[index]:
+            raise EdgeAlreadyDisabledError("The edge ID provided is already disabled.")
+
+        u, v = self.edge_vertex_id_pairs[index]
+        child = v if self._parent[v] == u and self._parent_edge[v] == edge_id else u
+        del self._children[self._parent[child]][child]
+        self._parent[child] = None
+        self._parent_edge[child] = None
+
+        subtree = self._subtree(child)
+        label = self._next_label
+        self._next_label += 1
+        self._component.update(dict.fromkeys(subtree, label))
+        self._component_size[label] = len(subtree)
+        self._component_size[self._component[u if child == v else v]] -= len(subtree)
+
+        self.edge_enabled[index] = False
+        self.graph.remove_edge(u, v)
+        return subtree
+
+    def enable_edge(self, edge_id: int) -> None:
+        """
+        Enable a disabled edge and update the tree index.
+
+        The edge has to join two components that are disconnected, otherwise GraphCycleError is raised and
+        nothing changes. The component that does not contain the source (or the smaller one, if neither does)
+        is re-rooted at the enabled edge. The cost is proportional to the number of vertices in that component.
+
+        Args:
+            edge_id: Disabled edge to enable.
+        """
+        index = self._checked_edge_index(edge_id)
+        if self.edge_enabled[index]:
+            raise EdgeAlreadyEnabledError("The edge ID provided is already enabled.")
+
+        u, v = self.edge_vertex_id_pairs[index]
+        if self._component[u] == self._component[v]:
+            raise GraphCycleError("Enabling the edge creates a cycle.")
+
+        # hang the component of v below u: swap them if u is not connected to the source but v is,
+        # or if neither is and the component of v is the larger one
+        source_label = self._component[self.source_vertex_id]
+        label_u, label_v = self._component[u], self._component[v]
+        if label_v == source_label or (
+            label_u != source_label and self._component_size[label_v] > self._component_size[label_u]
+        ):
+            u, v = v, u
+            label_u, label_v = label_v, label_u
+        subtree = self._reroot(v)
+        self._attach(v, u, edge_id)
+        self._component.update(dict.fromkeys(subtree, label_u))
+        self._component_size[label_u] += self._component_size.pop(label_v)
+
+        self.edge_enabled[index] = True
+        self.graph.add_edge(u, v, id=edge_id)
+
+    def swap_edges(self, disable_edge_id: int, enable_edge_id: int) -> None:
+        """
+        Disable one edge and enable another one in a single radial, connected switching step.
+
+        Args:
+            disable_edge_id: Enabled edge to disable.
+            enable_edge_id: Disabled edge to enable, which has to reconnect the vertices that disable_edge_id
+                disconnects. Otherwise GraphNotFullyConnectedError is raised and nothing changes.
+        """
+        if self.edge_enabled[self._checked_edge_index(enable_edge_id)]:
+            raise EdgeAlreadyEnabledError("The edge ID provided is already enabled.")
+        self.disable_edge(disable_edge_id)
+        try:
+            self.enable_edge(enable_edge_id)
+        except GraphCycleError as error:
+            self.enable_edge(disable_edge_id)
+            raise GraphNotFullyConnectedError("The enabled edge does not reconnect the disabled edge.") from error
+
+    def branch_exchanges(self) -> List[Tuple[int, int]]:
+        """
+        List every switching step that keeps the graph radial and connected.
+
+        Enabling a disabled edge closes the cycle formed with the tree path between its vertices, so
+        disabling any edge on that path restores a tree.
+
+        Returns:
+            (edge to disable, edge to enable) pairs, grouped by the disabled edge in edge_ids order.
+        """
+        if not self.is_connected:
+            raise GraphNotFullyConnectedError("Graph not fully connected")
+
+        exchanges = []
+        for edge_id, (u, v), enabled in zip(self.edge_ids, self.edge_vertex_id_pairs, self.edge_enabled):
+            if not enabled:
+                exchanges.extend((path_edge_id, edge_id) for path_edge_id in self._tree_path(u, v))
+        return exchanges
+
+    def _tree_path(self, u: int, v: int) -> List[int]:
+        """Edges of the tree path between two vertices of the same component."""
+        steps_from_u = {u: 0}
+        edges_u = []
+        vertex = u
+        while self._parent[vertex] is not None:
+            edges_u.append(self._parent_edge[vertex])
+            vertex = self._parent[vertex]
+            steps_from_u[vertex] = len(edges_u)
+
+        edges_v = []
+        vertex = v
+        while vertex not in steps_from_u:
+            edges_v.append(self._parent_edge[vertex])
+            vertex = self._parent[vertex]
+        return edges_u[: steps_from_u[vertex]] + edges_v
+
+    def _checked_edge_index(self, edge_id: int) -> int:
+        if edge_id not in self._edge_index:
+            raise IDNotFoundError("The edge ID provided does not exist.")
+        return self._edge_index[edge_id]
+
+    def _attach(self, child: int, parent: int, edge_id: int) -> None:
+        self._parent[child] = parent
+        self._parent_edge[child] = edge_id
+        self._children[parent][child] = edge_id
+
+    def _subtree(self, vertex: int) -> List[int]:
+        """The vertex and every vertex below it in the tree index."""
+        subtree = [vertex]
+        for member in subtree:
+            subtree.extend(self._children[member])
+        return subtree
+
+    def _reroot(self, vertex: int) -> List[int]:
+        """Make vertex the root of its component by reversing the path to the old root, return the component."""
+        path = [vertex]
+        while self._parent[path[-1]] is not None:
+            path.append(self._parent[path[-1]])
+        for upper, lower in zip(path[:0:-1], path[-2::-1]):
+            edge_id = self._parent_edge[lower]
+            del self._children[upper][lower]
+            self._attach(upper, lower, edge_id)
+        self._parent[vertex] = None
+        self._parent_edge[vertex] = None
+        return self._subtree(vertex)
+
+
+def grid_graph_processor(input_data: Dict, lv_busbar: int) -> GraphProcessor:
+    """
+    Build the GraphProcessor of a power_grid_model LV grid.
+
+    The lines are the edges, enabled when both sides are connected, and the transformer is added
+    as an always enabled edge from the source node to the LV busbar.
+
+    Args:
+        input_data: power_grid_model input data with node, line, transformer and source.
+        lv_busbar: Node id of the LV busbar (the to_node of the transformer).
+
+    Returns:
+        GraphProcessor with the source node as source vertex.
+    """
+    source_id = int(input_data["source"]["node"][0])
+    lines = input_data["line"]
+    return GraphProcessor(
+        vertex_ids=input_data["node"]["id"].tolist(),
+        edge_ids=lines["id"].tolist() + input_data["transformer"]["id"].tolist(),
+        edge_vertex_id_pairs=list(zip(lines["from_node"].tolist(), lines["to_node"].tolist()))
+        + [(source_id, lv_busbar)],
+        edge_enabled=((lines["from_status"] == 1) & (lines["to_status"] == 1)).tolist() + [True],
+        source_vertex_id=source_id,
+    )
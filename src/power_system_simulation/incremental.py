@@ -0,0 +1,244 @@
+"""
+Incremental Module
+
+This script defines the online mode for load snapshots that arrive continuously. An IncrementalSession keeps
+running aggregates of everything it has solved: the extreme voltage of every node and the extreme loading of
+every line with their timestamps, the cumulative energy losses of every line (integrated over the real time
+between the timestamps, also across updates) and the number of timestamps in violation of the limits. Every
+update only solves the timestamps after the last one that was solved and merges them into the aggregates, so
+its cost depends on the new data only.
+
+The aggregates are persisted in a state file after every update (written to a temporary file first, so a crash
+never leaves a truncated state behind) and a new session on the same state file continues where the last one
+stopped. The state file holds the fingerprint of the network and the limits, and is not used for another
+network or other limits.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from power_grid_model import CalculationType, PowerGridModel
+
+from power_system_simulation.aggregation import interval_energy, interval_hours
+from power_system_simulation.calculation_module import (
+    LoadIdsDoNotMatchError,
+    TimestampsDoNotMatchError,
+    load_profile_update,
+    read_input_data,
+    run_batch_power_flow,
+)
+from power_system_simulation.execution import ExecutionConfig
+from power_system_simulation.scenario_cache import dataset_digest
+
+
+class IncrementalStateError(Exception):
+    """Exception raised when a state file belongs to another network or was made with other limits."""
+
+
+class IncrementalSession:
+    """
+    Running aggregates of a power flow time series that grows by appended load snapshots.
+
+    Attributes:
+        state_path: Path of the state file.
+        voltage_limits: Lower and upper node voltage limits in p.u.
+        loading_limit: Line loading limit.
+        n_timestamps: Number of timestamps solved so far, over all sessions on the state file.
+        last_timestamp: Last timestamp solved so far, or None.
+    """
+
+    def __init__(
+        self,
+        input_network_data: str,
+        state_path: str,
+        execution_config: Optional[ExecutionConfig] = None,
+        voltage_limits: tuple = (0.9, 1.1),
+        loading_limit: float = 1.0,
+    ) -> None:
+        self.input_data = read_input_data(input_network_data)
+        self.model = PowerGridModel(input_data=self.input_data)
+        self.execution_config = execution_config
+        self.state_path = Path(state_path)
+        self.voltage_limits = voltage_limits
+        self.loading_limit = loading_limit
+
+        settings = {
+            "fingerprint": np.array(dataset_digest(self.input_data)),
+            "voltage_limits": np.array(voltage_limits, dtype=np.float64),
+            "loading_limit": np.array(loading_limit, dtype=np.float64),
+        }
+        if self.state_path.exists():
+            with np.load(self.state_path) as stored:
+                self._state = {name: stored[name] for name in stored.files}
+            if any(not np.array_equal(self._state[name], value) for name, value in settings.items()):
+                raise IncrementalStateError(f"{self.state_path} belongs to another network or other limits.")
+        else:
+            self._state = settings | self._empty_aggregates()
+
+    def _empty_aggregates(self) -> Dict[str, np.ndarray]:
+        n_nodes = len(self.input_data["node"])
+        n_lines = len(self.input_data["line"])
+        aggregates = {
+            "n_timestamps": np.array(0),
+            "last_timestamp": np.array(np.datetime64("NaT", "ns")),
+            "node_id": self.input_data["node"]["id"].copy(),
+            "line_id": self.input_data["line"]["id"].copy(),
+            "undervoltage_count": np.zeros(n_nodes, dtype=np.int64),
+            "overvoltage_count": np.zeros(n_nodes, dtype=np.int64),
+            "overloading_count": np.zeros(n_lines, dtype=np.int64),
+            "loss_kwh": np.zeros(n_lines),
+            "last_loss_power": np.zeros(n_lines),
+        }
+        for prefix, n_components in (("voltage", n_nodes), ("loading", n_lines)):
+            aggregates[f"{prefix}_max"] = np.full(n_components, -np.inf)
+            aggregates[f"{prefix}_min"] = np.full(n_components, np.inf)
+            aggregates[f"{prefix}_max_time"] = np.full(n_components, np.datetime64("NaT", "ns"))
+            aggregates[f"{prefix}_min_time"] = np.full(n_components, np.datetime64("NaT", "ns"))
+        return aggregates
+
+    @property
+    def n_timestamps(self) -> int:
+        """Number of timestamps solved so far."""
+        return int(self._state["n_timestamps"])
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Last timestamp solved so far, or None."""
+        last_timestamp = self._state["last_timestamp"][()]
+        return None if np.isnat(last_timestamp) else pd.Timestamp(last_timestamp)
+
+    def _merge_extrema(self, prefix: str, values: np.ndarray, timestamps: np.ndarray) -> None:
+        columns = np.arange(values.shape[1])
+        for extreme, arg, better in (("max", np.argmax, np.greater), ("min", np.argmin, np.less)):
+            rows = arg(values, axis=0)
+            # strictly better only, so the first timestamp of a tie is kept as in calculate_power_grid
+            improved = better(values[rows, columns], self._state[f"{prefix}_{extreme}"])
+            self._state[f"{prefix}_{extreme}"][improved] = values[rows[improved], columns[improved]]
+            self._state[f"{prefix}_{extreme}_time"][improved] = timestamps[rows[improved]]
+
+    def update(self, active_power_profile: pd.DataFrame, reactive_power_profile: pd.DataFrame) -> pd.DataFrame:
+        """
+        Solve the snapshots after the last solved timestamp and merge them into the aggregates.
+
+        Args:
+            active_power_profile (pd.DataFrame): Active power per timestamp (rows) and load ID (columns). Rows
+                up to the last solved timestamp are skipped, so a feed may be replayed with overlap.
+            reactive_power_profile (pd.DataFrame): Reactive power with the same timestamps and load IDs.
+
+        Returns:
+            pd.DataFrame: The voltage table of the new timestamps, as the voltage_df of calculate_power_grid.
+        """
+        from power_grid_model.validation import assert_valid_batch_data  # pylint: disable=import-outside-toplevel
+
+        if not active_power_profile.index.equals(reactive_power_profile.index):
+            raise TimestampsDoNotMatchError("Timestamps of active and reactive power profiles do not match.")
+        if not (active_power_profile.columns == reactive_power_profile.columns).all():
+            raise LoadIdsDoNotMatchError("Load IDs of active and reactive power profiles do not match.")
+
+        new_rows = slice(None)
+        if self.last_timestamp is not None:
+            new_rows = active_power_profile.index > self.last_timestamp
+        active_power_profile = active_power_profile.loc[new_rows]
+        reactive_power_profile = reactive_power_profile.loc[new_rows]
+        timestamps = active_power_profile.index
+        if len(timestamps) == 0:
+            return pd.DataFrame(
+                columns=["Max_Voltage", "Max_Voltage_Node", "Min_Voltage", "Min_Voltage_Node"],
+                index=timestamps,
+            )
+        # with the last solved timestamp, the first new interval is integrated as well
+        previous = [] if self.last_timestamp is None else [self.last_timestamp]
+        hours = interval_hours(pd.DatetimeIndex(previous).append(pd.DatetimeIndex(timestamps)))
+
+        update_data = load_profile_update(active_power_profile, reactive_power_profile)
+        assert_valid_batch_data(
+            input_data=self.input_data, update_data=update_data, calculation_type=CalculationType.power_flow
+        )
+        output_data = run_batch_power_flow(self.model, update_data, execution_config=self.execution_config)
+
+        node_voltages = output_data["node"]["u_pu"]
+        line_loadings = output_data["line"]["loading"]
+        loss_power = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])
+        times = timestamps.to_numpy()
+        self._merge_extrema("voltage", node_voltages, times)
+        self._merge_extrema("loading", line_loadings, times)
+        self._state["undervoltage_count"] += (node_voltages < self.voltage_limits[0]).sum(axis=0)
+        self._state["overvoltage_count"] += (node_voltages > self.voltage_limits[1]).sum(axis=0)
+        self._state["overloading_count"] += (line_loadings > self.loading_limit).sum(axis=0)
+        if previous:
+            loss_power = np.concatenate([self._state["last_loss_power"][np.newaxis], loss_power])
+        self._state["loss_kwh"] += interval_energy(loss_power, hours).sum(axis=0)
+        self._state["last_loss_power"] = loss_power[-1]
+        self._state["n_timestamps"] = np.array(self.n_timestamps + len(timestamps))
+        self._state["last_timestamp"] = np.array(times[-1])
+        self.save()
+
+        node_ids = output_data["node"]["id"][0]
+        return pd.DataFrame(
+            {
+                "Max_Voltage": node_voltages.max(axis=1),
+                "Max_Voltage_Node": node_ids[node_voltages.argmax(axis=1)],
+                "Min_Voltage": node_voltages.min(axis=1),
+                "Min_Voltage_Node": node_ids[node_voltages.argmin(axis=1)],
+            },
+            index=timestamps,
+        )
+
+    def save(self) -> None:
+        """Write the aggregates to the state file."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so a crash never leaves a truncated state behind
+        handle, temporary = tempfile.mkstemp(dir=self.state_path.parent, suffix=".npz")
+        with os.fdopen(handle, "wb") as fp:
+            np.savez(fp, **self._state)
+        os.replace(temporary, self.state_path)
+
+    def node_table(self) -> pd.DataFrame:
+        """
+        The running voltage aggregates.
+
+        Returns:
+            pd.DataFrame: Per Node_ID the maximum and minimum voltage with their timestamps and the number of
+                timestamps below and above the voltage limits.
+        """
+        state = self._state
+        return pd.DataFrame(
+            {
+                "Max_Voltage": state["voltage_max"],
+                "Max_Voltage_Timestamp": state["voltage_max_time"],
+                "Min_Voltage": state["voltage_min"],
+                "Min_Voltage_Timestamp": state["voltage_min_time"],
+                "Undervoltage_Count": state["undervoltage_count"],
+                "Overvoltage_Count": state["overvoltage_count"],
+            },
+            index=pd.Index(state["node_id"], name="Node_ID"),
+        )
+
+    def line_table(self) -> pd.DataFrame:
+        """
+        The running line aggregates.
+
+        Returns:
+            pd.DataFrame: Per Line_ID the energy losses in kWh, the maximum and minimum loading with their
+                timestamps and the number of timestamps above the loading limit.
+        """
+        state = self._state
+        return pd.DataFrame(
+            {
+                "Loss_kWh": state["loss_kwh"],
+                "Max_Loading": state["loading_max"],
+                "Max_Loading_Timestamp": state["loading_max_time"],
+                "Min_Loading": state["loading_min"],
+                "Min_Loading_Timestamp": state["loading_min_time"],
+                "Overloading_Count": state["overloading_count"],
+            },
+            index=pd.Index(state["line_id"], name="Line_ID"),
+        )
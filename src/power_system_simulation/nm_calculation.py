@@ -7,16 +7,31 @@
 import copy
 import json
 import time
-from datetime import datetime, timedelta
+from contextlib import ExitStack
+from functools import partial
+from itertools import repeat
 
 import numpy as np
 import pandas as pd
-from power_grid_model import CalculationMethod, CalculationType, PowerGridModel, initialize_array
-from power_grid_model.utils import json_deserialize
-from power_grid_model.validation import assert_valid_input_data
-from prettytable import PrettyTable
-
-from power_system_simulation.graph_processing import GraphProcessor as gp
+from power_grid_model import CalculationMethod, PowerGridModel
+
+from power_system_simulation.batch_data import combine_topologies
+from power_system_simulation.calculation_module import load_profile_update, read_input_data, run_grid_power_flow
+from power_system_simulation.checkpoint import Checkpoint
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+from power_system_simulation.executors import Executor, InvalidExecutorError
+from power_system_simulation.graph_processing import grid_graph_processor
+from power_system_simulation.radial_sweep import RadialSweepSolver
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.scenario_cache import ScenarioCache
+from power_system_simulation.shared_buffers import (
+    SharedArrays,
+    grid_arrays,
+    shared_input_data,
+    shared_profile,
+    worker_arrays,
+)
+from power_system_simulation.top_k import TopK
 
 
 class IDNotFoundError(Exception):
@@ -46,14 +61,85 @@ class Timer:
         print(f"Execution time for {self.name} is {(time.perf_counter() - self.start):0.6f} s")
 
 
+def _alternative_lines(lines: np.ndarray, given_lineid: int, alternative_id: int) -> np.ndarray:
+    """Copy of the line input with the given line switched off and the alternative line switched on."""
+    lines = lines.copy()
+    lines["to_status"][lines["id"] == alternative_id] = 1
+    lines["to_status"][lines["id"] == given_lineid] = 0
+    lines["from_status"][lines["id"] == given_lineid] = 0
+    return lines
+
+
+def _alternative_line_loading(
+    input_data: dict,
+    given_lineid: int,
+    alternative_id: int,
+    update_data: dict,
+    config: ExecutionConfig,
+    radial_sweep: bool = False,
+    cache: ScenarioCache = None,
+    checkpoint: Checkpoint = None,
+    model: PowerGridModel = None,
+) -> np.ndarray:
+    """Line loading per timestamp and line of one alternative, inline or in an executor worker.
+
+    Without a model, the power_grid_model of the grid is built here; with one, every alternative is solved on it.
+    """
+    if radial_sweep:
+        # the sweep needs the topology in its tree index, so every alternative gets its own solver
+        new_data = copy.copy(input_data)
+        new_data["line"] = _alternative_lines(input_data["line"], given_lineid, alternative_id)
+        model, update = RadialSweepSolver(new_data), update_data
+    else:
+        # every alternative only switches two lines: a sparse line update on top of the time series
+        new_data = input_data
+        model = model if model is not None else PowerGridModel(input_data=input_data)
+        switch = {"id": [given_lineid, alternative_id], "from_status": [0, 1], "to_status": [0, 1]}
+        update = combine_topologies(update_data, "line", [switch])
+    output_data = run_grid_power_flow(model, new_data, update, config, RunOptions(cache=cache, checkpoint=checkpoint))
+    return output_data["line"]["loading"]
+
+
+def _shared_alternative_line_loading(
+    handle: dict, given_lineid: int, alternative_id: int, config: ExecutionConfig, radial_sweep: bool = False
+) -> np.ndarray:
+    """Line loading of one alternative on an executor worker, on the input data and profiles in shared memory."""
+    arrays = worker_arrays(handle)
+    update_data = load_profile_update(shared_profile(arrays, "active"), shared_profile(arrays, "reactive"))
+    return _alternative_line_loading(
+        shared_input_data(arrays), given_lineid, alternative_id, update_data, config, radial_sweep
+    )
+
+
 def nm_function(
     given_lineid: int,
     input_data_path: str,
     metadata_path: str,
     active_power_profile_path: str,
     reactive_power_profile_path: str,
+    execution_config: ExecutionConfig = None,
+    cache: ScenarioCache = None,
+    radial_sweep: bool = False,
+    checkpoint: Checkpoint = None,
+    top_k: TopK = None,
+    executor: Executor = None,
 ) -> list[int]:
-    """module responsible for calculating the N-1 Scenarios"""
+    """module responsible for calculating the N-1 Scenarios
+
+    The batch calculations follow execution_config, or the package-level configuration when it is None.
+    With a scenario cache, alternatives that were solved before are answered from the cache.
+    With radial_sweep, every alternative is solved with the backward/forward sweep of a RadialSweepSolver,
+    which is exact for the radial alternatives, instead of the linear method of power_grid_model.
+    With a checkpoint, the scenarios are solved in chunks that are written to the checkpoint, and the chunks that
+    an interrupted run completed are loaded instead of being solved again.
+    With a top_k tracker, the line loadings of every alternative, labelled with the alternative line ID, are
+    fed to it to rank the worst (alternative, line, timestamp) cases.
+    With an executor, the alternatives are solved on its workers, which can not be combined with a cache or a
+    checkpoint. The input data and the profiles are published once in shared memory and every task only gets
+    their handle and the alternative ID, so the workers must run on this node.
+    """
+    from prettytable import PrettyTable  # pylint: disable=import-outside-toplevel
+
     #################################
     # Open data from provided paths #
     #################################
@@ -61,44 +147,13 @@ def nm_function(
     with open(metadata_path, "r", encoding="utf-8") as fp:
         meta_data = json.load(fp)
 
-    with open(input_data_path, "r", encoding="utf-8") as fp:
-        input_data = json_deserialize(fp.read())
-
-    assert_valid_input_data(input_data=input_data, calculation_type=CalculationType.power_flow)
+    input_data = read_input_data(input_data_path)
 
     active_power_profile = pd.read_parquet(active_power_profile_path)
     reactive_power_profile = pd.read_parquet(reactive_power_profile_path)
 
-    ##############################################
-    # extract input data for graph from original #
-    ##############################################
-
-    ########### ORIGINAL DATA is extracted for "graph_processing.py" call
-    vertex_ids = input_data["node"]["id"]
-    edge_ids_init = pd.DataFrame(input_data["line"]["id"]).to_numpy()
-    edge_vertex_id_pairs_init = list(zip(input_data["line"]["from_node"], input_data["line"]["to_node"]))
-    edge_enabled_init = (input_data["line"]["from_status"] == 1) & (input_data["line"]["to_status"] == 1)
-    source_id = input_data["node"][0][0]  # or meta_data
-
-    ########### MODIFIED DATA FOR TRANSFORMER AS EDGE
-
-    # Transformer must be added as edge -> add one more edge_vertex_id_pair: (0,1)
-    # one more edge enabled (True) and one more edge id (tranformer id).
-    # They can all be appended at the end of the list(s)
-    edge_ids = np.append(edge_ids_init, input_data["transformer"]["id"])
-    edge_vertex_id_pairs = (edge_vertex_id_pairs_init) + [(source_id, meta_data["lv_busbar"])]
-    edge_enabled = np.append(edge_enabled_init, [True])
-
-    ############################
-    # call GraphProcessing.py  #
-    ############################
-    gra = gp(
-        vertex_ids=vertex_ids,
-        edge_ids=edge_ids,
-        edge_vertex_id_pairs=edge_vertex_id_pairs,
-        edge_enabled=edge_enabled,
-        source_vertex_id=source_id,
-    )
+    # graph of the grid, with the transformer as edge from the source to the LV busbar
+    gra = grid_graph_processor(input_data, meta_data["lv_busbar"])
 
     ################
     #    ERRORS    #
@@ -122,44 +177,53 @@ def nm_function(
     # find alternative edge(s) for "given_lineID"
     alt_list = gra.find_alternative_edges(given_lineid)
 
+    # N-1 scenarios are solved with the linear method unless another method is configured
+    config = resolve_execution_config(execution_config)
+    config = config.replace(calculation_method=config.calculation_method or CalculationMethod.linear)
+
     # PREPARE OUTPUT TABLE
     table = PrettyTable(["Alternative ID", "Max Loading", "ID_max", "Timestamp_max"])
 
-    # for every alt edge create a copy of the input data and perform load profile
-
-    for x in alt_list:
-        # create the copy of the input data
-        new_data = copy.copy(input_data)
-        # turn on edge with ID=x and turn off edge with given_edgeID for the new_data
-        new_data["line"]["to_status"][new_data["line"]["id"] == x] = [1]
-        new_data["line"]["to_status"][new_data["line"]["id"] == given_lineid] = [0]
-        new_data["line"]["from_status"][new_data["line"]["id"] == given_lineid] = [0]
-        model = PowerGridModel(input_data=new_data)
-        # do the time series power flow
-        load_profile = initialize_array("update", "sym_load", (active_power_profile.shape))
-        load_profile["id"] = active_power_profile.columns.to_numpy()
-        load_profile["p_specified"] = active_power_profile.to_numpy()
-        load_profile["q_specified"] = reactive_power_profile.to_numpy()
-
-        update_data = {"sym_load": load_profile}
-
-        with Timer("Batch Calculation using the linear method"):
-            output_data = model.calculate_power_flow(
-                update_data=update_data, calculation_method=CalculationMethod.linear
+    line_ids = input_data["line"]["id"]
+    timestamps = active_power_profile.index
+
+    method = "radial sweep" if radial_sweep else config.calculation_method.name
+    with Timer(f"Batch Calculation using the {method} method"), ExitStack() as stack:
+        # the alternatives are solved one at a time and reduced to their line loading right away, so only the
+        # output of one alternative (per worker) is held in memory
+        if executor is None:
+            # the load profile is the same for every alternative
+            update_data = load_profile_update(active_power_profile, reactive_power_profile)
+            model = None if radial_sweep else PowerGridModel(input_data=input_data)
+            loadings = map(
+                partial(_alternative_line_loading, cache=cache, checkpoint=checkpoint, model=model),
+                repeat(input_data),
+                repeat(given_lineid),
+                alt_list,
+                repeat(update_data),
+                repeat(config),
+                repeat(radial_sweep),
             )
+        else:
+            if cache is not None or checkpoint is not None:
+                raise InvalidExecutorError("A scenario cache or checkpoint can not be shared with executor workers.")
+            profiles = {"active": active_power_profile, "reactive": reactive_power_profile}
+            shared = stack.enter_context(SharedArrays(grid_arrays(input_data, profiles)))
+            loadings = executor.map(
+                _shared_alternative_line_loading,
+                repeat(shared.handle),
+                repeat(given_lineid),
+                alt_list,
+                repeat(config),
+                repeat(radial_sweep),
+            )
+
         ######### OUTPUT TABLE
-        max_line_load = np.amax(output_data["line"]["loading"])
-        max_line_load_id = output_data["line"]["id"][output_data["line"]["loading"] == max_line_load][0]
-        timestamp_index = np.where(output_data["line"]["loading"] == max_line_load)[0][
-            0
-        ]  # this returns a number from 0 to 959
-        number_of_scenarios = np.where(output_data["line"]["loading"])[0][-1] + 1
-        date_list = [datetime(2024, 1, 1) + timedelta(minutes=i * 15) for i in range(number_of_scenarios)]
-        table.add_row([x, max_line_load, max_line_load_id, date_list[timestamp_index]])
-        ### Delete copies made for current iteration
-        del new_data
-        del output_data
-        del model
-        print(table)
+        for x, loading in zip(alt_list, loadings):
+            timestamp_index, line_index = np.unravel_index(np.argmax(loading), loading.shape)
+            table.add_row([x, loading[timestamp_index, line_index], line_ids[line_index], timestamps[timestamp_index]])
+            if top_k is not None:
+                top_k.update(loading, line_ids, timestamps, scenario=x)
+    print(table)
 
     return alt_list
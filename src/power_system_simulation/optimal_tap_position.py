@@ -8,21 +8,79 @@ Returns:
     optimal tap position of the transformer for either minimum total losses (0) or minimum voltage deviation (1)
 """
 
-from pathlib import Path
+from contextlib import ExitStack
+from itertools import repeat
 
 import numpy as np
-from power_grid_model.utils import json_deserialize, json_serialize_to_file
+import pandas as pd
+from power_grid_model import CalculationType, PowerGridModel
 
 # Load dependencies and functions from calculation_module
 from . import calculation_module as calc
+from .execution import ExecutionConfig
+from .executors import Executor, InvalidExecutorError
+from .run_options import RunOptions
+from .scenario_cache import ScenarioCache
+from .shared_buffers import SharedArrays, grid_arrays, shared_input_data, shared_profile, worker_arrays
+from .top_k import TopK, top_k_hook
 
 
 class InvalidOptimizeInput(Exception):
     """Expectation raised when user inputs invalid optimize_by value"""
 
 
+def _tap_position_power_flow(
+    input_data: dict,
+    update_data: dict,
+    timestamps: pd.Index,
+    tap_pos: int,
+    execution_config: ExecutionConfig = None,
+    top_k: TopK = None,
+    cache: ScenarioCache = None,
+) -> tuple:
+    """Total line losses and average deviation of the max node voltage at one tap position, solved on the input
+    data with only the tap position changed, and the top_k tracker fed with its line loadings.
+    """
+    input_data = dict(input_data)
+    input_data["transformer"] = input_data["transformer"].copy()
+    input_data["transformer"]["tap_pos"] = tap_pos
+
+    output_data = calc.run_grid_power_flow(
+        PowerGridModel(input_data=input_data),
+        input_data,
+        update_data,
+        execution_config,
+        RunOptions(cache=cache),
+        on_chunk=top_k_hook(top_k, timestamps, tap_pos),
+    )
+    voltage_results, line_results = calc.aggregate_power_flow_results(output_data, timestamps)
+
+    # get deviation of max node voltage
+    average_dev_max_node = ((voltage_results["Max_Voltage_Node"] - 1).abs()).mean()
+    return (line_results["Total_Loss"]).sum(), average_dev_max_node, top_k
+
+
+def _shared_tap_position_results(
+    handle: dict, tap_pos: int, execution_config: ExecutionConfig = None, top_k: TopK = None
+) -> tuple:
+    """_tap_position_power_flow on an executor worker, on the input data and profiles in shared memory."""
+    arrays = worker_arrays(handle)
+    active_power_profile = shared_profile(arrays, "active")
+    update_data = calc.load_profile_update(active_power_profile, shared_profile(arrays, "reactive"))
+    return _tap_position_power_flow(
+        shared_input_data(arrays), update_data, active_power_profile.index, tap_pos, execution_config, top_k
+    )
+
+
 def optimal_tap_position(
-    input_network_data: str, active_power_profile_path: str, reactive_power_profile_path: str, optimize_by
+    input_network_data: str,
+    active_power_profile_path: str,
+    reactive_power_profile_path: str,
+    optimize_by,
+    execution_config: ExecutionConfig = None,
+    cache: ScenarioCache = None,
+    top_k: TopK = None,
+    executor: Executor = None,
 ) -> int:
     """summary
 
@@ -31,6 +89,12 @@ def optimal_tap_position(
         active_power_profile_path
         reactive_power_profile_path
         optimize_by: based on if user wants optimal tab position based on losses (0) or voltage deviation (1)
+        execution_config: threading and solver settings for every tap position, defaults to the package-level one
+        cache: scenario cache, so tap positions solved in an earlier sweep are not solved again
+        top_k: tracker that is fed with the line loadings of every tap position, labelled with the tap position
+        executor: executor whose workers solve the tap positions, not combined with a cache. The input data and the
+            profiles are published once in shared memory and every task only gets their handle and its tap
+            position, so the workers must run on this node
 
     Raises:
         InvalidOptimizeInput: if user does not input 0 or 1 for what to optimize on
@@ -38,44 +102,62 @@ def optimal_tap_position(
     Returns:
         optimal tap position based on what user wants (0 or 1)
     """
+    from power_grid_model.validation import assert_valid_batch_data  # pylint: disable=import-outside-toplevel
+
     if optimize_by not in (0, 1):
         raise InvalidOptimizeInput("Option to optimize by is invalid, please only input 0 or 1.")
 
-    with open(input_network_data) as fp:
-        input_data = json_deserialize(fp.read())
-
-    # Make new directory to ensure original file does not change
-    input_network_data_alt = Path(input_network_data).parent / "input_network_data_alt.json"
+    input_data = calc.read_input_data(input_network_data)
+    active_power_profile, reactive_power_profile = calc.read_load_profiles(
+        active_power_profile_path, reactive_power_profile_path
+    )
+    # only the tap position changes, the load profile is the same for every tap position
+    update_data = calc.load_profile_update(active_power_profile, reactive_power_profile)
+    assert_valid_batch_data(input_data=input_data, update_data=update_data, calculation_type=CalculationType.power_flow)
 
     # Determine min and max tap position
     pos_min = np.take(input_data["transformer"]["tap_min"], 0)
     pos_max = np.take(input_data["transformer"]["tap_max"], 0)
+    tap_positions = range(pos_max, pos_min + 1)
+
+    # Cycle through all tap positions, every one feeds an empty tracker of its own that is merged here
+    trackers = [TopK(top_k.k, top_k.largest, top_k.value_name) if top_k is not None else None for _ in tap_positions]
+    if executor is not None and cache is not None:
+        raise InvalidExecutorError("A scenario cache can not be shared with executor workers.")
+    with ExitStack() as stack:
+        if executor is None:
+            results = map(
+                _tap_position_power_flow,
+                repeat(input_data),
+                repeat(update_data),
+                repeat(active_power_profile.index),
+                tap_positions,
+                repeat(execution_config),
+                trackers,
+                repeat(cache),
+            )
+        else:
+            profiles = {"active": active_power_profile, "reactive": reactive_power_profile}
+            shared = stack.enter_context(SharedArrays(grid_arrays(input_data, profiles)))
+            results = executor.map(
+                _shared_tap_position_results, repeat(shared.handle), tap_positions, repeat(execution_config), trackers
+            )
+        results = list(results)
 
-    # Cycle through all tap positions and change the current tap position
-    for tap_pos in range(pos_max, pos_min + 1):
-        input_data["transformer"]["tap_pos"] = tap_pos
-
-        # Make sure tap position is changed in the file
-        json_serialize_to_file(input_network_data_alt, input_data)
-
-        # run the power calculations
-        voltage_results, line_results = calc.calculate_power_grid(
-            input_network_data_alt, active_power_profile_path, reactive_power_profile_path
-        )
-
-        # get deviation of max node voltage
-        average_dev_max_node = ((voltage_results["Max_Voltage_Node"] - 1).abs()).mean()
+    for tap_pos, (total_losses, average_dev_max_node, tap_top_k) in zip(tap_positions, results):
+        if top_k is not None:
+            top_k.merge(tap_top_k)
 
         # If its the first iteration, set value as min
         if tap_pos == pos_max:
-            total_losses_min = (line_results["Total_Loss"]).sum()
+            total_losses_min = total_losses
             total_losses_min_tap_pos = tap_pos
             average_dev_max_node_min = average_dev_max_node
             average_dev_min_tap_pos = tap_pos
         # Check if new value is lower then already set min value
         else:
-            if total_losses_min > (line_results["Total_Loss"]).sum():
-                total_losses_min = (line_results["Total_Loss"]).sum()
+            if total_losses_min > total_losses:
+                total_losses_min = total_losses
                 total_losses_min_tap_pos = tap_pos
             if average_dev_max_node_min > average_dev_max_node:
                 average_dev_max_node_min = average_dev_max_node
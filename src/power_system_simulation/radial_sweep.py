@@ -0,0 +1,423 @@
+"""
+Radial Sweep Module
+
+This script defines a backward/forward sweep power flow for radial grids. The grid is indexed as a tree with
+the GraphProcessor, every impedance and admittance is referred to the voltage level of the source, and all
+timestamps of a batch are solved at once as a matrix: the backward sweep sums the node currents of every
+subtree and the forward sweep subtracts the voltage drops along the path from the source.
+
+The solver has the calculate_power_flow interface of power_grid_model for sym_load batch updates and returns
+the node, line and transformer output in the same format, so it can replace the PowerGridModel of a batch run.
+Unlike power_grid_model it accepts the state of a previous solution as starting point.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+from power_grid_model import initialize_array
+
+from power_system_simulation.batch_data import attribute_names, batch_size
+from power_system_simulation.graph_processing import GraphProcessor
+
+DEFAULT_SK = 1e10
+DEFAULT_RX_RATIO = 0.1
+CONST_IMPEDANCE = 1
+CONST_CURRENT = 2
+
+
+class UnsupportedGridError(Exception):
+    """Exception raised when a grid or an update contains components the radial sweep does not model."""
+
+
+class SweepNotConvergedError(Exception):
+    """Exception raised when a scenario does not converge within the maximum number of iterations."""
+
+
+def _is_na(values: np.ndarray) -> np.ndarray:
+    """Mask of the values that power_grid_model treats as not available (NaN or the minimum integer)."""
+    if np.issubdtype(values.dtype, np.floating):
+        return np.isnan(values)
+    return values == np.iinfo(values.dtype).min
+
+
+def _with_default(value: float, default: float) -> float:
+    return default if np.isnan(value) else float(value)
+
+
+def radial_graph(input_data: Dict) -> GraphProcessor:
+    """
+    Build the GraphProcessor of a power_grid_model grid with every line and transformer as an edge.
+
+    Args:
+        input_data (Dict): power_grid_model input data with a single source.
+
+    Returns:
+        GraphProcessor: Graph with the source node as source vertex. Branches are enabled when both sides
+            are connected.
+    """
+    sources = input_data["source"][input_data["source"]["status"] == 1]
+    if len(sources) != 1:
+        raise UnsupportedGridError("The radial sweep needs exactly one connected source.")
+
+    branches = [input_data[component] for component in ("line", "transformer") if component in input_data]
+    return GraphProcessor(
+        vertex_ids=input_data["node"]["id"].tolist(),
+        edge_ids=[int(edge_id) for branch in branches for edge_id in branch["id"]],
+        edge_vertex_id_pairs=[
+            (int(u), int(v)) for branch in branches for u, v in zip(branch["from_node"], branch["to_node"])
+        ],
+        edge_enabled=[bool(enabled) for branch in branches for enabled in branch["from_status"] & branch["to_status"]],
+        source_vertex_id=int(sources["node"][0]),
+    )
+
+
+class RadialSweepSolver:
+    """
+    Backward/forward sweep power flow of a radial grid.
+
+    Attributes:
+        node_ids: Node ids in the topological order of the tree index, the source node first.
+        parent: Position of the parent of every node in node_ids, -1 for the source node.
+        parent_edge: Id of the branch from every node to its parent, -1 for the source node.
+        referral: Voltage ratio of every node to the source voltage level.
+        z_referred: Series impedance of the branch to the parent of every node (the source impedance for the
+            source node), referred to the source voltage level.
+        ancestors: Sparse matrix with a one at (i, j) when node j is on the path from the source to node i.
+        load_nodes: Position in node_ids of the node of every sym_load.
+        iterations: Sweep iterations every scenario of the last calculation needed to converge.
+    """
+
+    supports_initial_state = True
+
+    def __init__(self, input_data: Dict, grid: Optional[GraphProcessor] = None, frequency: float = 50.0) -> None:
+        """
+        Index the grid and refer its impedances to the source voltage level.
+
+        Args:
+            input_data (Dict): power_grid_model input data with node, line, transformer, sym_load and source.
+            grid (GraphProcessor, optional): Radial graph of the grid, with the lines and transformers as edges
+                and the source node as source vertex. Built from input_data by default.
+            frequency (float): System frequency for the line capacitances.
+        """
+        for component in ("sym_gen", "shunt", "asym_load", "asym_gen"):
+            if component in input_data and len(input_data[component]) > 0:
+                raise UnsupportedGridError(f"The radial sweep does not model {component}.")
+
+        grid = grid if grid is not None else radial_graph(input_data)
+        order, parent, parent_edge = grid.tree_index()
+        self.input_data = input_data
+        self.node_ids = np.array(order)
+        self.parent = np.array(parent)
+        self.parent_edge = np.array(parent_edge)
+        self.iterations = np.zeros(0, dtype=np.int64)
+
+        n_nodes = len(order)
+        position = {node_id: i for i, node_id in enumerate(order)}
+        self._node_order = np.array([position[node_id] for node_id in input_data["node"]["id"]])
+        u_rated = dict(zip(input_data["node"]["id"].tolist(), input_data["node"]["u_rated"].tolist()))
+        self.u_rated = np.array([u_rated[node_id] for node_id in order], dtype=np.float64)
+
+        # source: voltage behind the source impedance, modelled as the branch into the root
+        source = input_data["source"][input_data["source"]["status"] == 1][0]
+        z_source = self.u_rated[0] ** 2 / _with_default(source["sk"], DEFAULT_SK)
+        rx_ratio = _with_default(source["rx_ratio"], DEFAULT_RX_RATIO)
+        self.e_source = (
+            _with_default(source["u_ref"], 1.0)
+            * self.u_rated[0]
+            * np.exp(1j * _with_default(source["u_ref_angle"], 0.0))
+        )
+
+        # per node: ratio, series impedance (child side) and shunt halves of the branch to its parent
+        ratio = np.ones(n_nodes)
+        z_series = np.zeros(n_nodes, dtype=np.complex128)
+        z_series[0] = z_source * (rx_ratio + 1j) / np.sqrt(1 + rx_ratio**2)
+        y_parent_end = np.zeros(n_nodes, dtype=np.complex128)
+        y_child_end = np.zeros(n_nodes, dtype=np.complex128)
+        phase_shift = np.zeros(n_nodes)
+        y_node = np.zeros(n_nodes, dtype=np.complex128)
+
+        self._branches = {}
+        for component in ("line", "transformer"):
+            if component in input_data:
+                for row, branch_id in enumerate(input_data[component]["id"].tolist()):
+                    self._branches[branch_id] = (component, row)
+
+        for child in range(1, n_nodes):
+            component, row = self._branches[parent_edge[child]]
+            branch = input_data[component][row]
+            reversed_branch = branch["from_node"] == order[child]
+            if component == "line":
+                z_series[child] = branch["r1"] + 1j * branch["x1"]
+                y_parent_end[child] = y_child_end[child] = (
+                    np.pi * frequency * branch["c1"] * (_with_default(branch["tan1"], 0.0) + 1j)
+                )
+            else:
+                k, z_lv, y_magnetizing = self._transformer_parameters(branch)
+                y_hv_end, y_lv_end = y_magnetizing / 2 / k**2, y_magnetizing / 2
+                shift = branch["clock"] * np.pi / 6
+                if reversed_branch:
+                    ratio[child], z_series[child] = 1 / k, z_lv * k**2
+                    y_parent_end[child], y_child_end[child] = y_lv_end, y_hv_end
+                    phase_shift[child] = shift
+                else:
+                    ratio[child], z_series[child] = k, z_lv
+                    y_parent_end[child], y_child_end[child] = y_hv_end, y_lv_end
+                    phase_shift[child] = -shift
+
+        # lines connected at one side only load that side with their charging admittance
+        self._one_sided = {}
+        if "line" in input_data:
+            lines = input_data["line"]
+            for line in lines[lines["from_status"] != lines["to_status"]]:
+                y_half = np.pi * frequency * line["c1"] * (_with_default(line["tan1"], 0.0) + 1j)
+                y_series = 1 / (line["r1"] + 1j * line["x1"])
+                node = line["from_node"] if line["from_status"] == 1 else line["to_node"]
+                y_charging = y_half + y_series * y_half / (y_series + y_half)
+                y_node[position[node]] += y_charging
+                self._one_sided[int(line["id"])] = (position[node], y_charging, line["from_status"] == 1)
+
+        # refer every quantity to the source voltage level, in topological order
+        self.referral = np.ones(n_nodes)
+        self.phase = np.zeros(n_nodes)
+        for child in range(1, n_nodes):
+            self.referral[child] = self.referral[parent[child]] * ratio[child]
+            self.phase[child] = self.phase[parent[child]] + phase_shift[child]
+
+        np.add.at(y_node, self.parent[1:], y_parent_end[1:])
+        y_node += y_child_end
+        self.z_referred = z_series * self.referral**2
+        self.y_referred = y_node / self.referral**2
+        self._y_parent_end = y_parent_end / self.referral[np.maximum(self.parent, 0)] ** 2
+        self._y_child_end = y_child_end / self.referral**2
+
+        # scipy is imported on first use, so the solver costs nothing to the package import time
+        from scipy import sparse  # pylint: disable=import-outside-toplevel
+
+        # ancestor matrix: row i has a one for node i and every node on its path to the source
+        rows, columns = [], []
+        for node in range(n_nodes):
+            ancestor = node
+            while ancestor >= 0:
+                rows.append(node)
+                columns.append(ancestor)
+                ancestor = parent[ancestor]
+        self.ancestors = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(n_nodes, n_nodes), dtype=np.complex128
+        )
+        self._subtree_sum = self.ancestors.T.tocsr()
+
+        loads = input_data["sym_load"]
+        self._load_ids = {load_id: row for row, load_id in enumerate(loads["id"].tolist())}
+        self.load_nodes = np.array([position[node] for node in loads["node"]], dtype=np.int64)
+        self._load_incidence = sparse.csr_matrix(
+            (np.ones(len(loads)), (np.arange(len(loads)), self.load_nodes)),
+            shape=(len(loads), n_nodes),
+            dtype=np.complex128,
+        )
+
+    def shared_path_impedance(self) -> np.ndarray:
+        """
+        Impedance of the common part of the paths from the source to every pair of nodes.
+
+        Returns:
+            np.ndarray: Complex matrix in the order of node_ids, referred to the source voltage level. A load
+                at node j drops the voltage at node i by roughly entry (i, j) times its current.
+        """
+        from scipy import sparse  # pylint: disable=import-outside-toplevel
+
+        return (self.ancestors @ sparse.diags(self.z_referred) @ self.ancestors.T).toarray()
+
+    @staticmethod
+    def _transformer_parameters(transformer: np.void) -> tuple:
+        """Voltage ratio, series impedance and magnetizing admittance on the LV side of a transformer."""
+        u1, u2 = float(transformer["u1"]), float(transformer["u2"])
+        direction = 1 if transformer["tap_max"] > transformer["tap_min"] else -1
+        tap_step = direction * (transformer["tap_pos"] - transformer["tap_nom"]) * transformer["tap_size"]
+        if transformer["tap_side"] == 0:
+            u1 += tap_step
+        else:
+            u2 += tap_step
+
+        sn = transformer["sn"]
+        z_abs = transformer["uk"] * u2**2 / sn
+        r_series = transformer["pk"] * u2**2 / sn**2
+        y_abs = transformer["i0"] * sn / u2**2
+        g_shunt = transformer["p0"] / u2**2
+        b_shunt = -np.sqrt(max(y_abs**2 - g_shunt**2, 0.0))
+        return u1 / u2, r_series + 1j * np.sqrt(z_abs**2 - r_series**2), g_shunt + 1j * b_shunt
+
+    def _load_power(self, update_data: Optional[Dict], n_scenarios: int) -> tuple:
+        """Complex power and status of every load per scenario, with the update applied to the input."""
+        loads = self.input_data["sym_load"]
+        power = np.tile(loads["p_specified"] + 1j * loads["q_specified"], (n_scenarios, 1))
+        status = np.tile(loads["status"].astype(bool), (n_scenarios, 1))
+        if update_data is None:
+            return power, status
+
+        for component in update_data:
+            if component != "sym_load":
+                raise UnsupportedGridError("The radial sweep only accepts sym_load updates.")
+        update = update_data["sym_load"]
+        names = attribute_names(update)
+        load_ids = np.reshape(update["id"], (n_scenarios, -1))[0]
+        columns = np.array([self._load_ids[load_id] for load_id in load_ids.tolist()], dtype=np.int64)
+
+        for attribute, part in (("p_specified", 1.0), ("q_specified", 1j)):
+            if attribute not in names:
+                continue
+            values = np.reshape(update[attribute], (n_scenarios, -1))
+            current = power[:, columns]
+            known = ~_is_na(values)
+            if part == 1.0:
+                power[:, columns] = np.where(known, values + 1j * current.imag, current)
+            else:
+                power[:, columns] = np.where(known, current.real + 1j * values, current)
+        if "status" in names:
+            values = np.reshape(update["status"], (n_scenarios, -1))
+            status[:, columns] = np.where(~_is_na(values), values == 1, status[:, columns])
+        return power, status
+
+    def calculate_power_flow(
+        self,
+        update_data: Optional[Dict] = None,
+        initial_state: Optional[Dict] = None,
+        error_tolerance: float = 1e-8,
+        max_iterations: int = 20,
+        **_options,
+    ) -> Dict:
+        """
+        Solve the power flow of every scenario of a batch.
+
+        Args:
+            update_data (Dict, optional): Batch update dataset of sym_load. Without it the input data is solved.
+            initial_state (Dict, optional): Output with the node u and u_angle of one scenario (e.g. the last
+                timestamp of a previous chunk) to start every scenario from, instead of a flat start.
+            error_tolerance (float): Largest voltage change in p.u. between two sweeps at convergence.
+            max_iterations (int): Number of sweeps after which SweepNotConvergedError is raised.
+            **_options: Other power_grid_model arguments (threading, calculation_method, ...), which are ignored.
+
+        Returns:
+            Dict: node, line and transformer output in the power_grid_model sym_output format, with one row
+                per scenario for a batch.
+        """
+        batch = update_data is not None
+        n_scenarios = batch_size(update_data) if batch else 1
+        power, status = self._load_power(update_data, n_scenarios)
+        power = np.where(status, power, 0)
+        load_type = self.input_data["sym_load"]["type"]
+        load_node = self.load_nodes
+
+        voltage = np.full((n_scenarios, len(self.node_ids)), self.e_source, dtype=np.complex128)
+        if initial_state is not None:
+            node_state = initial_state["node"]
+            start = np.empty(len(self.node_ids), dtype=np.complex128)
+            start[self._node_order] = node_state["u"] * np.exp(1j * node_state["u_angle"])
+            voltage[:] = start * np.exp(-1j * self.phase) * self.referral
+
+        scale = self.referral * self.u_rated
+        self.iterations = np.full(n_scenarios, -1, dtype=np.int64)
+        pending = np.arange(n_scenarios)
+        for iteration in range(1, max_iterations + 1):
+            v_pending = voltage[pending]
+            load_power = power[pending]
+            load_u_pu = np.abs(v_pending[:, load_node]) / scale[load_node]
+            load_power = np.where(load_type == CONST_IMPEDANCE, load_power * load_u_pu**2, load_power)
+            load_power = np.where(load_type == CONST_CURRENT, load_power * load_u_pu, load_power)
+
+            # backward sweep: node currents, summed over every subtree into the branch currents
+            node_current = (self._load_incidence.T @ np.conj(load_power / v_pending[:, load_node]).T).T
+            node_current += v_pending * self.y_referred
+            branch_current = (self._subtree_sum @ node_current.T).T
+
+            # forward sweep: source voltage minus the voltage drops along the path from the source
+            v_new = self.e_source - (self.ancestors @ (branch_current * self.z_referred).T).T
+
+            converged = (np.abs(v_new - v_pending) / scale).max(axis=1) < error_tolerance
+            voltage[pending] = v_new
+            self.iterations[pending[converged]] = iteration
+            pending = pending[~converged]
+            if len(pending) == 0:
+                break
+        else:
+            raise SweepNotConvergedError(
+                f"{len(pending)} scenarios did not converge within {max_iterations} iterations."
+            )
+
+        output_data = self._output(voltage, power, load_type, load_node, scale)
+        return output_data if batch else {component: array[0] for component, array in output_data.items()}
+
+    def _output(self, voltage, power, load_type, load_node, scale) -> Dict:
+        """Node, line and transformer output of the converged referred voltages."""
+        n_scenarios = voltage.shape[0]
+        load_u_pu = np.abs(voltage[:, load_node]) / scale[load_node]
+        power = np.where(load_type == CONST_IMPEDANCE, power * load_u_pu**2, power)
+        power = np.where(load_type == CONST_CURRENT, power * load_u_pu, power)
+        node_current = (self._load_incidence.T @ np.conj(power / voltage[:, load_node]).T).T
+        node_current += voltage * self.y_referred
+        branch_current = (self._subtree_sum @ node_current.T).T
+
+        output_data = {}
+        node = initialize_array("sym_output", "node", (n_scenarios, len(self.node_ids)))
+        u_actual = np.abs(voltage) / self.referral
+        node["id"] = self.input_data["node"]["id"]
+        node["energized"] = 1
+        node["u"] = u_actual[:, self._node_order]
+        node["u_pu"] = node["u"] / self.u_rated[self._node_order]
+        node["u_angle"] = np.angle(voltage * np.exp(1j * self.phase))[:, self._node_order]
+        output_data["node"] = node
+
+        # power into every tree branch at the side of its parent and at the side of its child
+        parent = np.maximum(self.parent, 0)
+        s_parent = voltage[:, parent] * np.conj(branch_current) + np.abs(voltage[:, parent]) ** 2 * np.conj(
+            self._y_parent_end
+        )
+        s_child = np.abs(voltage) ** 2 * np.conj(self._y_child_end) - voltage * np.conj(branch_current)
+        child_of_branch = {edge_id: child for child, edge_id in enumerate(self.parent_edge.tolist()) if child > 0}
+
+        for component in ("line", "transformer"):
+            if component not in self.input_data:
+                continue
+            branches = self.input_data[component]
+            result = initialize_array("sym_output", component, (n_scenarios, len(branches)))
+            result["id"] = branches["id"]
+            result["energized"] = 0
+            for name in ("loading", "p_from", "q_from", "i_from", "s_from", "p_to", "q_to", "i_to", "s_to"):
+                result[name] = 0.0
+
+            for row, branch in enumerate(branches):
+                branch_id = int(branch["id"])
+                if branch_id in child_of_branch:
+                    child = child_of_branch[branch_id]
+                    sides = [(s_parent[:, child], parent[child]), (s_child[:, child], child)]
+                    if branch["from_node"] != self.node_ids[parent[child]]:
+                        sides.reverse()
+                elif branch_id in self._one_sided:
+                    position, y_charging, from_side = self._one_sided[branch_id]
+                    charging = (u_actual[:, position] ** 2 * np.conj(y_charging), position)
+                    sides = [charging, None] if from_side else [None, charging]
+                else:
+                    continue
+
+                result["energized"][:, row] = 1
+                for side, terminal in zip(("from", "to"), sides):
+                    if terminal is None:
+                        continue
+                    power_side, position = terminal
+                    result[f"p_{side}"][:, row] = np.real(power_side)
+                    result[f"q_{side}"][:, row] = np.imag(power_side)
+                    result[f"s_{side}"][:, row] = np.abs(power_side)
+                    result[f"i_{side}"][:, row] = np.abs(power_side) / (np.sqrt(3) * u_actual[:, position])
+                if component == "line":
+                    result["loading"][:, row] = (
+                        np.maximum(result["i_from"][:, row], result["i_to"][:, row]) / branch["i_n"]
+                    )
+                else:
+                    result["loading"][:, row] = (
+                        np.maximum(result["s_from"][:, row], result["s_to"][:, row]) / branch["sn"]
+                    )
+            output_data[component] = result
+        return output_data
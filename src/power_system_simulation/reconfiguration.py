@@ -0,0 +1,197 @@
+"""
+Reconfiguration Module
+
+This script searches the radial configuration of the LV grid with the lowest energy losses. The moves are
+branch exchanges from the GraphProcessor: close a normally open line and open a line on the cycle it forms,
+so every visited configuration is radial and connected. All moves from a configuration are solved together
+as one batch power flow over the whole load profile, and the losses are summed over the profile as the
+Total_Loss of calculate_power_grid. The search is greedy (steepest descent) or, with a tabu tenure, a tabu
+search that can leave a local minimum. Configurations that were solved before are never solved again.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import json
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
+from power_grid_model import CalculationMethod, PowerGridModel
+
+from power_system_simulation.batch_data import batch_size, columnar_update, repeat_scenarios
+from power_system_simulation.calculation_module import read_input_data, read_profile_update
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+from power_system_simulation.graph_processing import grid_graph_processor
+from power_system_simulation.scenario_cache import ScenarioCache, dataset_digest
+
+
+class InvalidSearchSettingError(Exception):
+    """Exception raised when the number of iterations, the tabu tenure or the batch size is not valid."""
+
+
+def configuration_losses(output_data: Dict, n_configurations: int) -> np.ndarray:
+    """
+    Energy losses of the lines in kWh, summed over the profile, for every configuration of a batch.
+
+    Args:
+        output_data (Dict): Batch output with the timestamps of every configuration in consecutive scenarios.
+        n_configurations (int): Number of configurations in the batch.
+
+    Returns:
+        np.ndarray: Losses per configuration, computed as Total_Loss in aggregate_power_flow_results.
+    """
+    line_losses = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])
+    line_losses = line_losses.reshape(n_configurations, -1, line_losses.shape[-1])
+    return np.trapz(line_losses, axis=1).sum(axis=1) / 1000
+
+
+class _LossEvaluator:
+    """Solves the losses of configurations (sets of open lines) in batches, remembering every result."""
+
+    def __init__(self, input_data, load_update, execution_config, cache, batch_size) -> None:
+        self.model = PowerGridModel(input_data)
+        self.line_ids = input_data["line"]["id"]
+        self.load_update = load_update
+        self.config = resolve_execution_config(execution_config)
+        self.cache = cache
+        self.batch_size = batch_size
+        self.fingerprint = dataset_digest(input_data) + dataset_digest(load_update)
+        self.losses = {}
+        self.power_flows = 0
+        self.batches = 0
+
+    def _status(self, open_lines: FrozenSet[int]) -> np.ndarray:
+        # an open line is switched open at its to side, as the normally open lines of the input data
+        return np.array([[line_id not in open_lines for line_id in self.line_ids]], dtype=np.int8)
+
+    def _cache_key(self, open_lines: FrozenSet[int]) -> str:
+        settings = repr(self.config.power_flow_kwargs(CalculationMethod.newton_raphson) | {"threading": None})
+        return ScenarioCache.key(self.fingerprint, {"line": {"to_status": self._status(open_lines)}}, settings)
+
+    def evaluate(self, configurations: List[FrozenSet[int]]) -> List[float]:
+        """Losses of every configuration, solving only the ones that are not known yet."""
+        pending = []
+        for open_lines in dict.fromkeys(configurations):
+            if open_lines in self.losses:
+                continue
+            stored = self.cache.get(self._cache_key(open_lines)) if self.cache is not None else None
+            if stored is not None:
+                self.losses[open_lines] = float(stored["losses"][0])
+            else:
+                pending.append(open_lines)
+
+        n_timestamps = batch_size(self.load_update)
+        for start in range(0, len(pending), self.batch_size):
+            group = pending[start : start + self.batch_size]
+            to_status = np.repeat(np.concatenate([self._status(open_lines) for open_lines in group]), n_timestamps, 0)
+            update_data = repeat_scenarios(self.load_update, len(group))
+            update_data["line"] = columnar_update(
+                self.line_ids, from_status=np.ones_like(to_status), to_status=to_status
+            )
+            output_data = self.model.calculate_power_flow(
+                update_data=update_data,
+                output_component_types=["line"],
+                **self.config.power_flow_kwargs(CalculationMethod.newton_raphson),
+            )
+            self.power_flows += len(group) * n_timestamps
+            self.batches += 1
+            for open_lines, losses in zip(group, configuration_losses(output_data, len(group))):
+                self.losses[open_lines] = float(losses)
+                if self.cache is not None:
+                    self.cache.put(self._cache_key(open_lines), {"losses": np.array([losses])})
+
+        return [self.losses[open_lines] for open_lines in configurations]
+
+
+def optimize_reconfiguration(
+    input_network_data: str,
+    metadata_path: str,
+    active_power_profile_path: str,
+    reactive_power_profile_path: str,
+    max_iterations: int = 50,
+    tabu_tenure: int = 0,
+    batch_size: int = 16,
+    execution_config: Optional[ExecutionConfig] = None,
+    cache: Optional[ScenarioCache] = None,
+    report: Optional[Dict] = None,
+) -> tuple:
+    """
+    Find the radial configuration of the lines with the lowest losses over the load profile.
+
+    Args:
+        input_network_data (str): Path to the input network data.
+        metadata_path (str): Path to the metadata (for the LV busbar).
+        active_power_profile_path (str): Path to the active power profile.
+        reactive_power_profile_path (str): Path to the reactive power profile.
+        max_iterations (int): Maximum number of branch exchanges.
+        tabu_tenure (int): Number of iterations a line that was switched may not be switched back. With 0 the
+            search is greedy and stops at the first configuration without a better move; otherwise it takes the
+            best move that is not tabu, also when it is worse, and stops after max_iterations.
+        batch_size (int): Number of configurations per batch power flow.
+        execution_config (ExecutionConfig, optional): Threading and solver settings (Newton-Raphson by default).
+        cache (ScenarioCache, optional): If given, the losses of a configuration are looked up in and stored
+            to this cache, so repeated searches do not solve a configuration twice.
+        report (Dict, optional): If given, filled with the losses of the initial configuration, the losses per
+            iteration, the (opened, closed) line of every move and the number of configurations and power flows
+            that were solved.
+
+    Returns:
+        tuple: The sorted IDs of the open lines of the best configuration and its losses in kWh.
+    """
+    if max_iterations < 0 or tabu_tenure < 0 or batch_size < 1:
+        raise InvalidSearchSettingError("max_iterations and tabu_tenure must not be negative, batch_size positive.")
+
+    with open(metadata_path, "r", encoding="utf-8") as fp:
+        meta_data = json.load(fp)
+    input_data = read_input_data(input_network_data)
+
+    load_update, _ = read_profile_update(active_power_profile_path, reactive_power_profile_path)
+    evaluator = _LossEvaluator(input_data, load_update, execution_config, cache, batch_size)
+
+    grid = grid_graph_processor(input_data, meta_data["lv_busbar"])
+    line_ids = set(input_data["line"]["id"].tolist())
+    current = frozenset(edge_id for edge_id, enabled in zip(grid.edge_ids, grid.edge_enabled) if not enabled)
+    current_loss = evaluator.evaluate([current])[0]
+    best, best_loss = current, current_loss
+    history = [current_loss]
+    moves_made = []
+    # one (opened, closed) pair per iteration, so both lines of a move stay tabu for tabu_tenure iterations
+    tabu = deque(maxlen=tabu_tenure)
+
+    for _ in range(max_iterations):
+        # branch exchanges that only switch lines (never the transformer) and no recently switched line
+        tabu_lines = {line_id for move in tabu for line_id in move}
+        moves = [
+            (to_open, to_close)
+            for to_open, to_close in grid.branch_exchanges()
+            if to_open in line_ids and to_open not in tabu_lines and to_close not in tabu_lines
+        ]
+        if not moves:
+            break
+        configurations = [(current - {to_close}) | {to_open} for to_open, to_close in moves]
+        losses = evaluator.evaluate(configurations)
+        choice = int(np.argmin(losses))
+        if tabu_tenure == 0 and losses[choice] >= current_loss:
+            break
+
+        to_open, to_close = moves[choice]
+        grid.swap_edges(to_open, to_close)
+        tabu.append((to_open, to_close))
+        moves_made.append((to_open, to_close))
+        current, current_loss = configurations[choice], losses[choice]
+        history.append(current_loss)
+        if current_loss < best_loss:
+            best, best_loss = current, current_loss
+
+    if report is not None:
+        report["initial_loss"] = history[0]
+        report["loss_history"] = history
+        report["iterations"] = len(history) - 1
+        report["moves"] = moves_made
+        report["configurations"] = len(evaluator.losses)
+        report["power_flows"] = evaluator.power_flows
+        report["batches"] = evaluator.batches
+
+    return sorted(int(line_id) for line_id in best), best_loss
@@ -0,0 +1,84 @@
+"""
+Run Options Module
+
+This script defines the options that change how a time series batch power flow is solved, but not what is
+solved: the linear screening pass, sequential chunks, snapshot deduplication, the scenario cache and checkpoints.
+run_batch_power_flow, calculate_power_grid and ev_penetration take them as one RunOptions object, and the
+combinations that a run can not honour are rejected before anything is solved.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Dict, Optional
+
+from power_system_simulation.checkpoint import Checkpoint
+from power_system_simulation.radial_sweep import RadialSweepSolver
+from power_system_simulation.scenario_cache import ScenarioCache
+from power_system_simulation.screening import ScreeningConfig
+
+
+class InvalidRunOptionsError(Exception):
+    """Exception raised when run options, or a combination of them, are not supported."""
+
+
+class RunOptions:
+    """
+    Settings of how run_batch_power_flow solves a batch.
+
+    Attributes:
+        screening: If given, solve with a linear screening pass first and only rerun the timestamps near the
+            limits with Newton-Raphson. Not supported with a RadialSweepSolver, which ignores the method.
+        chunk_size: If given, solve the timestamps sequentially in chunks of this size.
+        count_iterations: Add the Newton-Raphson iterations (sweeps for a RadialSweepSolver) per timestamp to
+            the report, which is then required. Not supported with deduplicate, which solves fewer scenarios
+            than there are timestamps.
+        deduplicate: Solve identical load snapshots only once.
+        quantum: Quantization step in W and VAr for comparing snapshots, only with deduplicate.
+        cache: If given, the output is looked up in and stored to this cache.
+        checkpoint: If given, the run is solved sequentially (in chunks of the checkpoint unless chunk_size is
+            given), chunks completed by an earlier run are loaded and every solved chunk is written to it.
+    """
+
+    def __init__(
+        self,
+        screening: Optional[ScreeningConfig] = None,
+        chunk_size: Optional[int] = None,
+        count_iterations: bool = False,
+        deduplicate: bool = False,
+        quantum: Optional[float] = None,
+        cache: Optional[ScenarioCache] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> None:
+        if quantum is not None and not deduplicate:
+            raise InvalidRunOptionsError("quantum only applies when deduplicating snapshots.")
+        if count_iterations and deduplicate:
+            raise InvalidRunOptionsError("Iterations can not be counted per timestamp when deduplicating snapshots.")
+
+        self.screening = screening
+        self.chunk_size = chunk_size
+        self.count_iterations = count_iterations
+        self.deduplicate = deduplicate
+        self.quantum = quantum
+        self.cache = cache
+        self.checkpoint = checkpoint
+
+    def __repr__(self) -> str:
+        return f"RunOptions({', '.join(f'{name}={value!r}' for name, value in vars(self).items())})"
+
+    @property
+    def needs_fingerprint(self) -> bool:
+        """Whether the run needs the network fingerprint, for the cache or the checkpoint."""
+        return self.cache is not None or self.checkpoint is not None
+
+    def replace(self, **changes) -> "RunOptions":
+        """Return a copy of these options with the given fields changed."""
+        return RunOptions(**(vars(self) | changes))
+
+    def check(self, model: object, report: Optional[Dict]) -> None:
+        """Reject the options that a run on model, with or without a report, can not honour."""
+        if self.count_iterations and report is None:
+            raise InvalidRunOptionsError("count_iterations requires a report to add the iterations to.")
+        if self.screening is not None and isinstance(model, RadialSweepSolver):
+            raise InvalidRunOptionsError("A RadialSweepSolver ignores the calculation method and can not be screened.")
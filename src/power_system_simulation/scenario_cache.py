@@ -0,0 +1,182 @@
+"""
+Scenario Cache Module
+
+This script defines a content-addressed cache for batch power flow results. A result is stored under a key
+made from the network fingerprint (the input data), the digest of the batch update data (load profiles,
+line statuses, tap positions) and the calculation settings, so tap sweeps, N-1 runs and EV studies that
+solve the same scenario again get the stored result back.
+
+The cache has an in-memory least-recently-used tier bounded by a number of bytes and an optional on-disk
+tier of .npz files.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from power_system_simulation.batch_data import attribute_names, component_shape, is_sparse
+
+
+class InvalidCacheSizeError(Exception):
+    """Exception raised when the byte bound of the in-memory cache tier is negative."""
+
+
+def _hash_dataset(digest, dataset: Dict) -> None:
+    """Feed a PGM dataset into a hash, attribute by attribute so padding bytes are never hashed."""
+    for component in sorted(dataset, key=str):
+        component_data = dataset[component]
+        digest.update(str(component).encode())
+        if is_sparse(component_data):
+            digest.update(np.ascontiguousarray(component_data["indptr"], dtype=np.int64).tobytes())
+            component_data = component_data["data"]
+        digest.update(str(component_shape(component_data)).encode())
+        for name in attribute_names(component_data):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(component_data[name]).tobytes())
+
+
+def dataset_digest(dataset: Dict) -> str:
+    """
+    Content digest of a PGM (input or update) dataset.
+
+    Args:
+        dataset (Dict): Dataset with a structured array or a dictionary of attribute arrays per component.
+
+    Returns:
+        str: Hexadecimal sha256 digest.
+    """
+    digest = hashlib.sha256()
+    _hash_dataset(digest, dataset)
+    return digest.hexdigest()
+
+
+def _dataset_bytes(dataset: Dict) -> int:
+    return sum(array.nbytes for array in dataset.values())
+
+
+class ScenarioCache:
+    """
+    A content-addressed cache of batch power flow outputs.
+
+    Attributes:
+        max_bytes: Upper bound of the size of the outputs kept in memory.
+        directory: Directory of the on-disk tier, or None to keep results in memory only.
+        hits: Number of lookups answered from memory or disk.
+        disk_hits: Number of lookups answered from disk.
+        misses: Number of lookups that had to be calculated.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024**2, directory: Optional[str] = None) -> None:
+        if max_bytes < 0:
+            raise InvalidCacheSizeError("max_bytes must not be negative.")
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.directory is not None and self._path(key).exists())
+
+    @staticmethod
+    def key(network_fingerprint: str, update_data: Dict, settings: str = "") -> str:
+        """
+        Cache key of a batch calculation.
+
+        Args:
+            network_fingerprint (str): dataset_digest of the input data of the model.
+            update_data (Dict): Batch update dataset.
+            settings (str): Description of every setting that changes the result, e.g. the calculation method.
+
+        Returns:
+            str: Hexadecimal sha256 key.
+        """
+        digest = hashlib.sha256()
+        digest.update(network_fingerprint.encode())
+        digest.update(settings.encode())
+        _hash_dataset(digest, update_data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the stored output for key, or None (counted as a miss) if it is not cached."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # the caller gets its own arrays, the stored ones stay frozen
+            return {component: array.copy() for component, array in self._entries[key].items()}
+
+        if self.directory is not None and self._path(key).exists():
+            with np.load(self._path(key)) as stored:
+                output_data = {component: stored[component] for component in stored.files}
+            self._remember(key, output_data)
+            self.hits += 1
+            self.disk_hits += 1
+            return output_data
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, output_data: Dict) -> None:
+        """Store an output in memory (evicting the least recently used ones) and on disk, if enabled."""
+        output_data = {str(getattr(component, "value", component)): array for component, array in output_data.items()}
+        if self.directory is not None and not self._path(key).exists():
+            # write to a temporary file first, so a crash never leaves a truncated entry behind
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+            with os.fdopen(handle, "wb") as fp:
+                np.savez(fp, **output_data)
+            os.replace(temporary, self._path(key))
+        self._remember(key, output_data)
+
+    def clear(self) -> None:
+        """Empty the in-memory tier and reset the counters. The on-disk tier is kept."""
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit and miss counters and the size of the in-memory tier."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def _remember(self, key: str, output_data: Dict) -> None:
+        size = _dataset_bytes(output_data)
+        if size > self.max_bytes:
+            return
+        # a frozen copy, so the arrays of the caller stay writeable and its later edits do not reach the cache
+        output_data = {component: array.copy() for component, array in output_data.items()}
+        for array in output_data.values():
+            array.flags.writeable = False
+        if key in self._entries:
+            self._bytes -= _dataset_bytes(self._entries.pop(key))
+        self._entries[key] = output_data
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _dataset_bytes(evicted)
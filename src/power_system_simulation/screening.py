@@ -0,0 +1,157 @@
+"""
+Screening Module
+
+This script defines a two-stage power flow for long time series. A cheap linear batch is solved for every
+timestamp first. Only the timestamps whose node voltages or branch loadings come within a margin of their
+limits are solved again with Newton-Raphson, and those results replace the linear ones.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+from power_grid_model import CalculationMethod, PowerGridModel
+
+from power_system_simulation.batch_data import scatter_scenarios, select_scenarios
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+
+SCREENING_METHODS = (CalculationMethod.linear, CalculationMethod.linear_current)
+
+
+class InvalidScreeningConfigError(Exception):
+    """Exception raised when a screening setting is not valid."""
+
+
+class ScreeningConfig:
+    """
+    Settings of the linear screening pass.
+
+    Attributes:
+        voltage_margin: Distance in p.u. to the voltage limits below which a timestamp is rerun.
+        loading_margin: Distance to the loading limit below which a timestamp is rerun.
+        voltage_limits: Lower and upper node voltage limits in p.u.
+        loading_limit: Branch (line and transformer) loading limit.
+        method: Screening method, linear or linear_current.
+    """
+
+    def __init__(
+        self,
+        voltage_margin: float = 0.02,
+        loading_margin: float = 0.1,
+        voltage_limits: tuple = (0.9, 1.1),
+        loading_limit: float = 1.0,
+        method: Union[CalculationMethod, str] = CalculationMethod.linear,
+    ) -> None:
+        if voltage_margin < 0 or loading_margin < 0:
+            raise InvalidScreeningConfigError("Screening margins must not be negative.")
+        if voltage_limits[0] >= voltage_limits[1]:
+            raise InvalidScreeningConfigError("The lower voltage limit must be below the upper voltage limit.")
+        method = CalculationMethod[method] if isinstance(method, str) else CalculationMethod(method)
+        if method not in SCREENING_METHODS:
+            raise InvalidScreeningConfigError("The screening method must be linear or linear_current.")
+
+        self.voltage_margin = voltage_margin
+        self.loading_margin = loading_margin
+        self.voltage_limits = voltage_limits
+        self.loading_limit = loading_limit
+        self.method = method
+
+    def near_limit(self, output_data: Dict) -> np.ndarray:
+        """
+        Flag the scenarios of a batch output that are within the margins of the limits.
+
+        Args:
+            output_data (Dict): Batch output dataset of a power flow calculation.
+
+        Returns:
+            np.ndarray: Boolean array with one entry per scenario.
+        """
+        u_pu = output_data["node"]["u_pu"]
+        flagged = (u_pu.min(axis=1) < self.voltage_limits[0] + self.voltage_margin) | (
+            u_pu.max(axis=1) > self.voltage_limits[1] - self.voltage_margin
+        )
+        for component in ("line", "transformer"):
+            if component in output_data and output_data[component].shape[1] > 0:
+                loading = output_data[component]["loading"]
+                flagged |= loading.max(axis=1) > self.loading_limit - self.loading_margin
+        return flagged
+
+    def severity(self, output_data: Dict) -> np.ndarray:
+        """Per scenario, the largest fraction of the allowed voltage deviation or loading that is used."""
+        u_pu = output_data["node"]["u_pu"]
+        half_band = (self.voltage_limits[1] - self.voltage_limits[0]) / 2
+        centre = (self.voltage_limits[1] + self.voltage_limits[0]) / 2
+        severity = np.abs(u_pu - centre).max(axis=1) / half_band
+        for component in ("line", "transformer"):
+            if component in output_data and output_data[component].shape[1] > 0:
+                severity = np.maximum(severity, output_data[component]["loading"].max(axis=1) / self.loading_limit)
+        return severity
+
+
+def screened_power_flow(
+    model: PowerGridModel,
+    update_data: Dict,
+    screening: Optional[ScreeningConfig] = None,
+    execution_config: Optional[ExecutionConfig] = None,
+    report: Optional[Dict] = None,
+) -> Dict:
+    """
+    Solve a batch with a linear screening pass and rerun the timestamps near the limits with Newton-Raphson.
+
+    The most severe timestamp is always rerun as well, so the approximation error of the screening method
+    can be reported even when no timestamp is near the limits.
+
+    Args:
+        model (PowerGridModel): Model of the grid.
+        update_data (Dict): Dense batch update dataset, one scenario per timestamp.
+        screening (ScreeningConfig, optional): Screening margins and method. Defaults to ScreeningConfig().
+        execution_config (ExecutionConfig, optional): Threading and solver settings. The calculation method of
+            the configuration is ignored, both stages use their own method.
+        report (Dict, optional): If given, filled with the number of rerun timestamps and the largest
+            difference between the screening and Newton-Raphson results of the rerun timestamps.
+
+    Returns:
+        Dict: Batch output dataset with Newton-Raphson results for the rerun timestamps and screening
+            results for all others.
+    """
+    screening = screening or ScreeningConfig()
+    config = resolve_execution_config(execution_config)
+
+    linear_config = config.replace(calculation_method=screening.method)
+    exact_config = config.replace(calculation_method=CalculationMethod.newton_raphson)
+
+    output_data = model.calculate_power_flow(
+        update_data=update_data, **linear_config.power_flow_kwargs(screening.method)
+    )
+
+    flagged = screening.near_limit(output_data)
+    flagged[np.argmax(screening.severity(output_data))] = True
+    rerun = np.flatnonzero(flagged)
+
+    exact_output = model.calculate_power_flow(
+        update_data=select_scenarios(update_data, rerun),
+        **exact_config.power_flow_kwargs(CalculationMethod.newton_raphson),
+    )
+    approximate_output = select_scenarios(output_data, rerun)
+
+    if report is not None:
+        report["screening_method"] = screening.method.name
+        report["timestamps"] = len(flagged)
+        report["rerun_timestamps"] = len(rerun)
+        report["rerun_fraction"] = len(rerun) / len(flagged)
+        report["max_voltage_error"] = float(
+            np.abs(exact_output["node"]["u_pu"] - approximate_output["node"]["u_pu"]).max()
+        )
+        report["max_loading_error"] = max(
+            (
+                float(np.abs(exact_output[component]["loading"] - approximate_output[component]["loading"]).max())
+                for component in ("line", "transformer")
+                if component in exact_output and exact_output[component].shape[1] > 0
+            ),
+            default=0.0,
+        )
+
+    return scatter_scenarios(output_data, rerun, exact_output)
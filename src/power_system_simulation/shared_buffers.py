@@ -0,0 +1,190 @@
+"""
+Shared Buffers Module
+
+This script defines a shared-memory layer for multi-process studies. The profile matrices and the deserialized
+power_grid_model input arrays are published once in multiprocessing.shared_memory segments by the parent
+process. Every worker of a process pool attaches to them by name and gets read-only numpy views on the same
+memory, so nothing is pickled per worker or per task and the memory stays flat as the number of workers grows.
+
+The publisher owns the segments: they are unlinked when it is closed (or used as a context manager), when it is
+garbage collected and, if the parent dies, by the resource tracker of multiprocessing. Workers have to be
+started by multiprocessing (e.g. a ProcessPoolExecutor of the publishing process), so they share its
+resource tracker. Workers of other executors (e.g. a ThreadExecutor or the local workers of a SocketExecutor)
+attach on their first task instead, with the handle that is passed along with the task.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import threading
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+INPUT_PREFIX = "input/"
+PROFILE_PREFIX = "profile/"
+
+
+class SharedBufferError(Exception):
+    """Exception raised when an array cannot be shared or a worker is not attached to shared buffers."""
+
+
+def _release(segments: List[shared_memory.SharedMemory]) -> None:
+    for segment in segments:
+        segment.close()
+        segment.unlink()
+
+
+class SharedArrays:
+    """
+    Named numpy arrays published once in shared memory.
+
+    Attributes:
+        handle: Picklable description (segment name, shape and dtype per array) that workers attach with.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        segments = []
+        self.handle = {}
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                if array.dtype.hasobject:
+                    raise SharedBufferError(f"{name} holds Python objects, which cannot be shared.")
+                # a segment cannot be empty
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+                self.handle[name] = (segment.name, array.shape, array.dtype)
+        except BaseException:
+            _release(segments)
+            raise
+        self.nbytes = sum(segment.size for segment in segments)
+        self._finalizer = weakref.finalize(self, _release, segments)
+
+    def close(self) -> None:
+        """Unlink the shared memory. Workers must not use the arrays afterwards."""
+        _detach_worker(self.handle)
+        self._finalizer()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AttachedArrays:
+    """
+    Read-only views on the arrays of a SharedArrays publisher, in a worker process.
+
+    Attributes:
+        handle: The handle of the publisher.
+        arrays: The views by name. They are invalid after close.
+    """
+
+    def __init__(self, handle: Dict[str, tuple]) -> None:
+        self.handle = handle
+        self._segments = []
+        self.arrays = {}
+        for name, (segment_name, shape, dtype) in handle.items():
+            segment = shared_memory.SharedMemory(name=segment_name)
+            self._segments.append(segment)
+            view = np.ndarray(shape, dtype, buffer=segment.buf)
+            view.flags.writeable = False
+            self.arrays[name] = view
+
+    def close(self) -> None:
+        """Detach from the shared memory (the publisher unlinks it)."""
+        self.arrays = {}
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                # a view is still used elsewhere, the mapping is released with the last view
+                pass
+        self._segments = []
+
+    def __enter__(self) -> "AttachedArrays":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_WORKER_ARRAYS: Optional[AttachedArrays] = None
+_WORKER_LOCK = threading.Lock()
+
+
+def attach_worker(handle: Dict[str, tuple]) -> None:
+    """Process pool initializer: attach this worker to the shared arrays of handle once, for all its tasks."""
+    global _WORKER_ARRAYS  # pylint: disable=global-statement
+    with _WORKER_LOCK:
+        _WORKER_ARRAYS = AttachedArrays(handle)
+
+
+def _detach_worker(handle: Dict[str, tuple]) -> None:
+    global _WORKER_ARRAYS  # pylint: disable=global-statement
+    with _WORKER_LOCK:
+        if _WORKER_ARRAYS is not None and _WORKER_ARRAYS.handle == handle:
+            _WORKER_ARRAYS.close()
+            _WORKER_ARRAYS = None
+
+
+def worker_arrays(handle: Optional[Dict[str, tuple]] = None) -> Dict[str, np.ndarray]:
+    """
+    The shared arrays of this worker, see attach_worker.
+
+    With a handle, a worker that is not attached to it attaches now and keeps the arrays for its next tasks
+    with the same handle, so tasks of any executor on this node only need the handle.
+    """
+    global _WORKER_ARRAYS  # pylint: disable=global-statement
+    with _WORKER_LOCK:
+        if handle is not None and (_WORKER_ARRAYS is None or _WORKER_ARRAYS.handle != handle):
+            if _WORKER_ARRAYS is not None:
+                # the arrays of an earlier study; views that are still in use keep their mapping
+                _WORKER_ARRAYS.close()
+            _WORKER_ARRAYS = AttachedArrays(handle)
+        if _WORKER_ARRAYS is None:
+            raise SharedBufferError("This process is not attached to shared arrays, use attach_worker as initializer.")
+        return _WORKER_ARRAYS.arrays
+
+
+def grid_arrays(input_data: Dict, profiles: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Flatten the input data of a grid and its profiles into named arrays for SharedArrays.
+
+    Args:
+        input_data (Dict): Deserialized power_grid_model input data.
+        profiles (Dict[str, pd.DataFrame]): Profiles by name (e.g. active, reactive, ev), timestamps as index and
+            IDs as columns.
+
+    Returns:
+        Dict[str, np.ndarray]: The input arrays and the values, timestamps and IDs of every profile.
+    """
+    arrays = {INPUT_PREFIX + component: data for component, data in input_data.items()}
+    for name, profile in profiles.items():
+        arrays[f"{PROFILE_PREFIX}{name}/values"] = profile.to_numpy(dtype=np.float64)
+        arrays[f"{PROFILE_PREFIX}{name}/timestamps"] = profile.index.to_numpy()
+        # IDs in an object index (e.g. EV profile numbers) become a plain integer or string array
+        arrays[f"{PROFILE_PREFIX}{name}/ids"] = np.array(profile.columns.tolist())
+    return arrays
+
+
+def shared_input_data(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """The power_grid_model input data in arrays from grid_arrays."""
+    return {name[len(INPUT_PREFIX) :]: array for name, array in arrays.items() if name.startswith(INPUT_PREFIX)}
+
+
+def shared_profile(arrays: Dict[str, np.ndarray], name: str) -> pd.DataFrame:
+    """A profile in arrays from grid_arrays, as a DataFrame on the shared values (not a copy)."""
+    return pd.DataFrame(
+        arrays[f"{PROFILE_PREFIX}{name}/values"],
+        index=pd.Index(arrays[f"{PROFILE_PREFIX}{name}/timestamps"], name="Timestamp"),
+        columns=arrays[f"{PROFILE_PREFIX}{name}/ids"],
+        copy=False,
+    )
@@ -0,0 +1,128 @@
+"""
+Studies Module
+
+This script defines the studies that the command line tool and the fleet runner run on a grid package
+directory with the standard files (input_network_data.json, meta_data.json and the parquet profiles): one
+study is one command (powerflow, n1, ev, tap or validate) with its options on one grid, and gives its result
+tables by name.
+
+The study modules (and with them power_grid_model, pandas and networkx) are only imported when a study runs,
+so the command line tool can import this module without them.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from pathlib import Path
+from typing import Dict
+
+import power_system_simulation as pss
+
+INPUT_NETWORK_DATA = "input_network_data.json"
+META_DATA = "meta_data.json"
+ACTIVE_POWER_PROFILE = "active_power_profile.parquet"
+REACTIVE_POWER_PROFILE = "reactive_power_profile.parquet"
+EV_ACTIVE_POWER_PROFILE = "ev_active_power_profile.parquet"
+
+
+class GridPackageError(Exception):
+    """Exception raised when a grid package directory misses one of the files a study needs."""
+
+
+def _grid_file(grid_dir: Path, name: str) -> str:
+    path = grid_dir / name
+    if not path.is_file():
+        raise GridPackageError(f"{grid_dir} has no {name}.")
+    return str(path)
+
+
+def run_study(command: str, grid_dir: Path, options: Dict) -> Dict:
+    """
+    Run one study on one grid package.
+
+    Args:
+        command (str): Subcommand: powerflow, n1, ev, tap or validate.
+        grid_dir (Path): Grid package directory.
+        options (Dict): Study options: threads, chunk_size, compact, k, top_k, percentage, seed and optimize_by.
+
+    Returns:
+        Dict: Result tables (DataFrames) by name.
+    """
+    config = None if options.get("threads") is None else pss.ExecutionConfig(threading=options["threads"])
+
+    if command == "powerflow":
+        voltage_df, line_df = pss.calculate_power_grid(
+            _grid_file(grid_dir, INPUT_NETWORK_DATA),
+            _grid_file(grid_dir, ACTIVE_POWER_PROFILE),
+            _grid_file(grid_dir, REACTIVE_POWER_PROFILE),
+            execution_config=config,
+            options=pss.RunOptions(chunk_size=options.get("chunk_size")),
+            compact=options.get("compact", False),
+        )
+        return {"voltage": voltage_df, "line": line_df}
+
+    if command == "n1":
+        worst_cases = pss.nk_contingency_analysis(
+            _grid_file(grid_dir, INPUT_NETWORK_DATA),
+            _grid_file(grid_dir, META_DATA),
+            _grid_file(grid_dir, ACTIVE_POWER_PROFILE),
+            _grid_file(grid_dir, REACTIVE_POWER_PROFILE),
+            k=options.get("k", 1),
+            top_k=options.get("top_k", 10),
+            execution_config=config,
+        )
+        # tuples of line IDs are stored as lists
+        for column in ("Outage_IDs", "Restoration_IDs"):
+            worst_cases[column] = worst_cases[column].map(list)
+        return {"worst_cases": worst_cases}
+
+    if command == "ev":
+        voltage_df, line_df = pss.ev_penetration.ev_penetration(
+            _grid_file(grid_dir, INPUT_NETWORK_DATA),
+            _grid_file(grid_dir, META_DATA),
+            _grid_file(grid_dir, ACTIVE_POWER_PROFILE),
+            _grid_file(grid_dir, EV_ACTIVE_POWER_PROFILE),
+            options["percentage"],
+            options["seed"],
+            execution_config=config,
+            options=pss.RunOptions(chunk_size=options.get("chunk_size")),
+            compact=options.get("compact", False),
+        )
+        return {"voltage": voltage_df, "line": line_df}
+
+    if command == "tap":
+        optimize_by = options.get("optimize_by", "losses")
+        tap_pos = pss.optimal_tap_position.optimal_tap_position(
+            _grid_file(grid_dir, INPUT_NETWORK_DATA),
+            _grid_file(grid_dir, ACTIVE_POWER_PROFILE),
+            _grid_file(grid_dir, REACTIVE_POWER_PROFILE),
+            0 if optimize_by == "losses" else 1,
+            execution_config=config,
+        )
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        return {"tap": pd.DataFrame({"Optimize_By": [optimize_by], "Tap_Position": [int(tap_pos)]})}
+
+    if command == "validate":
+        pss.validate_power_system_simulation.validate_power_system_simulation(
+            _grid_file(grid_dir, INPUT_NETWORK_DATA),
+            _grid_file(grid_dir, META_DATA),
+            _grid_file(grid_dir, EV_ACTIVE_POWER_PROFILE),
+        )
+        return {}
+
+    raise ValueError(f"Unknown command: {command}")
+
+
+def study_name(command: str, options: Dict) -> str:
+    """Name of a study in the result file names, e.g. powerflow or ev_p50_seed1."""
+    if command == "ev":
+        return f"ev_p{options['percentage']:g}_seed{options['seed']}"
+    return command
+
+
+def error_summary(error: Exception) -> str:
+    """Type and first line of an error. The first line is enough, validation errors list every failing scenario."""
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0]}" if lines else type(error).__name__
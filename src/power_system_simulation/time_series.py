@@ -0,0 +1,169 @@
+"""
+Time Series Module
+
+This script defines the sequential time series mode: a long batch is split into chunks of consecutive
+timestamps that are solved in timestamp order, instead of as one batch. It also provides an instrumentation
+function that counts the Newton-Raphson iterations every timestamp needs to converge.
+
+power_grid_model does not accept initial node voltages (the node input has no u_pu or u_angle attribute and
+Newton-Raphson is initialised internally from a linear solve), so chunks solved with power_grid_model cannot
+be seeded from the previous solution. A solver that can be warm-started receives the final state of the
+previous chunk through the initial_state argument of its solve function.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+from power_grid_model import CalculationMethod, PowerGridModel
+
+from power_system_simulation.batch_data import batch_size, select_scenarios
+from power_system_simulation.checkpoint import CheckpointRun
+from power_system_simulation.execution import ExecutionConfig, resolve_execution_config
+
+
+class InvalidChunkSizeError(Exception):
+    """Exception raised when the chunk size of a sequential run is not a positive integer."""
+
+
+def count_newton_raphson_iterations(
+    model: PowerGridModel,
+    update_data: Dict,
+    execution_config: Optional[ExecutionConfig] = None,
+) -> np.ndarray:
+    """
+    Count the Newton-Raphson iterations every scenario of a batch needs to converge.
+
+    The batch is solved again with an iteration limit of 1, 2, ... up to max_iterations, each time only for the
+    scenarios that did not converge yet. A scenario that needs n iterations is solved n times, so the cost is
+    up to max_iterations extra batch calculations (the sum of the iteration counts of all scenarios instead of
+    one batch). It is meant for instrumentation, not for production runs.
+
+    Args:
+        model (PowerGridModel): Model of the grid.
+        update_data (Dict): Dense batch update dataset.
+        execution_config (ExecutionConfig, optional): Threading and tolerance settings. Its max_iterations is
+            the largest count that is tried.
+
+    Returns:
+        np.ndarray: Iterations per scenario, -1 for scenarios that did not converge.
+    """
+    config = resolve_execution_config(execution_config)
+    iterations = np.full(batch_size(update_data), -1)
+    pending = np.arange(len(iterations))
+
+    for max_iterations in range(1, config.max_iterations + 1):
+        model.calculate_power_flow(
+            update_data=select_scenarios(update_data, pending),
+            continue_on_batch_error=True,
+            output_component_types=["node"],
+            **config.replace(max_iterations=max_iterations).power_flow_kwargs(CalculationMethod.newton_raphson),
+        )
+        failed = model.batch_error.failed_scenarios if model.batch_error is not None else np.array([], dtype=int)
+        converged = np.ones(len(pending), dtype=bool)
+        converged[failed] = False
+        iterations[pending[converged]] = max_iterations
+        pending = pending[~converged]
+        if len(pending) == 0:
+            break
+
+    return iterations
+
+
+def chain_hooks(*hooks: Optional[Callable[[Dict], None]]) -> Optional[Callable[[Dict], None]]:
+    """
+    Combine on_chunk callbacks into one.
+
+    Args:
+        *hooks (Callable, optional): Callbacks, None for the ones that are not used.
+
+    Returns:
+        Callable: Callback that calls every given callback in order, or None if none is given.
+    """
+    hooks = [hook for hook in hooks if hook is not None]
+    if not hooks:
+        return None
+    if len(hooks) == 1:
+        return hooks[0]
+
+    def on_chunk(output_data: Dict) -> None:
+        for hook in hooks:
+            hook(output_data)
+
+    return on_chunk
+
+
+def sequential_power_flow(
+    update_data: Dict,
+    chunk_size: int,
+    solve: Callable[[Dict, Optional[Dict]], Dict],
+    report: Optional[Dict] = None,
+    iteration_counter: Optional[Callable[[Dict], np.ndarray]] = None,
+    on_chunk: Optional[Callable[[Dict], None]] = None,
+    checkpoint: Optional[CheckpointRun] = None,
+) -> Dict:
+    """
+    Solve a time series batch chunk by chunk in timestamp order.
+
+    Args:
+        update_data (Dict): Dense batch update dataset, one scenario per timestamp in timestamp order.
+        chunk_size (int): Number of consecutive timestamps per chunk.
+        solve (Callable): Called as solve(chunk_update_data, initial_state) for every chunk and returns the
+            batch output of the chunk. initial_state is None for the first chunk and the output of the last
+            timestamp of the previous chunk afterwards.
+        report (Dict, optional): If given, filled with the number of chunks, the solve time per solved chunk
+            and, with a checkpoint, the number of chunks loaded from it.
+        iteration_counter (Callable, optional): Called as iteration_counter(chunk_update_data) to count the
+            Newton-Raphson iterations of every timestamp, which are added to the report.
+        on_chunk (Callable, optional): Called with the batch output of every chunk as soon as it is solved, in
+            timestamp order, e.g. ViolationTracker.update.
+        checkpoint (CheckpointRun, optional): If given, completed chunks are loaded from it instead of being
+            solved and every solved chunk is written to it.
+
+    Returns:
+        Dict: Batch output dataset of all timestamps.
+    """
+    if not isinstance(chunk_size, (int, np.integer)) or chunk_size < 1:
+        raise InvalidChunkSizeError("chunk_size must be a positive integer.")
+
+    n_scenarios = batch_size(update_data)
+    outputs = []
+    chunk_seconds = []
+    iterations = []
+    initial_state = None
+
+    resumed = 0
+    for index, start in enumerate(range(0, n_scenarios, chunk_size)):
+        if checkpoint is not None and index in checkpoint.completed:
+            chunk_output, chunk_iterations = checkpoint.load(index)
+            resumed += 1
+        else:
+            chunk = select_scenarios(update_data, np.arange(start, min(start + chunk_size, n_scenarios)))
+            chunk_start = time.perf_counter()
+            chunk_output = solve(chunk, initial_state)
+            chunk_seconds.append(time.perf_counter() - chunk_start)
+            chunk_iterations = iteration_counter(chunk) if iteration_counter is not None else None
+            if checkpoint is not None:
+                checkpoint.save(index, chunk_output, chunk_iterations)
+        if iteration_counter is not None:
+            iterations.append(chunk_iterations)
+        if on_chunk is not None:
+            on_chunk(chunk_output)
+        outputs.append(chunk_output)
+        initial_state = {component: array[-1] for component, array in chunk_output.items()}
+
+    if report is not None:
+        report["chunks"] = len(outputs)
+        report["chunk_size"] = chunk_size
+        report["chunk_seconds"] = chunk_seconds
+        if checkpoint is not None:
+            report["resumed_chunks"] = resumed
+        if iteration_counter is not None:
+            report["newton_raphson_iterations"] = np.concatenate(iterations)
+            report["mean_newton_raphson_iterations"] = float(np.mean(report["newton_raphson_iterations"]))
+
+    return {component: np.concatenate([output[component] for output in outputs]) for component in outputs[0]}
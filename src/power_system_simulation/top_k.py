@@ -0,0 +1,167 @@
+"""
+Top-k Module
+
+This script defines the bounded-memory tracking of the k worst cases of a study, e.g. the k highest line
+loadings over every (line, timestamp, scenario) of an N-1, EV or tap study. The output is fed chunk by chunk
+(per scenario, per sequential chunk or per worker): the k worst candidates of a chunk are selected with
+np.argpartition and merged into a heap of the k worst so far, so the tracker never holds more than k cases and
+no full output has to be kept. Trackers of different workers are merged the same way.
+
+Ties are ranked in the order the cases were fed, within a chunk by timestamp and then by component, as
+np.argmax does.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+import heapq
+from typing import Callable, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class InvalidTopKError(Exception):
+    """Exception raised when k is not a positive integer or trackers of different kinds are merged."""
+
+
+class TopK:
+    """
+    The k worst cases fed so far.
+
+    Attributes:
+        k: Number of cases that are kept.
+        largest: Keep the largest values (e.g. loadings) or the smallest (e.g. voltages).
+        value_name: Name of the value column of the ranked table.
+    """
+
+    def __init__(self, k: int, largest: bool = True, value_name: str = "Loading") -> None:
+        if not isinstance(k, (int, np.integer)) or k < 1:
+            raise InvalidTopKError("k must be a positive integer.")
+        self.k = int(k)
+        self.largest = largest
+        self.value_name = value_name
+        # min-heap of (key, -order, scenario, id, timestamp) with key = value, or -value for the smallest values:
+        # its root is the case that is dropped first, and on equal keys the one fed last
+        self._heap = []
+        self._order = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, key: float, scenario: Hashable, component_id, timestamp) -> None:
+        entry = (key, -self._order, scenario, component_id, timestamp)
+        self._order += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def update(
+        self,
+        values: np.ndarray,
+        ids: Sequence,
+        timestamps: Sequence,
+        scenario: Optional[Hashable] = None,
+    ) -> "TopK":
+        """
+        Feed the values of a chunk.
+
+        Args:
+            values (np.ndarray): Values per timestamp (rows) and component (columns).
+            ids (Sequence): Component IDs of the columns.
+            timestamps (Sequence): Timestamps of the rows.
+            scenario (Hashable, optional): Label of the scenario of the chunk, e.g. the alternative line, the EV
+                seed or the tap position.
+
+        Returns:
+            TopK: This tracker.
+        """
+        keys = np.asarray(values, dtype=np.float64).ravel()
+        if not self.largest:
+            keys = -keys
+        candidates = np.arange(len(keys))
+        if len(keys) > self.k:
+            candidates = np.argpartition(keys, len(keys) - self.k)[len(keys) - self.k :]
+            # argpartition picks any of the values equal to the k-th, take the first ones instead
+            threshold = keys[candidates].min()
+            above = candidates[keys[candidates] > threshold]
+            candidates = np.concatenate([above, np.flatnonzero(keys == threshold)[: self.k - len(above)]])
+        if len(self._heap) == self.k:
+            # only candidates that beat the current k-th case can enter
+            candidates = candidates[keys[candidates] > self._heap[0][0]]
+        n_columns = np.shape(values)[1]
+        for index in np.sort(candidates):
+            row, column = divmod(int(index), n_columns)
+            self._push(float(keys[index]), scenario, ids[column], timestamps[row])
+        return self
+
+    def merge(self, other: "TopK") -> "TopK":
+        """
+        Merge the cases of another tracker, e.g. of a worker process. Its cases rank after equal cases of this one.
+
+        Args:
+            other (TopK): Tracker with the same k and direction.
+
+        Returns:
+            TopK: This tracker.
+        """
+        if other.k != self.k or other.largest != self.largest:
+            raise InvalidTopKError("Only trackers with the same k and direction can be merged.")
+        # pylint: disable-next=protected-access
+        for key, _, scenario, component_id, timestamp in sorted(other._heap, key=lambda entry: -entry[1]):
+            self._push(key, scenario, component_id, timestamp)
+        return self
+
+    def ranked(self) -> pd.DataFrame:
+        """
+        The cases kept, worst first.
+
+        Returns:
+            pd.DataFrame: Rank (from 1), scenario, component ID, timestamp and value of every case.
+        """
+        entries = sorted(self._heap, reverse=True)
+        values = [key if self.largest else -key for key, *_ in entries]
+        return pd.DataFrame(
+            {
+                "Scenario": [entry[2] for entry in entries],
+                "ID": [entry[3] for entry in entries],
+                "Timestamp": [entry[4] for entry in entries],
+                self.value_name: values,
+            },
+            index=pd.RangeIndex(1, len(entries) + 1, name="Rank"),
+        )
+
+
+def top_k_hook(
+    tracker: Optional[TopK],
+    timestamps: Sequence,
+    scenario: Optional[Hashable] = None,
+    component: str = "line",
+    attribute: str = "loading",
+) -> Optional[Callable[[Dict], None]]:
+    """
+    The on_chunk callback of run_batch_power_flow that feeds a tracker.
+
+    Args:
+        tracker (TopK, optional): Tracker to feed.
+        timestamps (Sequence): Timestamps of the scenarios of the run, in order.
+        scenario (Hashable, optional): Scenario label of the run.
+        component (str): Component of the values, e.g. line or node.
+        attribute (str): Attribute of the values, e.g. loading or u_pu.
+
+    Returns:
+        Callable: Callback that feeds the chunks in order, or None without a tracker.
+    """
+    if tracker is None:
+        return None
+    offset = 0
+
+    def update(output_data: Dict) -> None:
+        nonlocal offset
+        values = output_data[component][attribute]
+        tracker.update(values, output_data[component]["id"][0], timestamps[offset : offset + len(values)], scenario)
+        offset += len(values)
+
+    return update
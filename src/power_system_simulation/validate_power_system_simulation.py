@@ -30,7 +30,6 @@ import numpy as np
 import pandas as pd
 from power_grid_model import CalculationType
 from power_grid_model.utils import json_deserialize
-from power_grid_model.validation import assert_valid_input_data
 
 from power_system_simulation import graph_processing as graph
 
@@ -147,6 +146,8 @@ class validate_power_system_simulation:
                 raise TransformerAndFeedersNotConnected("not all feeders are connected to the transformer")
 
         # validate data for PGM
+        from power_grid_model.validation import assert_valid_input_data  # pylint: disable=import-outside-toplevel
+
         assert_valid_input_data(input_data=input_data, calculation_type=CalculationType.power_flow)
 
         ##########The graphprocessor can now be called to check that no exceptions are called##########
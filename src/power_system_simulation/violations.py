@@ -0,0 +1,246 @@
+"""
+Violations Module
+
+This script defines the limit-violation event index of a time series batch output. Node voltages outside the
+voltage band (undervoltage and overvoltage) and line and transformer loadings above the loading limit
+(overloading) are run-length encoded per component with numpy, without a Python loop over timestamps or
+components, into a compact event table with the component, its ID, the violation, the first and last
+timestamp, the duration in timestamps and the peak (lowest voltage for undervoltage, highest value otherwise).
+
+A ViolationTracker can be fed the output chunk by chunk, e.g. by the sequential (chunked) time series mode:
+events that are still open at the end of a chunk are carried over and merged with their continuation in the
+next chunk, so the events are the same as for the whole output at once.
+
+Authors: Rick Eversdijk, Luka Nielsen, Carmelo Vella, David van Warmerdam, Codrin Dănculea
+Date: 19/10/2026
+
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+EVENT_COLUMNS = ["Component", "ID", "Violation", "Start", "End", "Duration", "Peak"]
+
+# (component, attribute, violation, peak reduction) of every event series
+SERIES = (
+    ("node", "u_pu", "undervoltage", np.minimum),
+    ("node", "u_pu", "overvoltage", np.maximum),
+    ("line", "loading", "overloading", np.maximum),
+    ("transformer", "loading", "overloading", np.maximum),
+)
+
+
+class InvalidLimitError(Exception):
+    """Exception raised when the voltage band is empty or the loading limit is not positive."""
+
+
+def run_length_events(mask: np.ndarray, values: np.ndarray, reduce: np.ufunc) -> tuple:
+    """
+    Run-length encode the True runs of every column of a mask.
+
+    Args:
+        mask (np.ndarray): Boolean array of shape (timestamps, components).
+        values (np.ndarray): Values of the same shape, reduced over every run.
+        reduce (np.ufunc): Reduction of the values of a run, e.g. np.maximum.
+
+    Returns:
+        tuple: Column, start row, end row (exclusive) and reduced value of every run, ordered by column and start.
+    """
+    n_rows = mask.shape[0]
+    # +1 where a run starts and -1 one row after it ends, per column
+    steps = np.diff(mask.T.astype(np.int8), axis=1, prepend=0, append=0)
+    columns, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    if len(starts) == 0:
+        return columns, starts, ends, np.empty(0, dtype=values.dtype)
+
+    # reduce every [start, end) of the column-major values; the odd slots reduce the gaps and are dropped
+    flat = np.append(values.T.ravel(), values.flat[0])
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = columns * n_rows + starts
+    bounds[1::2] = columns * n_rows + ends
+    return columns, starts, ends, reduce.reduceat(flat, bounds)[0::2]
+
+
+class ViolationTracker:
+    """
+    Limit-violation events of a time series output that is fed in timestamp order, in one or more chunks.
+
+    Attributes:
+        voltage_limits: Lower and upper node voltage limits in p.u.
+        loading_limit: Line and transformer loading limit.
+        timestamps: Timestamps of all scenarios. Events report row positions when None.
+        n_timestamps: Number of timestamps fed so far.
+    """
+
+    def __init__(
+        self,
+        timestamps: Optional[pd.Index] = None,
+        voltage_limits: tuple = (0.9, 1.1),
+        loading_limit: float = 1.0,
+    ) -> None:
+        if voltage_limits[0] >= voltage_limits[1]:
+            raise InvalidLimitError("The lower voltage limit must be below the upper voltage limit.")
+        if loading_limit <= 0:
+            raise InvalidLimitError("The loading limit must be positive.")
+        self.voltage_limits = voltage_limits
+        self.loading_limit = loading_limit
+        self.timestamps = timestamps
+        self.n_timestamps = 0
+        self._ids = {}
+        # per series: closed events as (columns, starts, ends, peaks) arrays and the open start and peak per column
+        self._closed = {}
+        self._open = {}
+
+    def _mask(self, violation: str, values: np.ndarray) -> np.ndarray:
+        if violation == "undervoltage":
+            return values < self.voltage_limits[0]
+        if violation == "overvoltage":
+            return values > self.voltage_limits[1]
+        return values > self.loading_limit
+
+    def update(self, output_data: Dict) -> "ViolationTracker":
+        """
+        Add the next timestamps of the output.
+
+        Args:
+            output_data (Dict): Batch output dataset of the next chunk of timestamps.
+
+        Returns:
+            ViolationTracker: This tracker.
+        """
+        offset = self.n_timestamps
+        n_rows = None
+        for component, attribute, violation, reduce in SERIES:
+            if component not in output_data:
+                continue
+            values = output_data[component][attribute]
+            n_rows = len(values)
+            key = (component, violation)
+            self._ids.setdefault(component, output_data[component]["id"][0])
+            open_start, open_peak = self._open.get(key, (np.full(values.shape[1], -1), np.zeros(values.shape[1])))
+            mask = self._mask(violation, values)
+            columns, starts, ends, peaks = run_length_events(mask, values, reduce)
+
+            # open events of the previous chunk continue in runs that start at the first row or end there
+            carried = open_start[columns] >= 0
+            continued = carried & (starts == 0)
+            peaks[continued] = reduce(peaks[continued], open_peak[columns[continued]])
+            starts = starts + offset
+            starts[continued] = open_start[columns[continued]]
+            ends = ends + offset
+            ended = np.flatnonzero((open_start >= 0) & ~mask[0]) if n_rows else np.empty(0, dtype=np.int64)
+
+            # runs that reach the end of the chunk stay open
+            still_open = ends == offset + n_rows
+            new_start = np.full_like(open_start, -1)
+            new_peak = np.zeros_like(open_peak)
+            new_start[columns[still_open]] = starts[still_open]
+            new_peak[columns[still_open]] = peaks[still_open]
+            self._open[key] = (new_start, new_peak)
+
+            done = ~still_open
+            self._closed.setdefault(key, []).append(
+                (
+                    np.concatenate([ended, columns[done]]),
+                    np.concatenate([open_start[ended], starts[done]]),
+                    np.concatenate([np.full(len(ended), offset), ends[done]]),
+                    np.concatenate([open_peak[ended], peaks[done]]),
+                )
+            )
+        if n_rows is not None:
+            self.n_timestamps += n_rows
+        return self
+
+    def events(self) -> pd.DataFrame:
+        """
+        The event table of the timestamps fed so far. Events that are still open end at the last timestamp.
+
+        Returns:
+            pd.DataFrame: One row per event with the component type, ID, violation, first and last timestamp
+                (or row position), duration in timestamps and peak, ordered by start.
+        """
+        parts = []
+        for (component, violation), closed in self._closed.items():
+            open_start, open_peak = self._open[(component, violation)]
+            still_open = np.flatnonzero(open_start >= 0)
+            columns, starts, ends, peaks = (
+                np.concatenate(arrays)
+                for arrays in zip(
+                    *closed,
+                    (
+                        still_open,
+                        open_start[still_open],
+                        np.full(len(still_open), self.n_timestamps),
+                        open_peak[still_open],
+                    ),
+                )
+            )
+            if len(columns) == 0:
+                continue
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "Component": component,
+                        "ID": self._ids[component][columns],
+                        "Violation": violation,
+                        "Start": starts,
+                        "End": ends - 1,
+                        "Duration": ends - starts,
+                        "Peak": peaks,
+                    }
+                )
+            )
+        if not parts:
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+
+        events = pd.concat(parts, ignore_index=True).sort_values(["Start", "Component", "ID"], kind="stable")
+        events = events.reset_index(drop=True)
+        for column in ("Component", "Violation"):
+            events[column] = events[column].astype("category")
+        if self.timestamps is not None:
+            events["Start"] = self.timestamps[events["Start"].to_numpy()]
+            events["End"] = self.timestamps[events["End"].to_numpy()]
+        return events[EVENT_COLUMNS]
+
+
+def violation_events(
+    output_data: Dict,
+    timestamps: Optional[pd.Index] = None,
+    voltage_limits: tuple = (0.9, 1.1),
+    loading_limit: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Index the limit violations of a time series batch output.
+
+    Args:
+        output_data (Dict): Batch output dataset, one scenario per timestamp, with node and line (and optionally
+            transformer) output.
+        timestamps (pd.Index, optional): Timestamps of the scenarios. Events report row positions when None.
+        voltage_limits (tuple): Lower and upper node voltage limits in p.u.
+        loading_limit (float): Line and transformer loading limit.
+
+    Returns:
+        pd.DataFrame: The event table, see ViolationTracker.events.
+    """
+    return ViolationTracker(timestamps, voltage_limits, loading_limit).update(output_data).events()
+
+
+def violation_hook(tracker: Optional[ViolationTracker], timestamps: pd.Index) -> Optional[Callable[[Dict], None]]:
+    """
+    The on_chunk callback of run_batch_power_flow that feeds a tracker.
+
+    Args:
+        tracker (ViolationTracker, optional): Tracker to feed. Without timestamps, it gets those of the run.
+        timestamps (pd.Index): Timestamps of the scenarios of the run.
+
+    Returns:
+        Callable: tracker.update, or None without a tracker.
+    """
+    if tracker is None:
+        return None
+    if tracker.timestamps is None:
+        tracker.timestamps = timestamps
+    return tracker.update
@@ -20,3 +20,16 @@ def test_nm_scenario_class():
     assert nm_file.nm_function(
         18, input_network_path, metadata_path, active_power_profile_path, reactive_power_profile_path
     ) == [24]
+
+
+@pytest.mark.parametrize("radial_sweep, method", [(False, "linear"), (True, "radial sweep")])
+def test_nm_timer_names_the_method(capsys, radial_sweep, method):
+    nm_file.nm_function(
+        18,
+        input_network_path,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        radial_sweep=radial_sweep,
+    )
+    assert f"Batch Calculation using the {method} method" in capsys.readouterr().out
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import initialize_array
+
+from power_system_simulation.aggregation import (
+    InvalidResolutionError,
+    InvalidTimestampsError,
+    line_energy_losses,
+    rollup_power_flow_results,
+)
+from power_system_simulation.calculation_module import calculate_power_grid
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+
+def random_output(timestamps: pd.Index, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    node = initialize_array("sym_output", "node", (len(timestamps), 5))
+    node["id"] = np.arange(5)
+    node["u_pu"] = rng.uniform(0.9, 1.1, node.shape)
+    line = initialize_array("sym_output", "line", (len(timestamps), 3))
+    line["id"] = [10, 11, 12]
+    line["loading"] = rng.uniform(0, 1.2, line.shape)
+    line["p_from"] = rng.uniform(1000, 2000, line.shape)
+    line["p_to"] = -line["p_from"] + rng.uniform(0, 50, line.shape)
+    return {"node": node, "line": line}
+
+
+def irregular_timestamps(n_timestamps: int, seed: int = 0) -> pd.DatetimeIndex:
+    minutes = np.random.default_rng(seed).integers(1, 180, n_timestamps).cumsum()
+    return pd.DatetimeIndex(pd.Timestamp("2025-01-30 20:00") + pd.to_timedelta(minutes, unit="min"), name="Timestamp")
+
+
+def test_losses_use_timestamp_spacing():
+    timestamps = irregular_timestamps(500)
+    output_data = random_output(timestamps)
+    losses = np.abs(output_data["line"]["p_from"] + output_data["line"]["p_to"])
+    hours = (timestamps - timestamps[0]) / pd.Timedelta(hours=1)
+    expected = np.trapz(losses, x=hours.to_numpy(), axis=0) / 1000
+    np.testing.assert_allclose(line_energy_losses(output_data, timestamps), expected)
+
+
+@pytest.mark.parametrize("resolution, freq", [("hourly", "h"), ("daily", "D"), ("monthly", "MS")])
+def test_rollups_match_resample(resolution, freq):
+    timestamps = irregular_timestamps(1000)
+    output_data = random_output(timestamps)
+    voltage_df, line_df = rollup_power_flow_results(output_data, timestamps)[resolution]
+
+    voltages = pd.DataFrame(output_data["node"]["u_pu"], index=timestamps)
+    expected_voltage = pd.DataFrame(
+        {
+            "Max_Voltage": voltages.max(axis=1).resample(freq).max(),
+            "Mean_Voltage": voltages.mean(axis=1).resample(freq).mean(),
+            "Min_Voltage": voltages.min(axis=1).resample(freq).min(),
+        }
+    ).dropna()
+    np.testing.assert_allclose(voltage_df.to_numpy(), expected_voltage.to_numpy())
+    assert (voltage_df.index == expected_voltage.index).all()
+
+    loadings = pd.DataFrame(output_data["line"]["loading"], index=timestamps, columns=[10, 11, 12])
+    resampled = loadings.resample(freq)
+    for name, expected in (("Max", resampled.max()), ("Mean", resampled.mean()), ("Min", resampled.min())):
+        np.testing.assert_allclose(line_df[f"{name}_Loading"].unstack().to_numpy(), expected.dropna().to_numpy())
+
+    # every interval is counted once, in the period it starts in
+    np.testing.assert_allclose(
+        line_df["Loss_kWh"].groupby(level="Line_ID").sum(), line_energy_losses(output_data, timestamps)
+    )
+
+
+def test_calculate_power_grid_rollups():
+    rollups = {}
+    _, line_df = calculate_power_grid(
+        DATA_EXCEPTION_SET / "input_network_data.json",
+        DATA_EXCEPTION_SET / "active_power_profile.parquet",
+        DATA_EXCEPTION_SET / "reactive_power_profile.parquet",
+        rollups=rollups,
+    )
+    assert set(rollups) == {"hourly", "daily", "monthly"}
+    hourly_voltage, hourly_line = rollups["hourly"]
+    assert len(hourly_voltage) == 960 // 4
+    assert hourly_line.index.names == ["Period", "Line_ID"]
+    # Total_Loss integrates the 15 minute profile with one hour per timestamp
+    monthly_losses = rollups["monthly"][1]["Loss_kWh"].droplevel("Period")
+    np.testing.assert_allclose(monthly_losses, line_df["Total_Loss"] / 4)
+
+
+def test_invalid_rollups():
+    timestamps = irregular_timestamps(10)
+    output_data = random_output(timestamps)
+    assert list(rollup_power_flow_results(output_data, timestamps, ["daily"])) == ["daily"]
+    with pytest.raises(InvalidResolutionError):
+        rollup_power_flow_results(output_data, timestamps, ["weekly"])
+    with pytest.raises(InvalidTimestampsError):
+        rollup_power_flow_results(output_data, timestamps[::-1])
+    with pytest.raises(InvalidTimestampsError):
+        rollup_power_flow_results(output_data, timestamps[:5])
@@ -0,0 +1,99 @@
+import copy
+from pathlib import Path
+
+import numpy as np
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.batch_data import (
+    BatchSizeMismatchError,
+    batch_size,
+    columnar_update,
+    combine_topologies,
+    is_broadcast,
+    repeat_scenarios,
+    scatter_scenarios,
+    select_scenarios,
+    sparse_update,
+)
+from power_system_simulation.calculation_module import read_profile_update
+
+DATA_EXCEPTION_SET = Path(__file__).parent / "data" / "Exception_test_data"
+
+load_update = initialize_array("update", "sym_load", (4, 2))
+load_update["id"] = [1, 2]
+load_update["p_specified"] = np.arange(8).reshape(4, 2)
+line_update = initialize_array("update", "line", (3, 1))
+
+
+def test_batch_size():
+    assert batch_size({"sym_load": load_update}) == 4
+
+
+def test_BatchSizeMismatchError():
+    with pytest.raises(BatchSizeMismatchError):
+        batch_size({"sym_load": load_update, "line": line_update})
+
+
+def test_select_and_scatter_scenarios():
+    selected = select_scenarios({"sym_load": load_update}, np.array([3, 1]))
+    np.testing.assert_array_equal(selected["sym_load"]["p_specified"], [[6, 7], [2, 3]])
+
+    target = {"sym_load": load_update.copy()}
+    target["sym_load"]["p_specified"] = 0
+    scatter_scenarios(target, np.array([3, 1]), selected)
+    np.testing.assert_array_equal(target["sym_load"]["p_specified"], [[0, 0], [2, 3], [0, 0], [6, 7]])
+
+
+def test_columnar_update():
+    columnar = {"sym_load": columnar_update([1, 2], p_specified=np.arange(8.0).reshape(4, 2))}
+    assert batch_size(columnar) == 4
+    assert columnar["sym_load"]["id"].shape == (4, 2) and is_broadcast(columnar["sym_load"]["id"])
+
+    # the IDs stay a broadcast view when scenarios are selected or repeated
+    selected = select_scenarios(columnar, np.array([3, 1]))
+    assert is_broadcast(selected["sym_load"]["id"])
+    np.testing.assert_array_equal(selected["sym_load"]["id"], [[1, 2], [1, 2]])
+    np.testing.assert_array_equal(selected["sym_load"]["p_specified"], load_update["p_specified"][[3, 1]])
+    repeated = repeat_scenarios(columnar, 3)
+    assert batch_size(repeated) == 12 and is_broadcast(repeated["sym_load"]["id"])
+    np.testing.assert_array_equal(repeated["sym_load"]["p_specified"][8:], columnar["sym_load"]["p_specified"])
+
+
+def test_sparse_update():
+    sparse = {"line": sparse_update("line", [{"id": [4, 5], "to_status": [0, 1]}, {}, {"id": [6], "to_status": [1]}])}
+    np.testing.assert_array_equal(sparse["line"]["indptr"], [0, 2, 2, 3])
+    assert sparse["line"]["data"]["to_status"].dtype == np.int8
+    assert batch_size(sparse) == 3
+
+    selected = select_scenarios(sparse, np.array([2, 1, 0, 2]))
+    np.testing.assert_array_equal(selected["line"]["indptr"], [0, 1, 1, 3, 4])
+    np.testing.assert_array_equal(selected["line"]["data"]["id"], [6, 4, 5, 6])
+
+    # a time series of 4 scenarios combined with the 3 topologies
+    combined = combine_topologies({"sym_load": load_update}, "line", [{}, {"id": [4]}, {}])
+    assert batch_size(combined) == 12
+    np.testing.assert_array_equal(combined["line"]["indptr"], [0] * 5 + [1, 2, 3, 4] + [4] * 4)
+    np.testing.assert_array_equal(combined["sym_load"]["p_specified"][8:], load_update["p_specified"])
+
+
+# The sparse topology changes give the same power flow as a model rebuilt per topology
+def test_combine_topologies_power_flow():
+    with open(DATA_EXCEPTION_SET / "input_network_data.json", "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    update_data, _ = read_profile_update(
+        DATA_EXCEPTION_SET / "active_power_profile.parquet", DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+    )
+    switches = [{}, {"id": [18, 24], "from_status": [0, 1], "to_status": [0, 1]}]
+    output_data = PowerGridModel(input_data).calculate_power_flow(
+        update_data=combine_topologies(update_data, "line", switches)
+    )
+
+    switched = copy.deepcopy(input_data)
+    switched["line"]["from_status"][switched["line"]["id"] == 18] = 0
+    switched["line"]["to_status"][switched["line"]["id"] == 18] = 0
+    switched["line"]["to_status"][switched["line"]["id"] == 24] = 1
+    for i, data in enumerate([input_data, switched]):
+        expected = PowerGridModel(data).calculate_power_flow(update_data=update_data)
+        np.testing.assert_allclose(output_data["line"]["loading"][i * 960 : (i + 1) * 960], expected["line"]["loading"])
@@ -1,6 +1,8 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 from power_grid_model import CalculationMethod, CalculationType, PowerGridModel, initialize_array, validation
 from power_grid_model.utils import json_deserialize, json_serialize_to_file
@@ -10,6 +12,11 @@ from power_system_simulation.calculation_module import (
     LoadIdsDoNotMatchError,
     TimestampsDoNotMatchError,
     calculate_power_grid,
+    fill_from_profile,
+    load_profile_update,
+    profile_ids,
+    read_load_profiles,
+    read_profile_update,
 )
 
 DATA_PATH = Path(__file__).parent / "data"
@@ -102,6 +109,36 @@ def test_calculate_power_grid():
     pd.testing.assert_frame_equal(line_results, check_table_line)
 
 
+# Compact and Arrow tables hold the same results
+def test_calculate_power_grid_compact_and_arrow(tmp_path):
+    voltage_results, line_results = calculate_power_grid(
+        input_network_data, active_power_profile_path, reactive_power_profile_path, compact=True
+    )
+    assert voltage_results["Max_Voltage"].dtype == np.float32
+    assert line_results["Max_Loading"].dtype == np.float32
+    assert line_results.index.dtype == np.int32
+    assert isinstance(line_results["Max_Loading_Timestamp"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        voltage_results, check_table_voltage.astype({"Max_Voltage": np.float32, "Min_Voltage": np.float32})
+    )
+    timestamps = {"Max_Loading_Timestamp": "datetime64[ns]", "Min_Loading_Timestamp": "datetime64[ns]"}
+    pd.testing.assert_frame_equal(
+        line_results.astype(timestamps | {"Max_Loading": np.float64, "Min_Loading": np.float64}),
+        check_table_line,
+        rtol=1e-6,
+    )
+
+    voltage_table, line_table = calculate_power_grid(
+        input_network_data, active_power_profile_path, reactive_power_profile_path, compact=True, arrow=True
+    )
+    assert str(line_table.schema.field("Max_Loading_Timestamp").type).startswith("dictionary<values=timestamp")
+    pq.write_table(line_table, tmp_path / "line.parquet")
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "line.parquet").set_index("Line_ID"), line_results.astype(timestamps)
+    )
+    pd.testing.assert_frame_equal(voltage_table.to_pandas().set_index("Timestamp"), voltage_results)
+
+
 # Output should not match the correct output due to changed load
 def test2_calculate_power_grid():
     voltage_results, line_results = calculate_power_grid(
@@ -117,3 +154,28 @@ def test2_calculate_power_grid():
 def test_ValidationException():
     with pytest.raises(ValidationException):
         calculate_power_grid(incorrect_network, active_power_profile_path, reactive_power_profile_path)
+
+
+# The streamed update dataset is the same as the one built from DataFrames
+def test_read_profile_update():
+    update_data, timestamps = read_profile_update(active_power_profile_path, reactive_power_profile_path)
+    expected = load_profile_update(*read_load_profiles(active_power_profile_path, reactive_power_profile_path))
+    for name in ("id", "p_specified", "q_specified"):
+        np.testing.assert_array_equal(update_data["sym_load"][name], expected["sym_load"][name])
+    assert timestamps.equals(pd.read_parquet(active_power_profile_path).index)
+
+    # a selection of loads, with a second profile added on top
+    load_ids = profile_ids(active_power_profile_path)[::-2]
+    update_data, _ = read_profile_update(active_power_profile_path, load_ids=load_ids)
+    fill_from_profile(update_data["sym_load"]["p_specified"], reactive_power_profile_path, load_ids, add=True)
+    np.testing.assert_array_equal(update_data["sym_load"]["id"][0], load_ids)
+    np.testing.assert_allclose(
+        update_data["sym_load"]["p_specified"],
+        expected["sym_load"]["p_specified"][:, ::-2] + expected["sym_load"]["q_specified"][:, ::-2],
+    )
+    assert "q_specified" not in update_data["sym_load"]
+
+    with pytest.raises(TimestampsDoNotMatchError):
+        read_profile_update(modified_timestamp_active_power_profile_path, reactive_power_profile_path)
+    with pytest.raises(LoadIdsDoNotMatchError):
+        read_profile_update(active_power_profile_path, modified_id_reactive_power_profile_path)
@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel
+from power_grid_model.utils import json_deserialize
+
+import power_system_simulation.ev_penetration as EV
+import power_system_simulation.nm_calculation as nm_file
+from power_system_simulation.calculation_module import (
+    MissingNetworkFingerprintError,
+    calculate_power_grid,
+    read_profile_update,
+    run_batch_power_flow,
+)
+from power_system_simulation.checkpoint import MANIFEST, Checkpoint, InvalidCheckpointError
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.scenario_cache import dataset_digest
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+active_power_profile = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+
+class Crash(Exception):
+    """Raised to interrupt a run."""
+
+
+def crash_after(n_chunks: int):
+    chunks = []
+
+    def on_chunk(_output_data):
+        chunks.append(None)
+        if len(chunks) == n_chunks:
+            raise Crash()
+
+    return on_chunk
+
+
+def test_calculate_power_grid_resumes(tmp_path):
+    expected_voltage_df, expected_line_df = calculate_power_grid(
+        input_network, active_power_profile, reactive_power_profile
+    )
+
+    # interrupt the run after 3 of 10 chunks
+    with open(input_network, "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    update_data, _ = read_profile_update(active_power_profile, reactive_power_profile)
+    checkpoint = Checkpoint(tmp_path / "checkpoint", chunk_size=96)
+    with pytest.raises(Crash):
+        run_batch_power_flow(
+            PowerGridModel(input_data),
+            update_data,
+            options=RunOptions(checkpoint=checkpoint),
+            network_fingerprint=dataset_digest(input_data),
+            on_chunk=crash_after(3),
+        )
+    assert list(checkpoint.progress().values()) == [(3, 10)]
+
+    # a new process resumes from the manifest and only solves the other chunks
+    report = {}
+    checkpoint = Checkpoint(tmp_path / "checkpoint", chunk_size=96)
+    voltage_df, line_df = calculate_power_grid(
+        input_network,
+        active_power_profile,
+        reactive_power_profile,
+        options=RunOptions(checkpoint=checkpoint),
+        report=report,
+    )
+    assert report["resumed_chunks"] == 3
+    assert len(report["chunk_seconds"]) == 7
+    assert list(checkpoint.progress().values()) == [(10, 10)]
+    pd.testing.assert_frame_equal(voltage_df, expected_voltage_df)
+    pd.testing.assert_frame_equal(line_df, expected_line_df)
+
+    # another chunk size is another run
+    report = {}
+    calculate_power_grid(
+        input_network,
+        active_power_profile,
+        reactive_power_profile,
+        options=RunOptions(chunk_size=480, checkpoint=checkpoint),
+        report=report,
+    )
+    assert report["resumed_chunks"] == 0
+    assert sorted(checkpoint.progress().values()) == [(2, 2), (10, 10)]
+
+    with open(tmp_path / "checkpoint" / MANIFEST, "r", encoding="utf-8") as fp:
+        assert len(json.load(fp)["runs"]) == 2
+    checkpoint.clear()
+    assert checkpoint.progress() == {}
+    assert list((tmp_path / "checkpoint").iterdir()) == []
+
+
+def test_nm_function_and_ev_penetration_resume(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint", chunk_size=200)
+    for _ in range(2):
+        assert nm_file.nm_function(
+            18, input_network, metadata, active_power_profile, reactive_power_profile, checkpoint=checkpoint
+        ) == [24]
+    # the alternative of line 18 and every timestamp in chunks of 200 scenarios
+    assert list(checkpoint.progress().values()) == [(5, 5)]
+
+    expected = EV.ev_penetration(input_network, metadata, active_power_profile, ev_active_power_profile, 50, 1)
+    report = {}
+    for _ in range(2):
+        voltage_df, line_df = EV.ev_penetration(
+            input_network,
+            metadata,
+            active_power_profile,
+            ev_active_power_profile,
+            50,
+            1,
+            options=RunOptions(checkpoint=checkpoint),
+            report=report,
+        )
+        pd.testing.assert_frame_equal(voltage_df, expected[0])
+        pd.testing.assert_frame_equal(line_df, expected[1])
+    assert report["resumed_chunks"] == 5
+
+
+def test_invalid_checkpoint(tmp_path):
+    with pytest.raises(InvalidCheckpointError):
+        Checkpoint(tmp_path, chunk_size=0)
+    update_data, _ = read_profile_update(active_power_profile, reactive_power_profile)
+    with open(input_network, "r", encoding="utf-8") as fp:
+        model = PowerGridModel(json_deserialize(fp.read()))
+    with pytest.raises(MissingNetworkFingerprintError):
+        run_batch_power_flow(model, update_data, options=RunOptions(checkpoint=Checkpoint(tmp_path)))
@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.cli import main
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+
+def test_powerflow_writes_tables(tmp_path, capsys):
+    assert main(["powerflow", str(DATA_EXCEPTION_SET), "--threads", "2", "--output", str(tmp_path)]) == 0
+    assert "1 studies" in capsys.readouterr().out
+
+    voltage_df, line_df = calculate_power_grid(
+        DATA_EXCEPTION_SET / "input_network_data.json",
+        DATA_EXCEPTION_SET / "active_power_profile.parquet",
+        DATA_EXCEPTION_SET / "reactive_power_profile.parquet",
+    )
+    output = tmp_path / DATA_EXCEPTION_SET.name
+    pd.testing.assert_frame_equal(pd.read_parquet(output / "powerflow_voltage.parquet"), voltage_df)
+    pd.testing.assert_frame_equal(pd.read_parquet(output / "powerflow_line.parquet"), line_df)
+
+
+def test_ev_studies_on_workers(tmp_path, capsys):
+    exit_code = main(
+        ["ev", str(DATA_EXCEPTION_SET), "--percentage", "50", "--seed", "1", "2", "--workers", "2"]
+        + ["--chunk-size", "100", "--compact", "--output", str(tmp_path)]
+    )
+    assert exit_code == 0
+    assert "2 studies" in capsys.readouterr().out
+    output = tmp_path / DATA_EXCEPTION_SET.name
+    assert pd.read_parquet(output / "ev_p50_seed1_line.parquet")["Max_Loading"].dtype == "float32"
+    assert sorted(path.name for path in output.iterdir()) == [
+        "ev_p50_seed1_line.parquet",
+        "ev_p50_seed1_voltage.parquet",
+        "ev_p50_seed2_line.parquet",
+        "ev_p50_seed2_voltage.parquet",
+    ]
+
+
+def test_n1_and_tap(tmp_path):
+    assert main(["n1", str(DATA_EXCEPTION_SET), "--top-k", "3", "--output", str(tmp_path)]) == 0
+    worst_cases = pd.read_parquet(tmp_path / DATA_EXCEPTION_SET.name / "n1_worst_cases.parquet")
+    assert len(worst_cases) <= 3
+    assert worst_cases["Max_Loading"].is_monotonic_decreasing
+
+    grid = tmp_path / "grid"
+    shutil.copytree(DATA_EXCEPTION_SET, grid)
+    assert main(["tap", str(grid), "--optimize-by", "voltage", "--output", str(tmp_path)]) == 0
+    assert list(pd.read_parquet(tmp_path / "grid" / "tap_tap.parquet")["Optimize_By"]) == ["voltage"]
+
+
+def test_validate_reports_failures(tmp_path, capsys):
+    grid = tmp_path / "grid"
+    shutil.copytree(DATA_EXCEPTION_SET, grid)
+    shutil.copy(DATA_EXCEPTION_SET / "meta_data_source.json", grid / "meta_data.json")
+
+    assert main(["validate", str(DATA_EXCEPTION_SET)]) == 0
+    assert main(["validate", str(DATA_EXCEPTION_SET), str(grid), str(tmp_path / "missing")]) == 1
+    out = capsys.readouterr().out
+    assert "TooManySources" in out
+    assert "GridPackageError" in out
+
+
+def test_studies_on_socket_workers(tmp_path, capsys):
+    grid = tmp_path / "grid"
+    shutil.copytree(DATA_EXCEPTION_SET, grid)
+    exit_code = main(["validate", str(DATA_EXCEPTION_SET), str(grid), "--executor", "socket", "--workers", "2"])
+    assert exit_code == 0
+    assert "2 studies" in capsys.readouterr().out
+
+
+def test_invalid_arguments():
+    with pytest.raises(SystemExit):
+        main(["ev", str(DATA_EXCEPTION_SET)])
+    with pytest.raises(SystemExit):
+        main(["powerflow", str(DATA_EXCEPTION_SET), "--workers", "0"])
+    with pytest.raises(SystemExit):
+        main(["powerflow", str(DATA_EXCEPTION_SET), "--executor", "socket", "--listen", "6000"])
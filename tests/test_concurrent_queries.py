@@ -0,0 +1,73 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+
+from power_system_simulation.graph_processing import GraphProcessor
+
+vertex_ids = [0, 2, 4, 6, 10]
+edge_ids = [1, 3, 5, 7, 8, 9]
+edge_vertex_id_pairs = [(0, 2), (0, 4), (0, 6), (2, 4), (4, 6), (2, 10)]
+edge_enabled = [True, True, True, False, False, True]
+source_vertex_id = 10
+
+
+def random_grid(n_vertices, n_open, seed):
+    """A random tree rooted at vertex 0 with n_open extra disabled edges."""
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(vertex), vertex) for vertex in range(1, n_vertices)]
+    while len(pairs) < n_vertices - 1 + n_open:
+        u, v = rng.sample(range(n_vertices), 2)
+        if (u, v) not in pairs and (v, u) not in pairs:
+            pairs.append((u, v))
+    enabled = [True] * (n_vertices - 1) + [False] * n_open
+    return GraphProcessor(list(range(n_vertices)), list(range(1000, 1000 + len(pairs))), pairs, enabled, 0)
+
+
+def expected_downstream(grid, edge_id):
+    """Downstream vertices from the connected components of a copy of the graph without the edge."""
+    graph = grid.graph.copy()
+    graph.remove_edge(*grid.edge_vertex_id_pairs[grid.edge_ids.index(edge_id)])
+    return sorted(set(graph.nodes) - nx.node_connected_component(graph, grid.source_vertex_id))
+
+
+def expected_alternatives(grid, edge_id):
+    """Disabled edges that connect a copy of the graph without the edge again."""
+    graph = grid.graph.copy()
+    graph.remove_edge(*grid.edge_vertex_id_pairs[grid.edge_ids.index(edge_id)])
+    alternatives = []
+    for other_id, pair, enabled in zip(grid.edge_ids, grid.edge_vertex_id_pairs, grid.edge_enabled):
+        if not enabled:
+            graph.add_edge(*pair)
+            if nx.is_connected(graph):
+                alternatives.append(other_id)
+            graph.remove_edge(*pair)
+    return alternatives
+
+
+def test_queries_do_not_change_graph():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    edges = dict(grid.graph.edges.items())
+    for edge_id in edge_ids:
+        grid.find_downstream_vertices(edge_id)
+    grid.find_alternative_edges(3)
+    assert dict(grid.graph.edges.items()) == edges
+    assert grid.graph.edges[0, 4]["id"] == 3
+
+
+def test_concurrent_queries():
+    grid = random_grid(200, 20, 5)
+    enabled_edges = [edge_id for edge_id, enabled in zip(grid.edge_ids, grid.edge_enabled) if enabled]
+    downstream_of = {edge_id: expected_downstream(grid, edge_id) for edge_id in enabled_edges}
+    alternatives_of = {edge_id: expected_alternatives(grid, edge_id) for edge_id in enabled_edges}
+
+    # many threads query the same processor at the same time
+    queries = enabled_edges * 10
+    random.Random(1).shuffle(queries)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        downstream = list(pool.map(grid.find_downstream_vertices, queries))
+        alternatives = list(pool.map(grid.find_alternative_edges, queries))
+
+    assert downstream == [downstream_of[edge_id] for edge_id in queries]
+    assert alternatives == [alternatives_of[edge_id] for edge_id in queries]
+    assert all("id" in data for _, _, data in grid.graph.edges(data=True))
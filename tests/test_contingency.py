@@ -0,0 +1,144 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import initialize_array
+from power_grid_model.utils import json_deserialize, json_serialize_to_file
+
+from power_system_simulation.contingency import (
+    InvalidOutageOrderError,
+    LineIDNotValidError,
+    TooManyScenariosError,
+    enumerate_contingencies,
+    nk_contingency_analysis,
+)
+from power_system_simulation.graph_processing import grid_graph_processor
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+metadata_path = DATA_EXCEPTION_SET / "meta_data.json"
+input_network_path = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+
+with open(input_network_path, "r", encoding="utf-8") as fp:
+    input_data = json_deserialize(fp.read())
+
+
+@pytest.fixture(name="meshed_network")
+def fixture_meshed_network(tmp_path):
+    """The test grid with two extra normally open lines (3-5 and 7-9)."""
+    extra = initialize_array("input", "line", 2)
+    extra[:] = input_data["line"][-1]
+    extra["id"] = [25, 26]
+    extra["from_node"] = [3, 7]
+    extra["to_node"] = [5, 9]
+    extra["to_status"] = 0
+    data = dict(input_data)
+    data["line"] = np.concatenate([input_data["line"], extra])
+    path = tmp_path / "input_network_data.json"
+    json_serialize_to_file(path, data)
+    return path
+
+
+def test_enumerate_contingencies():
+    grid = grid_graph_processor(input_data, 1)
+    topologies, islanded = enumerate_contingencies(grid, [18, 22], 1)
+    assert islanded == 0
+    assert topologies == {frozenset({18}): [((18,), (24,))], frozenset({22}): [((22,), (24,))]}
+
+    # with a single normally open line, every N-2 outage islands part of the grid
+    topologies, islanded = enumerate_contingencies(grid, [16, 17, 18], 2)
+    assert (topologies, islanded) == ({}, 3)
+
+
+def test_enumeration_stops_at_the_cap():
+    grid = grid_graph_processor(input_data, 1)
+    outages = []
+    find_alternative_edge_sets = grid.find_alternative_edge_sets
+
+    def counting(disabled):
+        outages.append(disabled)
+        return find_alternative_edge_sets(disabled)
+
+    grid.find_alternative_edge_sets = counting
+    with pytest.raises(TooManyScenariosError):
+        enumerate_contingencies(grid, [18, 20, 22], 1, max_scenarios=1)
+    # the last outage is never enumerated
+    assert outages == [[18], [20]]
+
+
+def test_n1_matches_single_outage():
+    report = {}
+    worst_cases = nk_contingency_analysis(
+        input_network_path,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        k=1,
+        line_ids=[18],
+        report=report,
+    )
+    assert len(worst_cases) == 1
+    assert worst_cases.loc[1, "Outage_IDs"] == (18,)
+    assert worst_cases.loc[1, "Restoration_IDs"] == (24,)
+    assert worst_cases.loc[1, "Max_Loading_Line"] in input_data["line"]["id"]
+    assert report["solved_topologies"] == 1
+
+
+def test_n2_contingencies(meshed_network):
+    report = {}
+    worst_cases = nk_contingency_analysis(
+        meshed_network,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        k=2,
+        top_k=3,
+        max_memory_bytes=2 * 1024**2,
+        report=report,
+    )
+    assert len(worst_cases) == 3
+    assert list(worst_cases.index) == [1, 2, 3]
+    assert worst_cases["Max_Loading"].is_monotonic_decreasing
+    assert report["outage_combinations"] == 28
+    assert report["islanded_combinations"] > 0
+    assert report["scenarios"] == report["solved_topologies"]
+    assert report["batches"] > 1
+    assert all(len(outage) == 2 for outage in worst_cases["Outage_IDs"])
+
+    # only the top_k are kept, in the same order as a ranking of every scenario
+    all_cases = nk_contingency_analysis(
+        meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, k=2, top_k=1000
+    )
+    assert len(all_cases) == report["scenarios"]
+    pd.testing.assert_frame_equal(worst_cases, all_cases.head(3))
+
+    # the cap counts the (outage, restoration) scenarios
+    paths = (meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path)
+    assert len(nk_contingency_analysis(*paths, k=2, top_k=1000, max_scenarios=report["scenarios"])) == len(all_cases)
+    with pytest.raises(TooManyScenariosError):
+        nk_contingency_analysis(*paths, k=2, max_scenarios=report["scenarios"] - 1)
+
+
+def test_TooManyScenariosError(meshed_network):
+    with pytest.raises(TooManyScenariosError):
+        nk_contingency_analysis(
+            meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, max_scenarios=1
+        )
+    with pytest.raises(TooManyScenariosError):
+        nk_contingency_analysis(
+            meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, max_memory_bytes=1
+        )
+
+
+def test_invalid_input():
+    with pytest.raises(LineIDNotValidError):
+        nk_contingency_analysis(
+            input_network_path, metadata_path, active_power_profile_path, reactive_power_profile_path, line_ids=[24]
+        )
+    with pytest.raises(InvalidOutageOrderError):
+        nk_contingency_analysis(
+            input_network_path, metadata_path, active_power_profile_path, reactive_power_profile_path, k=0
+        )
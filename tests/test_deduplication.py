@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import initialize_array
+
+from power_system_simulation.batch_data import sparse_update
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.deduplication import InvalidQuantumError, deduplicated_power_flow, unique_scenarios
+from power_system_simulation.run_options import RunOptions
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_CALCULATION = DATA_PATH / "Calculation_module_test" / "input"
+
+input_network_data = DATA_CALCULATION / "input_network_data.json"
+active_power_profile_path = DATA_CALCULATION / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_CALCULATION / "reactive_power_profile.parquet"
+
+load_update = initialize_array("update", "sym_load", (5, 2))
+load_update["id"] = [1, 2]
+load_update["p_specified"] = [[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [3.0, 4.001], [3.0, 4.0]]
+load_update["q_specified"] = 0.0
+
+
+def test_unique_scenarios():
+    unique_index, inverse = unique_scenarios({"sym_load": load_update})
+    np.testing.assert_array_equal(unique_index, [0, 1, 3])
+    np.testing.assert_array_equal(inverse, [0, 1, 0, 2, 1])
+
+
+def test_unique_scenarios_quantized():
+    unique_index, inverse = unique_scenarios({"sym_load": load_update}, quantum=0.1)
+    np.testing.assert_array_equal(unique_index, [0, 1])
+    np.testing.assert_array_equal(inverse, [0, 1, 0, 1, 1])
+
+
+# Scenarios are combined over components: equal loads but different line status are not duplicates
+def test_unique_scenarios_multiple_components():
+    line_update = initialize_array("update", "line", (5, 1))
+    line_update["id"] = 7
+    line_update["from_status"] = [[1], [1], [0], [1], [1]]
+    unique_index, inverse = unique_scenarios({"sym_load": load_update, "line": line_update})
+    np.testing.assert_array_equal(unique_index, [0, 1, 2, 3])
+    np.testing.assert_array_equal(inverse, [0, 1, 2, 3, 1])
+
+
+# A sparse topology change counts as part of the scenario
+def test_unique_scenarios_sparse():
+    line_update = sparse_update("line", [{}, {}, {"id": [7], "from_status": [0]}, {}, {}])
+    unique_index, inverse = unique_scenarios({"sym_load": load_update, "line": line_update})
+    np.testing.assert_array_equal(unique_index, [0, 1, 2, 3])
+    np.testing.assert_array_equal(inverse, [0, 1, 2, 3, 1])
+
+
+def test_deduplicated_power_flow_scatters_results():
+    report = {}
+    output_data = deduplicated_power_flow(
+        {"sym_load": load_update},
+        lambda unique_update: {"sym_load": unique_update["sym_load"][["id", "p_specified"]]},
+        report=report,
+    )
+    np.testing.assert_array_equal(output_data["sym_load"]["p_specified"], load_update["p_specified"])
+    assert report["unique_scenarios"] == 3
+    assert report["compression_ratio"] == pytest.approx(5 / 3)
+
+
+def test_InvalidQuantumError():
+    with pytest.raises(InvalidQuantumError):
+        unique_scenarios({"sym_load": load_update}, quantum=0)
+
+
+# A profile made of the same day twice is solved once per unique snapshot with identical tables
+def test_calculate_power_grid_deduplicate(tmp_path):
+    for name, path in (("active", active_power_profile_path), ("reactive", reactive_power_profile_path)):
+        profile = pd.read_parquet(path)
+        repeated = pd.concat([profile, profile])
+        repeated.index = pd.date_range(profile.index[0], periods=len(repeated), freq="h", name=profile.index.name)
+        repeated.to_parquet(tmp_path / f"{name}.parquet")
+
+    report = {}
+    voltage_results, line_results = calculate_power_grid(
+        input_network_data,
+        tmp_path / "active.parquet",
+        tmp_path / "reactive.parquet",
+        options=RunOptions(deduplicate=True),
+        report=report,
+    )
+    expected_voltage, expected_line = calculate_power_grid(
+        input_network_data, tmp_path / "active.parquet", tmp_path / "reactive.parquet"
+    )
+    assert report["compression_ratio"] == 2
+    pd.testing.assert_frame_equal(voltage_results, expected_voltage)
+    pd.testing.assert_frame_equal(line_results, expected_line)
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from power_system_simulation.graph_processing import (
+    EdgeAlreadyDisabledError,
+    EdgeAlreadyEnabledError,
+    GraphCycleError,
+    GraphNotFullyConnectedError,
+    GraphProcessor,
+    IDNotFoundError,
+)
+
+vertex_ids = [0, 2, 4, 6, 10]
+edge_ids = [1, 3, 5, 7, 8, 9]
+edge_vertex_id_pairs = [(0, 2), (0, 4), (0, 6), (2, 4), (4, 6), (2, 10)]
+edge_enabled = [True, True, True, False, False, True]
+source_vertex_id = 10
+
+
+def parent_edges(grid):
+    order, _, parent_edge = grid.tree_index()
+    return dict(zip(order, parent_edge))
+
+
+def rebuilt(grid):
+    return GraphProcessor(
+        grid.vertex_ids, grid.edge_ids, grid.edge_vertex_id_pairs, grid.edge_enabled, grid.source_vertex_id
+    )
+
+
+def test_disable_and_enable_edge():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+
+    assert sorted(grid.disable_edge(3)) == [4]
+    assert not grid.is_connected
+    with pytest.raises(GraphNotFullyConnectedError):
+        grid.tree_index()
+
+    # the disconnected vertex is reconnected from the other side
+    grid.enable_edge(8)
+    assert grid.is_connected
+    assert grid.edge_enabled == [True, False, True, False, True, True]
+    assert parent_edges(grid) == parent_edges(rebuilt(grid)) == {10: -1, 2: 9, 0: 1, 6: 5, 4: 8}
+    assert grid.graph.edges[4, 6]["id"] == 8
+
+
+def test_swap_edges_reroots_subtree():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    grid.swap_edges(1, 7)
+    assert parent_edges(grid) == {10: -1, 2: 9, 4: 7, 0: 3, 6: 5}
+    assert grid.find_alternative_edges(7) == [1]
+
+
+# Two islands can be joined before they are reconnected to the source
+def test_join_islands():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    assert sorted(grid.disable_edge(1)) == [0, 4, 6]
+    assert grid.disable_edge(3) == [4]
+    grid.enable_edge(8)
+    with pytest.raises(GraphCycleError):
+        grid.enable_edge(3)
+    grid.enable_edge(7)
+    assert parent_edges(grid) == parent_edges(rebuilt(grid))
+
+
+def test_random_switching_matches_rebuild():
+    rng = random.Random(3)
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    for _ in range(200):
+        disabled = [edge_id for edge_id, enabled in zip(grid.edge_ids, grid.edge_enabled) if not enabled]
+        enabled = [edge_id for edge_id, enabled in zip(grid.edge_ids, grid.edge_enabled) if enabled]
+        try:
+            grid.swap_edges(rng.choice(enabled), rng.choice(disabled))
+        except GraphNotFullyConnectedError:
+            pass
+        assert parent_edges(grid) == parent_edges(rebuilt(grid))
+
+
+def test_switching_errors():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    with pytest.raises(IDNotFoundError):
+        grid.disable_edge(11)
+    with pytest.raises(EdgeAlreadyDisabledError):
+        grid.disable_edge(7)
+    with pytest.raises(EdgeAlreadyEnabledError):
+        grid.enable_edge(1)
+    with pytest.raises(GraphCycleError):
+        grid.enable_edge(7)
+    with pytest.raises(EdgeAlreadyEnabledError):
+        grid.swap_edges(1, 3)
+
+    # a swap that does not reconnect the disabled edge changes nothing
+    with pytest.raises(GraphNotFullyConnectedError):
+        grid.swap_edges(9, 7)
+    assert grid.edge_enabled == edge_enabled
+    assert parent_edges(grid) == parent_edges(rebuilt(grid))
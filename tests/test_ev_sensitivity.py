@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.batch_data import columnar_update
+from power_system_simulation.calculation_module import load_profile_update
+from power_system_simulation.ev_penetration import ev_penetration, ev_placement, feeder_loads
+from power_system_simulation.ev_sensitivity import EVSensitivity, InvalidRankingError, screen_ev_placements
+from power_system_simulation.graph_processing import grid_graph_processor
+from power_system_simulation.radial_sweep import RadialSweepSolver
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+with open(input_network, "r", encoding="utf-8") as fp:
+    input_data = json_deserialize(fp.read())
+with open(metadata, "r", encoding="utf-8") as fp:
+    meta_data = json.load(fp)
+active_power_profile = pd.read_parquet(active_power_profile_path)
+reactive_power_profile = pd.read_parquet(reactive_power_profile_path)
+ev_power_profile = pd.read_parquet(ev_active_power_profile)
+
+
+def test_ev_placement():
+    grid = grid_graph_processor(input_data, meta_data["lv_busbar"])
+    feeder_to_loads = feeder_loads(input_data, meta_data["lv_feeders"], grid)
+    assert feeder_to_loads == {16: [12, 13], 20: [14, 15]}
+
+    selected_ids, selected_columns = ev_placement(feeder_to_loads, 4, ev_power_profile.columns.tolist(), 100, 34)
+    assert len(selected_ids) == 4 and sorted(selected_ids) == [12, 13, 14, 15]
+    assert len(set(selected_columns)) == 4
+    assert ev_placement(feeder_to_loads, 4, ev_power_profile.columns.tolist(), 100, 34) == (
+        selected_ids,
+        selected_columns,
+    )
+
+
+# The first-order estimate follows the exact change of a small extra load
+def test_sensitivity_matches_power_flow():
+    update_data = load_profile_update(active_power_profile.iloc[:48], reactive_power_profile.iloc[:48])
+    solver = RadialSweepSolver(input_data)
+    base_output = solver.calculate_power_flow(update_data=update_data)
+    sensitivity = EVSensitivity(input_data)
+
+    extra = np.full((48, 2), 5000.0)
+    update_data["sym_load"]["p_specified"][:, [1, 3]] += extra
+    exact_output = solver.calculate_power_flow(update_data=update_data)
+    estimate = sensitivity.estimate(base_output, np.array([1, 3]), extra)
+
+    voltage_change = np.abs(exact_output["node"]["u_pu"] - base_output["node"]["u_pu"]).max()
+    assert np.abs(estimate["node"] - exact_output["node"]["u_pu"]).max() < 0.2 * voltage_change
+    for component in ("line", "transformer"):
+        loading_change = np.abs(exact_output[component]["loading"] - base_output[component]["loading"]).max()
+        assert np.abs(estimate[component] - exact_output[component]["loading"]).max() < 0.05 * loading_change
+
+
+@pytest.mark.parametrize("rank_by", ["Max_Loading", "Min_Voltage"])
+def test_screen_ev_placements(rank_by):
+    report = {}
+    worst = screen_ev_placements(
+        input_network,
+        metadata,
+        active_power_profile_path,
+        ev_active_power_profile,
+        50,
+        range(200),
+        top_k=3,
+        rank_by=rank_by,
+        report=report,
+    )
+    assert list(worst.index) == [1, 2, 3]
+    estimated = worst[f"Estimated_{rank_by}"]
+    assert estimated.is_monotonic_decreasing if rank_by == "Max_Loading" else estimated.is_monotonic_increasing
+    assert report["placements"] == 200 and report["reruns"] == 3
+    assert report["max_loading_error"] < 5e-3 and report["max_voltage_error"] < 1e-4
+    np.testing.assert_allclose(worst["Max_Loading"], worst["Estimated_Max_Loading"], rtol=1e-2)
+
+    # the exact columns are the power flow of ev_penetration: only the selected houses follow the profiles
+    seed = int(worst["Seed"].iloc[0])
+    voltage_df, line_df = ev_penetration(
+        input_network, metadata, active_power_profile_path, ev_active_power_profile, 50, seed
+    )
+    assert worst["Min_Voltage"].iloc[0] == pytest.approx(voltage_df["Min_Voltage"].min())
+    grid = grid_graph_processor(input_data, meta_data["lv_busbar"])
+    selected_ids, selected_columns = ev_placement(
+        feeder_loads(input_data, meta_data["lv_feeders"], grid), 4, ev_power_profile.columns.tolist(), 50, seed
+    )
+    p_specified = active_power_profile[selected_ids].to_numpy() + ev_power_profile[selected_columns].to_numpy()
+    output_data = PowerGridModel(input_data).calculate_power_flow(
+        update_data={"sym_load": columnar_update(selected_ids, p_specified=p_specified)}
+    )
+    assert line_df["Max_Loading"].max() == pytest.approx(output_data["line"]["loading"].max())
+    # the transformer is ranked with the lines
+    assert worst["Max_Loading"].iloc[0] == pytest.approx(
+        max(output_data["line"]["loading"].max(), output_data["transformer"]["loading"].max())
+    )
+
+
+def test_InvalidRankingError():
+    with pytest.raises(InvalidRankingError):
+        screen_ev_placements(
+            input_network, metadata, active_power_profile_path, ev_active_power_profile, 50, [1], rank_by="Loss"
+        )
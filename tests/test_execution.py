@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from power_grid_model import CalculationMethod
+from power_grid_model.errors import PowerGridError
+
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.execution import (
+    ExecutionConfig,
+    InvalidExecutionConfigError,
+    execution_config,
+    get_execution_config,
+    set_execution_config,
+)
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_CALCULATION = DATA_PATH / "Calculation_module_test" / "input"
+
+input_network_data = DATA_CALCULATION / "input_network_data.json"
+active_power_profile_path = DATA_CALCULATION / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_CALCULATION / "reactive_power_profile.parquet"
+
+check_table_voltage = pd.read_parquet(DATA_PATH / "expected_output" / "output_table_row_per_timestamp.parquet")
+check_table_line = pd.read_parquet(DATA_PATH / "expected_output" / "output_table_row_per_line.parquet")
+
+
+def test_default_config():
+    config = get_execution_config()
+    assert config.threading == -1
+    assert config.power_flow_kwargs(CalculationMethod.linear) == {
+        "threading": -1,
+        "calculation_method": CalculationMethod.linear,
+        "error_tolerance": 1e-8,
+        "max_iterations": 20,
+    }
+
+
+def test_calculation_method_from_string():
+    config = ExecutionConfig(calculation_method="linear_current")
+    assert config.power_flow_kwargs(CalculationMethod.newton_raphson)["calculation_method"] == (
+        CalculationMethod.linear_current
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"threading": -2}, {"error_tolerance": 0}, {"max_iterations": 0}, {"calculation_method": "no_such_method"}],
+)
+def test_InvalidExecutionConfigError(kwargs):
+    with pytest.raises(InvalidExecutionConfigError):
+        ExecutionConfig(**kwargs)
+
+
+def test_set_execution_config_restores():
+    previous = set_execution_config(threading=4)
+    assert get_execution_config().threading == 4
+    set_execution_config(previous)
+    assert get_execution_config().threading == -1
+
+    with execution_config(max_iterations=5) as config:
+        assert config.max_iterations == 5
+    assert get_execution_config().max_iterations == 20
+
+
+# Threaded batches give exactly the same output as sequential ones
+def test_threaded_calculate_power_grid():
+    voltage_results, line_results = calculate_power_grid(
+        input_network_data,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        execution_config=ExecutionConfig(threading=2),
+    )
+    pd.testing.assert_frame_equal(voltage_results, check_table_voltage)
+    pd.testing.assert_frame_equal(line_results, check_table_line)
+
+
+# The package-level configuration is honoured when no configuration is passed
+def test_package_level_config_is_honoured():
+    with execution_config(max_iterations=1):
+        with pytest.raises(PowerGridError):
+            calculate_power_grid(input_network_data, active_power_profile_path, reactive_power_profile_path)
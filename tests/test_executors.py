@@ -0,0 +1,208 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import power_system_simulation.ev_penetration as EV
+import power_system_simulation.nm_calculation as NM
+import power_system_simulation.optimal_tap_position as OTP
+from power_system_simulation.contingency import nk_contingency_analysis
+from power_system_simulation.executors import (
+    CLUSTER_KEY,
+    InvalidExecutorError,
+    SerialExecutor,
+    SocketExecutor,
+    ThreadExecutor,
+    WorkerLostError,
+    make_executor,
+    parse_address,
+)
+from power_system_simulation.scenario_cache import ScenarioCache
+from power_system_simulation.top_k import TopK
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+SRC_PATH = Path(__file__).parents[1] / "src"
+
+EXECUTORS = ["serial", "thread", "process", "socket"]
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def fail(x: int) -> int:
+    if x == 3:
+        raise ValueError("three")
+    return x
+
+
+def die_once(x: int, marker: str) -> int:
+    """Kill the worker the first time task 3 runs."""
+    if x == 3 and not Path(marker).exists():
+        Path(marker).touch()
+        os._exit(1)
+    return x
+
+
+def worker_pid(x: int) -> tuple:
+    time.sleep(0.2)
+    return x, os.getpid()
+
+
+def executor(kind: str, **options):
+    if kind == "socket":
+        options["timeout"] = 60
+    return make_executor(kind, 2, **options)
+
+
+@pytest.mark.parametrize("kind", EXECUTORS)
+def test_map_streams_results(kind):
+    with executor(kind) as pool:
+        assert list(pool.map(square, range(10), chunk_size=3)) == [x * x for x in range(10)]
+        assert sorted(pool.map(square, range(10), ordered=False)) == [x * x for x in range(10)]
+        assert list(pool.map(pow, [2, 3], [3, 2])) == [8, 9]
+        assert not list(pool.map(square, []))
+
+
+def test_serial_map_is_lazy():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x
+
+    results = SerialExecutor().map(record, range(10), chunk_size=4)
+    assert next(results) == 0
+    assert calls == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("kind", ["process", "socket"])
+def test_worker_death_is_retried(kind, tmp_path):
+    with executor(kind) as pool:
+        assert list(pool.map(die_once, range(8), [str(tmp_path / "marker")] * 8, chunk_size=2)) == list(range(8))
+        # the pool or the local worker was replaced
+        assert list(pool.map(square, range(4))) == [0, 1, 4, 9]
+
+    with executor(kind, retries=0) as pool:
+        with pytest.raises(WorkerLostError):
+            list(pool.map(die_once, range(8), [str(tmp_path / "other_marker")] * 8))
+
+
+@pytest.mark.parametrize("kind", EXECUTORS)
+def test_task_errors_are_raised(kind):
+    with executor(kind) as pool:
+        with pytest.raises(ValueError, match="three"):
+            list(pool.map(fail, range(6)))
+        assert list(pool.map(square, range(3))) == [0, 1, 4]
+
+
+def test_local_worker_death_before_connecting_is_retried():
+    with SocketExecutor(1) as pool:
+        # killed while it starts, before it connects
+        pool._processes[0].kill()
+        assert list(pool.map(square, range(4))) == [0, 1, 4, 9]
+
+    with SocketExecutor(1, retries=0) as pool:
+        pool._processes[0].kill()
+        with pytest.raises(WorkerLostError):
+            list(pool.map(square, range(4)))
+
+
+def test_thread_executor_accepts_retries():
+    with make_executor("thread", 2, retries=1) as pool:
+        assert pool.retries == 1
+        assert list(pool.map(square, range(3))) == [0, 1, 4]
+
+
+def test_socket_executor_with_worker_commands():
+    key = "test-cluster-key"
+    env = os.environ | {
+        CLUSTER_KEY: key,
+        "PYTHONPATH": os.pathsep.join([str(SRC_PATH), str(Path(__file__).parent), os.environ.get("PYTHONPATH", "")]),
+    }
+    with SocketExecutor(authkey=key.encode(), timeout=60) as pool:
+        host, port = pool.address
+        command = [sys.executable, "-m", "power_system_simulation.cli", "worker", f"{host}:{port}"]
+        workers = [subprocess.Popen(command, env=env) for _ in range(2)]
+        results = list(pool.map(worker_pid, range(10)))
+    assert [x for x, _ in results] == list(range(10))
+    assert {pid for _, pid in results} <= {worker.pid for worker in workers}
+    # the workers stop when the coordinator does
+    assert [worker.wait(timeout=60) for worker in workers] == [0, 0]
+
+    no_key = subprocess.run(command, env=env | {CLUSTER_KEY: ""}, capture_output=True, text=True, check=False)
+    assert no_key.returncode == 1
+    assert CLUSTER_KEY in no_key.stderr
+
+
+def test_ev_monte_carlo_on_executor():
+    paths = [
+        DATA_EXCEPTION_SET / "input_network_data.json",
+        DATA_EXCEPTION_SET / "meta_data.json",
+        DATA_EXCEPTION_SET / "active_power_profile.parquet",
+        DATA_EXCEPTION_SET / "ev_active_power_profile.parquet",
+    ]
+    with ThreadExecutor(2) as pool:
+        results = EV.ev_monte_carlo(*paths, 50, [1, 2], executor=pool)
+    assert list(results) == [1, 2]
+    for seed, (voltage_df, line_df) in results.items():
+        expected_voltage_df, expected_line_df = EV.ev_penetration(*paths, 50, seed)
+        pd.testing.assert_frame_equal(voltage_df, expected_voltage_df)
+        pd.testing.assert_frame_equal(line_df, expected_line_df)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_studies_on_executor(kind):
+    paths = [
+        DATA_EXCEPTION_SET / "input_network_data.json",
+        DATA_EXCEPTION_SET / "meta_data.json",
+        DATA_EXCEPTION_SET / "active_power_profile.parquet",
+        DATA_EXCEPTION_SET / "reactive_power_profile.parquet",
+    ]
+    expected_top_k, top_k = TopK(5), TopK(5)
+    with executor(kind) as pool:
+        assert NM.nm_function(18, *paths, top_k=top_k, executor=pool) == NM.nm_function(
+            18, *paths, top_k=expected_top_k
+        )
+        pd.testing.assert_frame_equal(top_k.ranked(), expected_top_k.ranked())
+
+        pd.testing.assert_frame_equal(
+            nk_contingency_analysis(*paths, k=2, max_memory_bytes=2 * 1024**2, executor=pool),
+            nk_contingency_analysis(*paths, k=2, max_memory_bytes=2 * 1024**2),
+        )
+
+        expected_top_k, top_k = TopK(5), TopK(5)
+        tap_paths = [paths[0], paths[2], paths[3]]
+        for optimize_by in (0, 1):
+            assert OTP.optimal_tap_position(
+                *tap_paths, optimize_by, top_k=top_k, executor=pool
+            ) == OTP.optimal_tap_position(*tap_paths, optimize_by, top_k=expected_top_k)
+        pd.testing.assert_frame_equal(top_k.ranked(), expected_top_k.ranked())
+
+        with pytest.raises(InvalidExecutorError):
+            OTP.optimal_tap_position(*tap_paths, 0, cache=ScenarioCache(), executor=pool)
+        with pytest.raises(InvalidExecutorError):
+            NM.nm_function(18, *paths, cache=ScenarioCache(), executor=pool)
+
+
+def test_invalid_executors():
+    with pytest.raises(InvalidExecutorError):
+        SerialExecutor().map(square, range(3), chunk_size=0)
+    with pytest.raises(InvalidExecutorError):
+        SerialExecutor(retries=-1)
+    with pytest.raises(InvalidExecutorError):
+        make_executor("process", 0)
+    with pytest.raises(InvalidExecutorError):
+        make_executor("thread", 0)
+    with pytest.raises(InvalidExecutorError):
+        SocketExecutor(-1)
+    with pytest.raises(InvalidExecutorError):
+        make_executor("gpu")
+    with pytest.raises(InvalidExecutorError):
+        parse_address("localhost")
+    assert parse_address("node-1:6000") == ("node-1", 6000)
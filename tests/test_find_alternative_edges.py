@@ -2,7 +2,7 @@ import unittest
 
 import pytest
 
-from power_system_simulation.graph_processing import EdgeAlreadyDisabledError, GraphProcessor
+from power_system_simulation.graph_processing import EdgeAlreadyDisabledError, GraphProcessor, IDNotFoundError
 
 vertex_ids = [0, 2, 4, 6, 10]
 edge_ids = [1, 3, 5, 7, 8, 9]
@@ -24,3 +24,18 @@ def test_EdgeAlreadyDisabledError():
     with pytest.raises(EdgeAlreadyDisabledError):
         grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
         grid.find_alternative_edges(7)
+
+
+# N-k outages: restoration sets close as many disabled edges as were opened
+def test_alternative_edge_sets():
+    assert graph.find_alternative_edge_sets([3, 5]) == [(7, 8)]
+    assert graph.find_alternative_edge_sets([1, 3]) == [(7, 8)]
+    assert graph.find_alternative_edge_sets([3]) == [(7,), (8,)]
+    assert graph.find_alternative_edge_sets([9, 1]) == []
+
+
+def test_alternative_edge_sets_errors():
+    with pytest.raises(EdgeAlreadyDisabledError):
+        graph.find_alternative_edge_sets([3, 7])
+    with pytest.raises(IDNotFoundError):
+        graph.find_alternative_edge_sets([3, 42])
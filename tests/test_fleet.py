@@ -0,0 +1,98 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.cli import main
+from power_system_simulation.executors import SocketExecutor
+from power_system_simulation.fleet import InvalidFleetError, estimate_cost, fleet_tables, run_fleet
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+N_NODES = 10
+
+
+def grid_package(root: Path, name: str, n_timestamps: int) -> Path:
+    """Copy of the test grid with the first n_timestamps of its profiles."""
+    grid_dir = root / name
+    shutil.copytree(DATA_EXCEPTION_SET, grid_dir)
+    for profile in ("active_power_profile.parquet", "reactive_power_profile.parquet"):
+        pd.read_parquet(DATA_EXCEPTION_SET / profile).iloc[:n_timestamps].to_parquet(grid_dir / profile)
+    return grid_dir
+
+
+@pytest.fixture(name="fleet")
+def fixture_fleet(tmp_path):
+    return [
+        grid_package(tmp_path / "grids", "small", 96),
+        grid_package(tmp_path / "grids", "large", 960),
+        grid_package(tmp_path / "grids", "medium", 480),
+    ]
+
+
+def test_estimate_cost(fleet):
+    assert [estimate_cost(grid_dir) for grid_dir in fleet] == [N_NODES * 96, N_NODES * 960, N_NODES * 480]
+
+
+def test_run_fleet(fleet, tmp_path):
+    report = {}
+    timings = run_fleet(fleet, tmp_path / "out", workers=2, threads=1, report=report)
+
+    assert list(timings["Grid"]) == [str(fleet[1]), str(fleet[2]), str(fleet[0])]
+    assert (timings["Status"] == "ok").all()
+    assert timings["Cost"].is_monotonic_decreasing
+    assert set(timings["Worker"]) <= {0, 1}
+    assert 0 < report["mean_utilisation"] <= 1
+    assert all(0 < utilisation <= 1 for utilisation in report["utilisation"].values())
+    assert report["busy_seconds"] == pytest.approx(timings["Seconds"].sum())
+
+    line_tables = fleet_tables(tmp_path / "out", "line")
+    assert sorted(line_tables["Grid"].unique()) == ["large", "medium", "small"]
+    for grid_dir in fleet:
+        voltage_df, line_df = calculate_power_grid(
+            grid_dir / "input_network_data.json",
+            grid_dir / "active_power_profile.parquet",
+            grid_dir / "reactive_power_profile.parquet",
+        )
+        table = line_tables[line_tables["Grid"] == grid_dir.name].drop(columns=["Grid", "Study"])
+        pd.testing.assert_frame_equal(table.set_index("Line_ID"), line_df)
+    voltage_tables = fleet_tables(tmp_path / "out", "voltage")
+    assert len(voltage_tables) == 96 + 960 + 480
+
+
+def test_run_fleet_on_socket_workers(fleet, tmp_path):
+    report = {}
+    with SocketExecutor(2, timeout=120) as executor:
+        timings = run_fleet(fleet, tmp_path / "out", threads=1, report=report, executor=executor)
+    assert list(timings["Grid"]) == [str(fleet[1]), str(fleet[2]), str(fleet[0])]
+    assert (timings["Status"] == "ok").all()
+    assert set(timings["Worker"]) <= {0, 1}
+    assert 0 < report["mean_utilisation"] <= 1
+    assert len(fleet_tables(tmp_path / "out", "voltage")) == 96 + 960 + 480
+
+
+def test_run_fleet_ev_and_errors(tmp_path):
+    grid_dir = grid_package(tmp_path / "grids", "grid", 960)
+    timings = run_fleet([grid_dir], tmp_path / "out", studies=["powerflow", "ev"], workers=4, largest_first=False)
+    assert list(timings["Study"]) == ["powerflow", "ev_p50_seed0"]
+    assert set(fleet_tables(tmp_path / "out", "line")["Study"]) == {"powerflow", "ev_p50_seed0"}
+
+    (grid_dir / "reactive_power_profile.parquet").unlink()
+    timings = run_fleet([grid_dir], tmp_path / "failed", workers=1)
+    assert timings["Status"][0].startswith("GridPackageError")
+
+    with pytest.raises(InvalidFleetError):
+        run_fleet([], tmp_path / "out")
+    with pytest.raises(InvalidFleetError):
+        run_fleet([grid_dir], tmp_path / "out", studies=["tap"])
+    with pytest.raises(InvalidFleetError):
+        run_fleet([grid_dir, tmp_path / "other" / "grid"], tmp_path / "out")
+
+
+def test_fleet_command(fleet, tmp_path, capsys):
+    assert main(["fleet", *map(str, fleet), "--output", str(tmp_path / "out"), "--workers", "2"]) == 0
+    assert "worker utilisation" in capsys.readouterr().out
+    assert len(fleet_tables(tmp_path / "out", "voltage")) == 96 + 960 + 480
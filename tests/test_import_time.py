@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import power_system_simulation as pss
+
+SRC_PATH = Path(__file__).parents[1] / "src"
+
+# imported by the studies themselves, never by importing the package or the command line tool
+HEAVY_MODULES = {"numpy", "pandas", "pyarrow", "power_grid_model", "networkx", "scipy", "prettytable"}
+# only imported on first use by the study modules
+DEFERRED_MODULES = {"networkx", "scipy", "prettytable", "power_grid_model.validation"}
+
+
+def imported_modules(module: str) -> dict:
+    """Cumulative import time in microseconds of every module imported by `python -X importtime -c import module`."""
+    env = os.environ | {"PYTHONPATH": os.pathsep.join([str(SRC_PATH), os.environ.get("PYTHONPATH", "")])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module", ["power_system_simulation", "power_system_simulation.cli", "power_system_simulation.studies"]
+)
+def test_package_import_is_light(module):
+    times = imported_modules(module)
+    assert module in times
+    assert not HEAVY_MODULES & set(times)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "power_system_simulation.calculation_module",
+        "power_system_simulation.contingency",
+        "power_system_simulation.ev_penetration",
+        "power_system_simulation.nm_calculation",
+        "power_system_simulation.reconfiguration",
+        "power_system_simulation.validate_power_system_simulation",
+    ],
+)
+def test_study_modules_defer_imports(module):
+    times = imported_modules(module)
+    assert module in times
+    assert not DEFERRED_MODULES & set(times)
+
+
+def test_lazy_attributes():
+    assert pss.ExecutionConfig is pss.execution.ExecutionConfig
+    assert pss.calculate_power_grid is pss.calculation_module.calculate_power_grid
+    assert "nm_function" in dir(pss)
+    with pytest.raises(AttributeError):
+        pss.not_an_attribute  # pylint: disable=pointless-statement
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.aggregation import InvalidTimestampsError
+from power_system_simulation.calculation_module import (
+    TimestampsDoNotMatchError,
+    calculate_power_grid,
+    read_load_profiles,
+    read_profile_update,
+    run_batch_power_flow,
+)
+from power_system_simulation.incremental import IncrementalSession, IncrementalStateError
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+INPUT_NETWORK_DATA = DATA_EXCEPTION_SET / "input_network_data.json"
+ACTIVE_POWER_PROFILE = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+REACTIVE_POWER_PROFILE = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+
+# a band and a limit that the test grid violates
+VOLTAGE_LIMITS = (1.05, 1.07)
+LOADING_LIMIT = 0.001
+
+
+def test_incremental_updates_match_full_run(tmp_path):
+    active_power_profile, reactive_power_profile = read_load_profiles(ACTIVE_POWER_PROFILE, REACTIVE_POWER_PROFILE)
+    state_path = tmp_path / "state" / "session.npz"
+    rollups = {}
+    voltage_df, line_df = calculate_power_grid(
+        INPUT_NETWORK_DATA, ACTIVE_POWER_PROFILE, REACTIVE_POWER_PROFILE, rollups=rollups
+    )
+
+    voltage_tables = []
+    # overlapping feeds: rows that were solved before are skipped, every session restarts from the state file
+    for start, end in ((0, 100), (50, 101), (101, 101), (90, 960)):
+        session = IncrementalSession(
+            INPUT_NETWORK_DATA, state_path, voltage_limits=VOLTAGE_LIMITS, loading_limit=LOADING_LIMIT
+        )
+        voltage_tables.append(
+            session.update(active_power_profile.iloc[start:end], reactive_power_profile.iloc[start:end])
+        )
+    assert [len(table) for table in voltage_tables] == [100, 1, 0, 859]
+    assert session.n_timestamps == 960
+    assert session.last_timestamp == active_power_profile.index[-1]
+    pd.testing.assert_frame_equal(pd.concat(voltage_tables[:2] + voltage_tables[3:]), voltage_df, check_freq=False)
+
+    session = IncrementalSession(
+        INPUT_NETWORK_DATA, state_path, voltage_limits=VOLTAGE_LIMITS, loading_limit=LOADING_LIMIT
+    )
+    line_table = session.line_table()
+    for column in ("Max_Loading", "Max_Loading_Timestamp", "Min_Loading", "Min_Loading_Timestamp"):
+        np.testing.assert_array_equal(line_table[column], line_df[column])
+    np.testing.assert_allclose(line_table["Loss_kWh"], rollups["monthly"][1]["Loss_kWh"])
+    assert (line_table["Overloading_Count"] > 0).any()
+
+    node_table = session.node_table()
+    assert node_table["Max_Voltage"].max() == voltage_df["Max_Voltage"].max()
+    assert node_table["Min_Voltage"].min() == voltage_df["Min_Voltage"].min()
+    with open(INPUT_NETWORK_DATA, "r", encoding="utf-8") as fp:
+        model = PowerGridModel(json_deserialize(fp.read()))
+    node_voltages = run_batch_power_flow(model, read_profile_update(ACTIVE_POWER_PROFILE, REACTIVE_POWER_PROFILE)[0])[
+        "node"
+    ]["u_pu"]
+    np.testing.assert_array_equal(node_table["Undervoltage_Count"], (node_voltages < VOLTAGE_LIMITS[0]).sum(axis=0))
+    np.testing.assert_array_equal(node_table["Overvoltage_Count"], (node_voltages > VOLTAGE_LIMITS[1]).sum(axis=0))
+    assert node_table["Undervoltage_Count"].sum() > 0
+    assert node_table["Overvoltage_Count"].sum() > 0
+
+
+def test_incremental_errors(tmp_path):
+    active_power_profile, reactive_power_profile = read_load_profiles(ACTIVE_POWER_PROFILE, REACTIVE_POWER_PROFILE)
+    state_path = tmp_path / "session.npz"
+    session = IncrementalSession(INPUT_NETWORK_DATA, state_path)
+    session.update(active_power_profile.iloc[:4], reactive_power_profile.iloc[:4])
+
+    with pytest.raises(TimestampsDoNotMatchError):
+        session.update(active_power_profile.iloc[4:8], reactive_power_profile.iloc[5:9])
+    with pytest.raises(InvalidTimestampsError):
+        session.update(active_power_profile.iloc[8:4:-1], reactive_power_profile.iloc[8:4:-1])
+    assert session.n_timestamps == 4
+
+    with pytest.raises(IncrementalStateError):
+        IncrementalSession(INPUT_NETWORK_DATA, state_path, loading_limit=0.5)
+    with pytest.raises(IncrementalStateError):
+        IncrementalSession(DATA_EXCEPTION_SET / "input_network_data_alt.json", state_path)
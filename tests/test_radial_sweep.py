@@ -0,0 +1,191 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+import power_system_simulation.ev_penetration as EV
+import power_system_simulation.nm_calculation as nm_file
+from power_system_simulation.calculation_module import calculate_power_grid, load_profile_update, read_load_profiles
+from power_system_simulation.graph_processing import grid_graph_processor
+from power_system_simulation.radial_sweep import (
+    RadialSweepSolver,
+    SweepNotConvergedError,
+    UnsupportedGridError,
+    radial_graph,
+)
+from power_system_simulation.run_options import RunOptions
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+DATA_CALCULATION_SET = DATA_PATH / "Calculation_module_test" / "input"
+
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+
+def load_case(data_set):
+    with open(data_set / "input_network_data.json", "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    active, reactive = read_load_profiles(
+        data_set / "active_power_profile.parquet", data_set / "reactive_power_profile.parquet"
+    )
+    return input_data, load_profile_update(active, reactive)
+
+
+def assert_matches_power_grid_model(output_data, expected):
+    np.testing.assert_allclose(output_data["node"]["u_pu"], expected["node"]["u_pu"], atol=1e-8)
+    np.testing.assert_allclose(output_data["node"]["u_angle"], expected["node"]["u_angle"], atol=1e-8)
+    for component in ("line", "transformer"):
+        if component in expected:
+            np.testing.assert_array_equal(output_data[component]["energized"], expected[component]["energized"])
+            np.testing.assert_allclose(output_data[component]["loading"], expected[component]["loading"], atol=1e-8)
+            for name in ("p_from", "q_from", "p_to", "q_to"):
+                scale = np.abs(expected[component][name]).max()
+                np.testing.assert_allclose(output_data[component][name], expected[component][name], atol=1e-8 * scale)
+
+
+def test_tree_index():
+    input_data, _ = load_case(DATA_EXCEPTION_SET)
+    order, parent, parent_edge = grid_graph_processor(input_data, 1).tree_index()
+
+    assert order[0] == 0 and parent[0] == -1 and parent_edge[0] == -1
+    assert sorted(order) == input_data["node"]["id"].tolist()
+    # every parent comes before its children, connected by the edge of the pair
+    pairs = {
+        edge_id: {u, v} for edge_id, u, v in zip(*(input_data["line"][name] for name in ("id", "from_node", "to_node")))
+    }
+    pairs[11] = {0, 1}
+    for position in range(1, len(order)):
+        assert parent[position] < position
+        assert pairs[parent_edge[position]] == {order[position], order[parent[position]]}
+    assert 24 not in parent_edge
+
+
+# The sweep reproduces the power_grid_model results, including the transformer and the half-open line 24
+@pytest.mark.parametrize("data_set", [DATA_EXCEPTION_SET, DATA_CALCULATION_SET])
+def test_matches_power_grid_model(data_set):
+    input_data, update_data = load_case(data_set)
+    output_data = RadialSweepSolver(input_data).calculate_power_flow(update_data=update_data)
+    expected = PowerGridModel(input_data).calculate_power_flow(update_data=update_data)
+    assert_matches_power_grid_model(output_data, expected)
+
+
+@pytest.mark.parametrize("tap_pos", [1, 5])
+def test_matches_power_grid_model_tap_position(tap_pos):
+    input_data, update_data = load_case(DATA_EXCEPTION_SET)
+    input_data["transformer"]["tap_pos"] = tap_pos
+    output_data = RadialSweepSolver(input_data, grid_graph_processor(input_data, 1)).calculate_power_flow(
+        update_data=update_data
+    )
+    expected = PowerGridModel(input_data).calculate_power_flow(update_data=update_data)
+    assert_matches_power_grid_model(output_data, expected)
+
+
+def test_load_types_and_partial_update():
+    input_data, update_data = load_case(DATA_EXCEPTION_SET)
+    input_data["sym_load"]["type"] = [0, 1, 2, 1]
+    input_data["sym_load"]["q_specified"] = 1000.0
+    update = initialize_array("update", "sym_load", (5, 2))
+    update["id"] = [13, 14]
+    update["p_specified"] = update_data["sym_load"]["p_specified"][:5, 1:3] * 50
+    update["status"] = [[1, 0]] * 5
+
+    output_data = RadialSweepSolver(input_data).calculate_power_flow(update_data={"sym_load": update})
+    expected = PowerGridModel(input_data).calculate_power_flow(update_data={"sym_load": update})
+    assert_matches_power_grid_model(output_data, expected)
+
+
+def test_single_calculation():
+    input_data, _ = load_case(DATA_CALCULATION_SET)
+    input_data["sym_load"]["p_specified"] = 1e6
+    output_data = RadialSweepSolver(input_data).calculate_power_flow()
+    expected = PowerGridModel(input_data).calculate_power_flow()
+    assert output_data["node"].shape == (4,)
+    np.testing.assert_allclose(output_data["node"]["u_pu"], expected["node"]["u_pu"], atol=1e-8)
+
+
+# Starting from the previous solution needs fewer sweeps than a flat start
+def test_initial_state():
+    input_data, update_data = load_case(DATA_EXCEPTION_SET)
+    solver = RadialSweepSolver(input_data)
+    output_data = solver.calculate_power_flow(update_data=update_data)
+    flat_iterations = solver.iterations.copy()
+
+    warm_output = solver.calculate_power_flow(
+        update_data=update_data, initial_state={component: array[0] for component, array in output_data.items()}
+    )
+    assert (flat_iterations >= 1).all()
+    assert solver.iterations.sum() < flat_iterations.sum()
+    np.testing.assert_allclose(warm_output["node"]["u_pu"], output_data["node"]["u_pu"], atol=1e-8)
+
+
+def test_calculate_power_grid_radial_sweep():
+    expected_voltage, expected_line = calculate_power_grid(
+        input_network, active_power_profile_path, reactive_power_profile_path
+    )
+    report = {}
+    voltage_results, line_results = calculate_power_grid(
+        input_network,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        report=report,
+        options=RunOptions(chunk_size=96, count_iterations=True),
+        radial_sweep=True,
+    )
+    pd.testing.assert_frame_equal(voltage_results, expected_voltage, atol=1e-8)
+    pd.testing.assert_frame_equal(line_results, expected_line, rtol=1e-6)
+    assert report["chunks"] == 10
+    assert len(report["newton_raphson_iterations"]) == len(voltage_results)
+    assert (report["newton_raphson_iterations"] >= 1).all()
+
+
+def test_ev_penetration_radial_sweep():
+    expected_voltage, expected_line = EV.ev_penetration(
+        input_network, metadata, active_power_profile_path, ev_active_power_profile, 75, 34
+    )
+    voltage_results, line_results = EV.ev_penetration(
+        input_network, metadata, active_power_profile_path, ev_active_power_profile, 75, 34, radial_sweep=True
+    )
+    pd.testing.assert_frame_equal(voltage_results, expected_voltage, atol=1e-8)
+    pd.testing.assert_series_equal(line_results["Max_Loading"], expected_line["Max_Loading"], atol=1e-8)
+
+
+def test_nm_function_radial_sweep():
+    assert nm_file.nm_function(
+        18,
+        input_network,
+        metadata,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        radial_sweep=True,
+    ) == [24]
+
+
+def test_UnsupportedGridError():
+    input_data, update_data = load_case(DATA_EXCEPTION_SET)
+    solver = RadialSweepSolver(input_data)
+    line_update = initialize_array("update", "line", (1, 1))
+    line_update["id"] = 18
+    line_update["from_status"] = 0
+    with pytest.raises(UnsupportedGridError):
+        solver.calculate_power_flow(update_data={"line": line_update})
+
+    input_data["sym_gen"] = initialize_array("input", "sym_gen", 1)
+    with pytest.raises(UnsupportedGridError):
+        RadialSweepSolver(input_data)
+
+    input_data["source"]["status"] = 0
+    with pytest.raises(UnsupportedGridError):
+        radial_graph(input_data)
+
+
+def test_SweepNotConvergedError():
+    input_data, update_data = load_case(DATA_EXCEPTION_SET)
+    with pytest.raises(SweepNotConvergedError):
+        RadialSweepSolver(input_data).calculate_power_flow(update_data=update_data, max_iterations=1)
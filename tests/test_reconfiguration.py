@@ -0,0 +1,200 @@
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize, json_serialize_to_file
+
+from power_system_simulation.calculation_module import calculate_power_grid, load_profile_update, read_load_profiles
+from power_system_simulation.graph_processing import (
+    GraphCycleError,
+    GraphNotFullyConnectedError,
+    GraphProcessor,
+    grid_graph_processor,
+)
+from power_system_simulation.reconfiguration import (
+    InvalidSearchSettingError,
+    configuration_losses,
+    optimize_reconfiguration,
+)
+from power_system_simulation.scenario_cache import ScenarioCache
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+metadata_path = DATA_EXCEPTION_SET / "meta_data.json"
+input_network_path = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+
+with open(input_network_path, "r", encoding="utf-8") as fp:
+    input_data = json_deserialize(fp.read())
+
+vertex_ids = [0, 2, 4, 6, 10]
+edge_ids = [1, 3, 5, 7, 8, 9]
+edge_vertex_id_pairs = [(0, 2), (0, 4), (0, 6), (2, 4), (4, 6), (2, 10)]
+edge_enabled = [True, True, True, False, False, True]
+source_vertex_id = 10
+
+
+def meshed_data():
+    """The test grid with two extra normally open lines (3-5 and 7-9)."""
+    extra = initialize_array("input", "line", 2)
+    extra[:] = input_data["line"][-1]
+    extra["id"] = [25, 26]
+    extra["from_node"] = [3, 7]
+    extra["to_node"] = [5, 9]
+    extra["to_status"] = 0
+    data = dict(input_data)
+    data["line"] = np.concatenate([input_data["line"], extra])
+    return data
+
+
+@pytest.fixture(name="meshed_network")
+def fixture_meshed_network(tmp_path):
+    path = tmp_path / "input_network_data.json"
+    json_serialize_to_file(path, meshed_data())
+    return path
+
+
+def total_loss(path):
+    _, line_results = calculate_power_grid(path, active_power_profile_path, reactive_power_profile_path)
+    return line_results["Total_Loss"].sum()
+
+
+def test_branch_exchanges():
+    grid = GraphProcessor(vertex_ids, edge_ids, edge_vertex_id_pairs, edge_enabled, source_vertex_id)
+    assert sorted(grid.branch_exchanges()) == [(1, 7), (3, 7), (3, 8), (5, 8)]
+
+    # every exchange keeps the grid radial and connected
+    for to_disable, to_enable in grid.branch_exchanges():
+        grid.swap_edges(to_disable, to_enable)
+        assert grid.is_connected
+        grid.swap_edges(to_enable, to_disable)
+
+
+def radial_configurations(data):
+    """Every set of open lines that leaves the grid radial and connected."""
+    grid = grid_graph_processor(data, 1)
+    n_open = grid.edge_enabled.count(False)
+    for candidate in itertools.combinations(data["line"]["id"].tolist(), n_open):
+        enabled = [edge_id not in candidate for edge_id in grid.edge_ids]
+        try:
+            GraphProcessor(grid.vertex_ids, grid.edge_ids, grid.edge_vertex_id_pairs, enabled, grid.source_vertex_id)
+        except (GraphCycleError, GraphNotFullyConnectedError):
+            continue
+        yield frozenset(candidate)
+
+
+def write_configuration(path, open_lines):
+    data = meshed_data()
+    data["line"]["to_status"] = ~np.isin(data["line"]["id"], list(open_lines))
+    json_serialize_to_file(path, data)
+    return path
+
+
+def test_optimize_reconfiguration(meshed_network, tmp_path):
+    report = {}
+    open_lines, best_loss = optimize_reconfiguration(
+        meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, report=report
+    )
+    assert report["initial_loss"] == pytest.approx(total_loss(meshed_network))
+    assert best_loss <= report["initial_loss"]
+    assert best_loss == pytest.approx(total_loss(write_configuration(tmp_path / "best.json", open_lines)))
+
+    # brute force over all radial configurations of this small grid
+    data = meshed_data()
+    model = PowerGridModel(data)
+    load_update = load_profile_update(*read_load_profiles(active_power_profile_path, reactive_power_profile_path))
+    radial_losses = {}
+    for candidate in radial_configurations(data):
+        line_update = initialize_array("update", "line", len(data["line"]))
+        line_update["id"] = data["line"]["id"]
+        line_update["from_status"] = 1
+        line_update["to_status"] = ~np.isin(line_update["id"], list(candidate))
+        output_data = model.calculate_power_flow(update_data=load_update | {"line": np.tile(line_update, (960, 1))})
+        radial_losses[candidate] = configuration_losses(output_data, 1)[0]
+
+    # the greedy search goes downhill from the worst configuration to the best one
+    worst = max(radial_losses, key=radial_losses.get)
+    report = {}
+    open_lines, best_loss = optimize_reconfiguration(
+        write_configuration(tmp_path / "worst.json", worst),
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        report=report,
+    )
+    assert report["initial_loss"] == pytest.approx(radial_losses[worst])
+    assert best_loss == pytest.approx(min(radial_losses.values()))
+    assert radial_losses[frozenset(open_lines)] == pytest.approx(best_loss)
+    assert report["iterations"] > 0 and report["loss_history"] == sorted(report["loss_history"], reverse=True)
+    assert report["power_flows"] == report["configurations"] * 960 < len(radial_losses) * 960
+
+
+def test_tabu_search_with_cache(meshed_network):
+    cache = ScenarioCache()
+    greedy_report, tabu_report, repeated_report = {}, {}, {}
+    greedy = optimize_reconfiguration(
+        meshed_network,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        cache=cache,
+        report=greedy_report,
+    )
+    tabu = optimize_reconfiguration(
+        meshed_network,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        max_iterations=6,
+        tabu_tenure=2,
+        cache=cache,
+        report=tabu_report,
+    )
+    assert tabu_report["iterations"] <= 6
+    assert tabu[1] <= greedy[1]
+
+    # a repeated search is answered from the cache
+    repeated = optimize_reconfiguration(
+        meshed_network,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        cache=cache,
+        report=repeated_report,
+    )
+    assert repeated == greedy
+    assert greedy_report["power_flows"] > 0 and repeated_report["power_flows"] == 0
+
+
+@pytest.mark.parametrize("tabu_tenure", [1, 2])
+def test_tabu_tenure(meshed_network, tabu_tenure):
+    report = {}
+    optimize_reconfiguration(
+        meshed_network,
+        metadata_path,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        max_iterations=6,
+        tabu_tenure=tabu_tenure,
+        report=report,
+    )
+    moves = report["moves"]
+    assert len(moves) == report["iterations"] > tabu_tenure
+    # neither line of a move is switched again within tabu_tenure iterations, so no move is reversed
+    for i, move in enumerate(moves):
+        for later in moves[i + 1 : i + 1 + tabu_tenure]:
+            assert not set(move) & set(later)
+
+
+def test_InvalidSearchSettingError(meshed_network):
+    with pytest.raises(InvalidSearchSettingError):
+        optimize_reconfiguration(
+            meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, batch_size=0
+        )
+    with pytest.raises(InvalidSearchSettingError):
+        optimize_reconfiguration(
+            meshed_network, metadata_path, active_power_profile_path, reactive_power_profile_path, tabu_tenure=-1
+        )
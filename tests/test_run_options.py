@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import power_system_simulation.ev_penetration as EV
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.checkpoint import Checkpoint
+from power_system_simulation.run_options import InvalidRunOptionsError, RunOptions
+from power_system_simulation.scenario_cache import ScenarioCache
+from power_system_simulation.screening import ScreeningConfig
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+
+def test_run_options():
+    options = RunOptions(chunk_size=96, deduplicate=True, quantum=0.1)
+    assert not options.needs_fingerprint
+    assert options.replace(cache=ScenarioCache()).needs_fingerprint
+    assert options.replace(deduplicate=False, quantum=None).chunk_size == 96
+    assert repr(options).startswith("RunOptions(screening=None, chunk_size=96")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"quantum": 0.1}, {"deduplicate": True, "count_iterations": True}],
+)
+def test_InvalidRunOptionsError(options):
+    with pytest.raises(InvalidRunOptionsError):
+        RunOptions(**options)
+
+
+def test_unsupported_runs():
+    # the iterations need a report and a radial sweep can not be screened
+    with pytest.raises(InvalidRunOptionsError):
+        calculate_power_grid(
+            input_network,
+            active_power_profile_path,
+            reactive_power_profile_path,
+            options=RunOptions(count_iterations=True),
+        )
+    with pytest.raises(InvalidRunOptionsError):
+        calculate_power_grid(
+            input_network,
+            active_power_profile_path,
+            reactive_power_profile_path,
+            options=RunOptions(screening=ScreeningConfig()),
+            radial_sweep=True,
+        )
+
+
+# Every supported option combined gives the same tables as one plain batch
+def test_combined_options(tmp_path):
+    expected_voltage, expected_line = calculate_power_grid(
+        input_network, active_power_profile_path, reactive_power_profile_path
+    )
+    cache = ScenarioCache()
+    options = RunOptions(
+        chunk_size=240, deduplicate=True, cache=cache, checkpoint=Checkpoint(tmp_path / "checkpoint", chunk_size=96)
+    )
+    for report in ({}, {}):
+        voltage_results, line_results = calculate_power_grid(
+            input_network, active_power_profile_path, reactive_power_profile_path, options=options, report=report
+        )
+        pd.testing.assert_frame_equal(voltage_results, expected_voltage)
+        pd.testing.assert_frame_equal(line_results, expected_line)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    expected = EV.ev_penetration(input_network, metadata, active_power_profile_path, ev_active_power_profile, 50, 1)
+    voltage_results, line_results = EV.ev_penetration(
+        input_network,
+        metadata,
+        active_power_profile_path,
+        ev_active_power_profile,
+        50,
+        1,
+        options=RunOptions(chunk_size=240, deduplicate=True),
+    )
+    pd.testing.assert_frame_equal(voltage_results, expected[0])
+    pd.testing.assert_frame_equal(line_results, expected[1])
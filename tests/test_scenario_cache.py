@@ -0,0 +1,155 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+import power_system_simulation.nm_calculation as nm_file
+import power_system_simulation.optimal_tap_position as otp
+from power_system_simulation.calculation_module import (
+    MissingNetworkFingerprintError,
+    calculate_power_grid,
+    run_batch_power_flow,
+)
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.scenario_cache import InvalidCacheSizeError, ScenarioCache, dataset_digest
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_CALCULATION = DATA_PATH / "Calculation_module_test" / "input"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+input_network_data = DATA_CALCULATION / "input_network_data.json"
+active_power_profile_path = DATA_CALCULATION / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_CALCULATION / "reactive_power_profile.parquet"
+
+
+def make_output(size):
+    output = initialize_array("sym_output", "node", (size, 1))
+    output["u_pu"] = np.arange(size).reshape(size, 1)
+    return {"node": output}
+
+
+def make_update(p_specified):
+    update = initialize_array("update", "sym_load", (1, 1))
+    update["id"] = 1
+    update["p_specified"] = p_specified
+    return {"sym_load": update}
+
+
+def test_key_depends_on_network_update_and_settings():
+    key = ScenarioCache.key("network", make_update(1.0), "newton_raphson")
+    assert key == ScenarioCache.key("network", make_update(1.0), "newton_raphson")
+    assert key != ScenarioCache.key("network", make_update(2.0), "newton_raphson")
+    assert key != ScenarioCache.key("other network", make_update(1.0), "newton_raphson")
+    assert key != ScenarioCache.key("network", make_update(1.0), "linear")
+    assert dataset_digest(make_update(1.0)) != dataset_digest(make_update(2.0))
+
+
+def test_lru_eviction_by_bytes():
+    entry_bytes = make_output(10)["node"].nbytes
+    cache = ScenarioCache(max_bytes=2 * entry_bytes)
+    cache.put("a", make_output(10))
+    cache.put("b", make_output(10))
+    cache.get("a")  # a is now the most recently used entry
+    cache.put("c", make_output(10))
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats() == {
+        "hits": 1,
+        "disk_hits": 0,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "entries": 2,
+        "bytes": 2 * entry_bytes,
+    }
+
+    # entries larger than the bound are not kept in memory
+    cache.put("d", make_output(100))
+    assert "d" not in cache
+    assert len(cache) == 2
+
+
+def test_cached_outputs_are_not_shared():
+    cache = ScenarioCache()
+    output = make_output(3)
+    cache.put("a", output)
+    # the arrays of the caller stay writeable, and neither its edits nor those of a hit reach the cache
+    output["node"]["u_pu"][0] = 5
+    cache.get("a")["node"]["u_pu"][0] = 6
+    np.testing.assert_array_equal(cache.get("a")["node"]["u_pu"], make_output(3)["node"]["u_pu"])
+
+
+def test_disk_tier(tmp_path):
+    ScenarioCache(directory=tmp_path).put("a", make_output(3))
+
+    cache = ScenarioCache(max_bytes=0, directory=tmp_path)
+    output = cache.get("a")
+    np.testing.assert_array_equal(output["node"]["u_pu"], make_output(3)["node"]["u_pu"])
+    assert cache.disk_hits == 1
+    assert cache.get("b") is None
+
+    cache.clear()
+    assert cache.stats()["hits"] == 0
+
+
+def test_InvalidCacheSizeError():
+    with pytest.raises(InvalidCacheSizeError):
+        ScenarioCache(max_bytes=-1)
+
+
+def test_MissingNetworkFingerprintError():
+    with open(input_network_data, "r", encoding="utf-8") as fp:
+        model = PowerGridModel(json_deserialize(fp.read()))
+    with pytest.raises(MissingNetworkFingerprintError):
+        run_batch_power_flow(model, {}, options=RunOptions(cache=ScenarioCache()))
+
+
+def test_calculate_power_grid_cache():
+    cache = ScenarioCache()
+    first_report, second_report = {}, {}
+    first = calculate_power_grid(
+        input_network_data,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(cache=cache),
+        report=first_report,
+    )
+    second = calculate_power_grid(
+        input_network_data,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(cache=cache),
+        report=second_report,
+    )
+    assert (first_report["cache"], second_report["cache"]) == ("miss", "hit")
+    assert (cache.hits, cache.misses) == (1, 1)
+    pd.testing.assert_frame_equal(first[0], second[0])
+    pd.testing.assert_frame_equal(first[1], second[1])
+
+
+# A repeated tap sweep is answered entirely from the cache
+def test_optimal_tap_position_cache():
+    cache = ScenarioCache()
+    network = DATA_EXCEPTION_SET / "input_network_data.json"
+    active = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+    reactive = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+    assert otp.optimal_tap_position(network, active, reactive, 0, cache=cache) == 5
+    assert otp.optimal_tap_position(network, active, reactive, 1, cache=cache) == 3
+    assert cache.misses == 5
+    assert cache.hits == 5
+
+
+def test_nm_function_cache():
+    cache = ScenarioCache()
+    assert nm_file.nm_function(
+        18,
+        DATA_EXCEPTION_SET / "input_network_data.json",
+        DATA_EXCEPTION_SET / "meta_data.json",
+        DATA_EXCEPTION_SET / "active_power_profile.parquet",
+        DATA_EXCEPTION_SET / "reactive_power_profile.parquet",
+        cache=cache,
+    ) == [24]
+    assert cache.misses == 1
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+import power_system_simulation.ev_penetration as EV
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.screening import InvalidScreeningConfigError, ScreeningConfig, screened_power_flow
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+with open(input_network, "r", encoding="utf-8") as fp:
+    input_data = json_deserialize(fp.read())
+active_power_profile = pd.read_parquet(active_power_profile_path)
+reactive_power_profile = pd.read_parquet(reactive_power_profile_path)
+
+load_profile = initialize_array("update", "sym_load", active_power_profile.shape)
+load_profile["id"] = active_power_profile.columns.to_numpy()
+load_profile["p_specified"] = active_power_profile.to_numpy()
+load_profile["q_specified"] = reactive_power_profile.to_numpy()
+update_data = {"sym_load": load_profile}
+
+model = PowerGridModel(input_data)
+exact_output = model.calculate_power_flow(update_data=update_data)
+
+
+# Only the timestamps near the (tightened) upper voltage limit are rerun with Newton-Raphson
+def test_screened_power_flow_reruns_near_limit():
+    screening = ScreeningConfig(voltage_limits=(0.9, 1.08), voltage_margin=0.005)
+    report = {}
+    output_data = screened_power_flow(model, update_data, screening, report=report)
+
+    linear_output = model.calculate_power_flow(update_data=update_data, calculation_method="linear")
+    rerun = linear_output["node"]["u_pu"].max(axis=1) > 1.075
+    assert 0 < report["rerun_timestamps"] < len(rerun)
+    assert report["rerun_timestamps"] == rerun.sum()
+    np.testing.assert_allclose(output_data["node"]["u_pu"][rerun], exact_output["node"]["u_pu"][rerun])
+    np.testing.assert_allclose(output_data["node"]["u_pu"], exact_output["node"]["u_pu"], atol=5e-3)
+    assert 0 < report["max_voltage_error"] < 5e-3
+    assert 0 < report["max_loading_error"] < 0.2
+
+
+# Without timestamps near the limits, the most severe one is still rerun to measure the error
+def test_screened_power_flow_reruns_most_severe():
+    report = {}
+    screened_power_flow(model, update_data, ScreeningConfig(voltage_margin=0, loading_margin=0), report=report)
+    assert report["rerun_timestamps"] == 1
+    assert report["screening_method"] == "linear"
+
+
+# With margins covering the whole band, the result equals a full Newton-Raphson run
+def test_calculate_power_grid_screening_all_timestamps():
+    report = {}
+    voltage_results, line_results = calculate_power_grid(
+        input_network,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(screening=ScreeningConfig(voltage_margin=0.2, method="linear_current")),
+        report=report,
+    )
+    expected_voltage, expected_line = calculate_power_grid(
+        input_network, active_power_profile_path, reactive_power_profile_path
+    )
+    assert report["rerun_fraction"] == 1
+    pd.testing.assert_frame_equal(voltage_results, expected_voltage)
+    pd.testing.assert_frame_equal(line_results, expected_line)
+
+
+def test_ev_penetration_screening():
+    report = {}
+    voltage_results, line_results = EV.ev_penetration(
+        input_network,
+        metadata,
+        active_power_profile_path,
+        ev_active_power_profile,
+        75,
+        34,
+        options=RunOptions(screening=ScreeningConfig()),
+        report=report,
+    )
+    expected_voltage, _ = EV.ev_penetration(
+        input_network, metadata, active_power_profile_path, ev_active_power_profile, 75, 34
+    )
+    assert report["rerun_timestamps"] >= 1
+    np.testing.assert_allclose(voltage_results["Max_Voltage"], expected_voltage["Max_Voltage"], atol=5e-3)
+    assert len(line_results) == len(input_data["line"])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"voltage_margin": -0.1}, {"voltage_limits": (1.1, 0.9)}, {"method": "newton_raphson"}],
+)
+def test_InvalidScreeningConfigError(kwargs):
+    with pytest.raises(InvalidScreeningConfigError):
+        ScreeningConfig(**kwargs)
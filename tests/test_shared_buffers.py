@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model.utils import json_deserialize
+
+import power_system_simulation.ev_penetration as EV
+from power_system_simulation.shared_buffers import (
+    AttachedArrays,
+    SharedArrays,
+    SharedBufferError,
+    attach_worker,
+    grid_arrays,
+    shared_input_data,
+    shared_profile,
+    worker_arrays,
+)
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+active_power_profile = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+
+def shared_sums() -> tuple:
+    arrays = worker_arrays()
+    return float(arrays["values"].sum()), int(arrays["node"]["u_rated"].sum())
+
+
+def test_workers_attach_to_shared_arrays():
+    with open(input_network, "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    values = np.random.default_rng(1).uniform(size=(100, 7))
+
+    with SharedArrays({"values": values, "node": input_data["node"]}) as shared:
+        with ProcessPoolExecutor(max_workers=2, initializer=attach_worker, initargs=(shared.handle,)) as pool:
+            results = [future.result() for future in [pool.submit(shared_sums) for _ in range(4)]]
+        assert results == [(pytest.approx(values.sum()), int(input_data["node"]["u_rated"].sum()))] * 4
+
+        with AttachedArrays(shared.handle) as attached:
+            np.testing.assert_array_equal(attached.arrays["node"], input_data["node"])
+            with pytest.raises(ValueError):
+                attached.arrays["values"][0, 0] = 1.0
+
+        segment_name = shared.handle["values"][0]
+
+    # the segments are unlinked when the publisher is closed
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=segment_name)
+
+
+def test_grid_arrays_round_trip():
+    with open(input_network, "r", encoding="utf-8") as fp:
+        input_data = json_deserialize(fp.read())
+    profile = pd.read_parquet(active_power_profile)
+    ev_profile = pd.read_parquet(ev_active_power_profile)
+
+    with SharedArrays(grid_arrays(input_data, {"active": profile, "ev": ev_profile})) as shared:
+        with AttachedArrays(shared.handle) as attached:
+            shared_data = shared_input_data(attached.arrays)
+            assert set(shared_data) == set(input_data)
+            np.testing.assert_array_equal(shared_data["line"], input_data["line"])
+            active = shared_profile(attached.arrays, "active")
+            pd.testing.assert_frame_equal(active, profile, check_names=False, check_column_type=False)
+            assert np.shares_memory(active.to_numpy(), attached.arrays["profile/active/values"])
+            assert shared_profile(attached.arrays, "ev").columns.tolist() == ev_profile.columns.tolist()
+
+
+def handle_sums(handle: dict) -> float:
+    return float(worker_arrays(handle)["values"].sum())
+
+
+def test_workers_attach_with_handle():
+    values = np.arange(12.0).reshape(3, 4)
+    with SharedArrays({"values": values}) as shared:
+        # workers without attach_worker as initializer attach on their first task
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(handle_sums, [shared.handle] * 4)) == [values.sum()] * 4
+        assert handle_sums(shared.handle) == values.sum()
+        with SharedArrays({"values": -values}) as other:
+            assert handle_sums(other.handle) == -values.sum()
+        assert handle_sums(shared.handle) == values.sum()
+    # closing the publisher also detaches this process
+    with pytest.raises(SharedBufferError):
+        worker_arrays()
+
+
+def test_shared_buffer_errors():
+    with pytest.raises(SharedBufferError):
+        SharedArrays({"ids": np.array([1, "a"], dtype=object)})
+    with pytest.raises(SharedBufferError):
+        worker_arrays()
+
+
+def test_ev_monte_carlo():
+    results = EV.ev_monte_carlo(
+        input_network, metadata, active_power_profile, ev_active_power_profile, 50, [1, 2], workers=2
+    )
+    assert list(results) == [1, 2]
+    for seed, (voltage_df, line_df) in results.items():
+        expected_voltage_df, expected_line_df = EV.ev_penetration(
+            input_network, metadata, active_power_profile, ev_active_power_profile, 50, seed
+        )
+        pd.testing.assert_frame_equal(voltage_df, expected_voltage_df)
+        pd.testing.assert_frame_equal(line_df, expected_line_df)
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.calculation_module import calculate_power_grid
+from power_system_simulation.execution import ExecutionConfig
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.time_series import (
+    InvalidChunkSizeError,
+    count_newton_raphson_iterations,
+    sequential_power_flow,
+)
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+active_power_profile_path = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile_path = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+
+with open(input_network, "r", encoding="utf-8") as fp:
+    input_data = json_deserialize(fp.read())
+active_power_profile = pd.read_parquet(active_power_profile_path)
+reactive_power_profile = pd.read_parquet(reactive_power_profile_path)
+
+load_profile = initialize_array("update", "sym_load", active_power_profile.shape)
+load_profile["id"] = active_power_profile.columns.to_numpy()
+load_profile["p_specified"] = active_power_profile.to_numpy()
+load_profile["q_specified"] = reactive_power_profile.to_numpy()
+update_data = {"sym_load": load_profile}
+
+model = PowerGridModel(input_data)
+
+
+# Chunks are solved in timestamp order and every chunk after the first gets the previous final state
+def test_sequential_power_flow_order_and_initial_state():
+    seen = []
+
+    def solve(chunk, initial_state):
+        seen.append((len(chunk["sym_load"]), initial_state))
+        return model.calculate_power_flow(update_data=chunk)
+
+    report = {}
+    output_data = sequential_power_flow(update_data, 400, solve, report)
+    expected = model.calculate_power_flow(update_data=update_data)
+
+    assert [size for size, _ in seen] == [400, 400, 160]
+    assert seen[0][1] is None
+    np.testing.assert_array_equal(seen[1][1]["node"]["u_pu"], expected["node"]["u_pu"][399])
+    np.testing.assert_array_equal(output_data["node"]["u_pu"], expected["node"]["u_pu"])
+    assert report["chunks"] == 3
+    assert len(report["chunk_seconds"]) == 3
+
+
+def test_count_newton_raphson_iterations():
+    iterations = count_newton_raphson_iterations(model, update_data)
+    assert iterations.shape == (960,)
+    assert np.all(iterations >= 1)
+
+    # A too low iteration limit leaves scenarios unconverged
+    assert np.all(count_newton_raphson_iterations(model, update_data, ExecutionConfig(max_iterations=1)) == -1)
+
+
+# The chunked mode gives the same tables as one batch and reports the iterations per timestamp
+def test_calculate_power_grid_chunked():
+    chunked_report = {}
+    voltage_results, line_results = calculate_power_grid(
+        input_network,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(chunk_size=96, count_iterations=True),
+        report=chunked_report,
+    )
+    report = {}
+    expected_voltage, expected_line = calculate_power_grid(
+        input_network,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(count_iterations=True),
+        report=report,
+    )
+    pd.testing.assert_frame_equal(voltage_results, expected_voltage)
+    pd.testing.assert_frame_equal(line_results, expected_line)
+    assert report["newton_raphson_iterations"].shape == (960,)
+    np.testing.assert_array_equal(chunked_report["newton_raphson_iterations"], report["newton_raphson_iterations"])
+
+
+def test_chunked_report():
+    report = {}
+    calculate_power_grid(
+        input_network,
+        active_power_profile_path,
+        reactive_power_profile_path,
+        options=RunOptions(chunk_size=480, count_iterations=True),
+        report=report,
+    )
+    assert report["chunks"] == 2
+    assert report["mean_newton_raphson_iterations"] >= 1
+
+
+@pytest.mark.parametrize("chunk_size", [0, 2.5])
+def test_InvalidChunkSizeError(chunk_size):
+    with pytest.raises(InvalidChunkSizeError):
+        sequential_power_flow(update_data, chunk_size, lambda chunk, initial_state: chunk)
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import power_system_simulation.ev_penetration as EV
+import power_system_simulation.nm_calculation as nm_file
+import power_system_simulation.optimal_tap_position as otp
+from power_system_simulation.top_k import InvalidTopKError, TopK
+
+DATA_PATH = Path(__file__).parent / "data"
+DATA_EXCEPTION_SET = DATA_PATH / "Exception_test_data"
+
+input_network = DATA_EXCEPTION_SET / "input_network_data.json"
+metadata = DATA_EXCEPTION_SET / "meta_data.json"
+active_power_profile = DATA_EXCEPTION_SET / "active_power_profile.parquet"
+reactive_power_profile = DATA_EXCEPTION_SET / "reactive_power_profile.parquet"
+ev_active_power_profile = DATA_EXCEPTION_SET / "ev_active_power_profile.parquet"
+
+
+def brute_force(chunks: list, k: int, largest: bool) -> list:
+    cases = [
+        (value, scenario, column + 10, row)
+        for scenario, values in enumerate(chunks)
+        for row, column in np.ndindex(values.shape)
+        for value in [values[row, column]]
+    ]
+    # a stable sort keeps ties in the order they were fed
+    return sorted(cases, key=lambda case: -case[0] if largest else case[0])[:k]
+
+
+@pytest.mark.parametrize("largest", [True, False])
+@pytest.mark.parametrize("k", [1, 7, 500])
+def test_top_k_matches_brute_force(k, largest):
+    rng = np.random.default_rng(k)
+    # rounded values, so there are ties
+    chunks = [np.round(rng.uniform(0, 2, (rng.integers(1, 40), 6)), 1) for _ in range(8)]
+    tracker = TopK(k, largest=largest)
+    for scenario, values in enumerate(chunks):
+        tracker.update(values, np.arange(10, 16), np.arange(len(values)), scenario=scenario)
+    assert len(tracker) == min(k, sum(values.size for values in chunks))
+
+    ranked = tracker.ranked()
+    assert list(ranked.columns) == ["Scenario", "ID", "Timestamp", "Loading"]
+    assert ranked.index[0] == 1
+    assert list(ranked.itertuples(index=False)) == [
+        (scenario, component_id, row, value) for value, scenario, component_id, row in brute_force(chunks, k, largest)
+    ]
+
+
+def test_merged_workers_match_one_tracker():
+    rng = np.random.default_rng(3)
+    chunks = [np.round(rng.uniform(0, 2, (30, 4)), 2) for _ in range(6)]
+    single = TopK(10)
+    workers = [TopK(10) for _ in range(3)]
+    for scenario, values in enumerate(chunks):
+        single.update(values, [1, 2, 3, 4], np.arange(30), scenario)
+        workers[scenario // 2].update(values, [1, 2, 3, 4], np.arange(30), scenario)
+    merged = TopK(10)
+    for worker in workers:
+        merged.merge(worker)
+    pd.testing.assert_frame_equal(merged.ranked(), single.ranked())
+
+    with pytest.raises(InvalidTopKError):
+        merged.merge(TopK(5))
+    with pytest.raises(InvalidTopKError):
+        merged.merge(TopK(10, largest=False))
+    with pytest.raises(InvalidTopKError):
+        TopK(0)
+
+
+def test_studies_rank_worst_cases():
+    top_k = TopK(5)
+    assert nm_file.nm_function(
+        18, input_network, metadata, active_power_profile, reactive_power_profile, top_k=top_k
+    ) == [24]
+    ranked = top_k.ranked()
+    assert len(ranked) == 5
+    assert (ranked["Scenario"] == 24).all()
+    # labelled with the timestamps of the profile
+    assert set(ranked["Timestamp"]) <= set(pd.read_parquet(active_power_profile).index)
+    assert ranked["Loading"].is_monotonic_decreasing
+
+    top_k = TopK(3)
+    otp.optimal_tap_position(input_network, active_power_profile, reactive_power_profile, 0, top_k=top_k)
+    ranked = top_k.ranked()
+    assert ranked["Loading"].is_monotonic_decreasing
+    assert set(ranked["Scenario"]) <= set(range(-5, 6))
+    assert isinstance(ranked["Timestamp"].iloc[0], pd.Timestamp)
+    # the tap positions label their own loadings, later updates of the caller are not labelled with the last one
+    top_k.update(np.array([[1e9]]), [0], [None])
+    assert pd.isna(top_k.ranked()["Scenario"].iloc[0])
+
+    expected = TopK(4)
+    for seed in (1, 2):
+        EV.ev_penetration(
+            input_network, metadata, active_power_profile, ev_active_power_profile, 50, seed, top_k=expected
+        )
+    top_k = TopK(4)
+    EV.ev_monte_carlo(
+        input_network, metadata, active_power_profile, ev_active_power_profile, 50, [1, 2], workers=2, top_k=top_k
+    )
+    pd.testing.assert_frame_equal(top_k.ranked(), expected.ranked())
+    assert set(expected.ranked()["Scenario"]) <= {1, 2}
@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from power_grid_model import PowerGridModel, initialize_array
+from power_grid_model.utils import json_deserialize
+
+from power_system_simulation.calculation_module import calculate_power_grid, read_profile_update, run_batch_power_flow
+from power_system_simulation.run_options import RunOptions
+from power_system_simulation.violations import InvalidLimitError, ViolationTracker, violation_events
+
+DATA_PATH = Path(__file__).parent / "data"
+
+
+def random_output(n_timestamps: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    node = initialize_array("sym_output", "node", (n_timestamps, 6))
+    node["id"] = np.arange(6)
+    node["u_pu"] = 1.0 + np.cumsum(rng.normal(0, 0.03, node.shape), axis=0).clip(-0.2, 0.2)
+    line = initialize_array("sym_output", "line", (n_timestamps, 4))
+    line["id"] = np.arange(10, 14)
+    line["loading"] = rng.uniform(0.5, 1.3, line.shape)
+    return {"node": node, "line": line}
+
+
+def brute_force_events(output_data: dict) -> list:
+    events = []
+    series = [
+        ("node", "u_pu", "undervoltage", lambda x: x < 0.9, min),
+        ("node", "u_pu", "overvoltage", lambda x: x > 1.1, max),
+        ("line", "loading", "overloading", lambda x: x > 1.0, max),
+    ]
+    for component, attribute, violation, violates, peak in series:
+        values = output_data[component][attribute]
+        for column in range(values.shape[1]):
+            row = 0
+            while row < len(values):
+                if violates(values[row, column]):
+                    start = row
+                    while row < len(values) and violates(values[row, column]):
+                        row += 1
+                    events.append(
+                        (
+                            component,
+                            int(output_data[component]["id"][0, column]),
+                            violation,
+                            start,
+                            row - 1,
+                            row - start,
+                            peak(values[start:row, column]),
+                        )
+                    )
+                else:
+                    row += 1
+    return sorted(events, key=lambda event: (event[3], event[0], event[1]))
+
+
+def as_tuples(events: pd.DataFrame) -> list:
+    return [
+        (row.Component, int(row.ID), row.Violation, row.Start, row.End, row.Duration, row.Peak)
+        for row in events.itertuples()
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_violation_events_match_brute_force(seed):
+    output_data = random_output(200, seed)
+    assert as_tuples(violation_events(output_data)) == brute_force_events(output_data)
+
+
+@pytest.mark.parametrize("chunk_sizes", [[1] * 50, [7, 13, 30], [49, 1], [50]])
+def test_chunked_events_carry_over(chunk_sizes):
+    output_data = random_output(sum(chunk_sizes), 4)
+    timestamps = pd.date_range("2025-01-01", periods=sum(chunk_sizes), freq="15min")
+    tracker = ViolationTracker(timestamps)
+    start = 0
+    for size in chunk_sizes:
+        tracker.update({component: array[start : start + size] for component, array in output_data.items()})
+        start += size
+    pd.testing.assert_frame_equal(tracker.events(), violation_events(output_data, timestamps))
+
+
+def test_open_events_at_the_end():
+    node = initialize_array("sym_output", "node", (4, 2))
+    node["id"] = [1, 2]
+    node["u_pu"] = [[1.0, 0.85], [1.15, 0.8], [1.12, 0.95], [1.11, 0.88]]
+    tracker = ViolationTracker().update({"node": node[:2]})
+    assert as_tuples(tracker.events()) == [
+        ("node", 2, "undervoltage", 0, 1, 2, 0.8),
+        ("node", 1, "overvoltage", 1, 1, 1, 1.15),
+    ]
+    tracker.update({"node": node[2:]})
+    assert as_tuples(tracker.events()) == [
+        ("node", 2, "undervoltage", 0, 1, 2, 0.8),
+        ("node", 1, "overvoltage", 1, 3, 3, 1.15),
+        ("node", 2, "undervoltage", 3, 3, 1, 0.88),
+    ]
+
+
+def test_no_events_and_invalid_limits():
+    output_data = random_output(20, 5)
+    output_data["node"]["u_pu"] = 1.0
+    output_data["line"]["loading"] = 0.5
+    events = violation_events(output_data)
+    assert events.empty
+    assert list(events.columns) == ["Component", "ID", "Violation", "Start", "End", "Duration", "Peak"]
+
+    with pytest.raises(InvalidLimitError):
+        ViolationTracker(voltage_limits=(1.1, 0.9))
+    with pytest.raises(InvalidLimitError):
+        ViolationTracker(loading_limit=0)
+
+
+@pytest.mark.parametrize("options", [{}, {"chunk_size": 100}, {"deduplicate": True}])
+def test_calculate_power_grid_feeds_tracker(options):
+    input_path = DATA_PATH / "Exception_test_data" / "input_network_data.json"
+    active_path = DATA_PATH / "Exception_test_data" / "active_power_profile.parquet"
+    reactive_path = DATA_PATH / "Exception_test_data" / "reactive_power_profile.parquet"
+    # a tight band so that the test grid has events
+    tracker = ViolationTracker(voltage_limits=(1.0, 1.05), loading_limit=0.001)
+    calculate_power_grid(input_path, active_path, reactive_path, options=RunOptions(**options), violations=tracker)
+
+    with open(input_path, "r", encoding="utf-8") as fp:
+        model = PowerGridModel(json_deserialize(fp.read()))
+    update_data, timestamps = read_profile_update(active_path, reactive_path)
+    expected = violation_events(run_batch_power_flow(model, update_data), timestamps, (1.0, 1.05), 0.001)
+    assert not expected.empty
+    assert tracker.n_timestamps == len(timestamps)
+    pd.testing.assert_frame_equal(tracker.events(), expected)